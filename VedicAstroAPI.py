@@ -1,11 +1,71 @@
-from typing import Optional
-from pydantic import BaseModel
-from fastapi import FastAPI
-from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+import time
+import asyncio
+import collections
+import multiprocessing
+from typing import Optional, Literal
+from datetime import datetime
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+import polars as pl
+import pyarrow as pa
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from vedicastro import VedicAstro, horary_chart, utils
+from vedicastro import VedicAstro, horary_chart, utils, batch
+from vedicastro.chart_result import ChartResult, CHART_RESULT_SECTIONS
+from vedicastro.instrumentation import MetricsRegistry, collect_profile, format_server_timing
+from vedicastro.cache import ChartResultCache, SQLiteCacheBackend, normalize_chart_key, get_cache_key_digest
 
-app = FastAPI()
+## Worker pool settings, configurable with environment variables
+API_WORKERS = int(os.environ.get("VEDICASTRO_API_WORKERS", os.cpu_count() or 1))
+API_TIMEOUT_SECS = float(os.environ.get("VEDICASTRO_API_TIMEOUT_SECS", 30))
+API_MAX_IN_FLIGHT = int(os.environ.get("VEDICASTRO_API_MAX_IN_FLIGHT", 4 * API_WORKERS))
+API_BATCH_CHUNK_SIZE = int(os.environ.get("VEDICASTRO_API_BATCH_CHUNK_SIZE", 64))
+
+## Chart results cache settings, a cache size of 0 disables the in-process cache
+API_CACHE_SIZE = int(os.environ.get("VEDICASTRO_API_CACHE_SIZE", 1024))
+API_CACHE_TTL_SECS = float(os.environ.get("VEDICASTRO_API_CACHE_TTL_SECS", 3600))
+API_CACHE_SQLITE_PATH = os.environ.get("VEDICASTRO_API_CACHE_SQLITE_PATH")
+
+## Collect the per stage timings of the chart computations, for the `Server-Timing` header and `/metrics`
+API_PROFILING = os.environ.get("VEDICASTRO_API_PROFILING", "1") == "1"
+
+## Media types of the bulk chart endpoint
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+## Columns of the bulk chart inputs, the same fields as `ChartInput`
+BATCH_INPUT_COLS = ["year", "month", "day", "hour", "minute", "second", "latitude", "longitude", "utc", "ayanamsa", "house_system"]
+
+def warm_up_worker():
+    """Computes a chart in the worker process, to load the ephemeris files before the first request"""
+    VedicAstro.VedicHoroscopeData(2000, 1, 1, 0, 0, 0, 0.0, 0.0, "+0:00").generate_chart()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Starts the process pool which runs the chart computations, off the event loop"""
+    # Spawned workers, as forking a process with the polars thread pool running can deadlock
+    app.state.worker_pool = ProcessPoolExecutor(max_workers = API_WORKERS, mp_context = multiprocessing.get_context("spawn"))
+    app.state.jobs_semaphore = asyncio.Semaphore(API_MAX_IN_FLIGHT)
+    cache_backend = SQLiteCacheBackend(API_CACHE_SQLITE_PATH) if API_CACHE_SQLITE_PATH else None
+    app.state.chart_cache = ChartResultCache(API_CACHE_SIZE, API_CACHE_TTL_SECS, cache_backend)
+    app.state.metrics = MetricsRegistry("vedicastro_api")
+    # Start the workers upfront, so that the first requests do not pay for their start up
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*[loop.run_in_executor(app.state.worker_pool, warm_up_worker) for _ in range(API_WORKERS)])
+    yield
+    app.state.worker_pool.shutdown(wait = False, cancel_futures = True)
+    if cache_backend is not None:
+        cache_backend.close()
+
+app = FastAPI(lifespan = lifespan)
+
+## Sections of the chart data, which can be requested with `include` (default: all the sections)
+ChartSection = Literal[tuple(CHART_RESULT_SECTIONS)]
 
 class ChartInput(BaseModel):
     year: int
@@ -20,6 +80,7 @@ class ChartInput(BaseModel):
     ayanamsa: str = "Lahiri"
     house_system: str = "Equal"
     return_style: Optional[str] = None
+    include: Optional[list[ChartSection]] = None
 
 class HoraryChartInput(BaseModel):
     horary_number: int
@@ -35,6 +96,7 @@ class HoraryChartInput(BaseModel):
     ayanamsa: str = "Krishnamurti"
     house_system: str = "Placidus"
     return_style: Optional[str] = None
+    include: Optional[list[ChartSection]] = None
 
 # Add CORS middleware
 app.add_middleware(
@@ -45,71 +107,263 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    """Records the time and status of each request in the metrics, and adds the total time to the `Server-Timing` header"""
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+    route = request.scope.get("route")
+    request.app.state.metrics.add_request(route.path if route else "unmatched", response.status_code, elapsed)
+    server_timing = response.headers.get("Server-Timing")
+    total_timing = format_server_timing(None, {"total": elapsed})
+    response.headers["Server-Timing"] = f"{server_timing}, {total_timing}" if server_timing else total_timing
+    response.headers["Timing-Allow-Origin"] = "*"
+    return response
+
 @app.get("/")
 async def read_root():
     return {"message": "Welcome to VedicAstro FastAPI Service!",
             "info": "Visit http://127.0.0.1:8088/docs to test the API functions"}
 
 
-@app.post("/get_all_horoscope_data")
-async def get_chart_data(input: ChartInput):
+async def run_in_worker_pool(func, *args, wait_for_slot: bool = False):
     """
-    Generates all data for a given time and location, based on the selected ayanamsa & house system
+    Runs `func(*args)` in the worker pool and awaits its result, with a limit on the jobs in flight and a timeout.
+    Raises a 503 error when the limit is reached (or waits for a free slot if `wait_for_slot`), and a 504 error on timeout,
+    cancelling the job if it has not started yet.
+    A job which is already running is left to finish in its worker, and counts towards the limit until then.
     """
+    jobs_semaphore = app.state.jobs_semaphore
+    if jobs_semaphore.locked() and not wait_for_slot:
+        raise HTTPException(status_code = 503, detail = "Too many chart computations in progress, please retry later",
+                            headers = {"Retry-After": "1"})
+    await jobs_semaphore.acquire()
+    loop = asyncio.get_running_loop()
+    try:
+        job = app.state.worker_pool.submit(func, *args)
+    except BaseException:
+        jobs_semaphore.release()
+        raise
+    job.add_done_callback(lambda _: loop.call_soon_threadsafe(jobs_semaphore.release))
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(job), timeout = API_TIMEOUT_SECS)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code = 504, detail = f"Chart computation timed out after {API_TIMEOUT_SECS} secs")
+
+def profiled_call(func, *args):
+    """Runs `func(*args)` while collecting its profile, returns the (result, profile dict), runs in a worker process"""
+    with collect_profile() as profile:
+        result = func(*args)
+    return result, profile.to_dict()
+
+async def run_cached(func, input: ChartInput, endpoint: str, response: Response, **extra):
+    """
+    Returns the cached result of the chart input, keyed on its normalized inputs,
+    else runs `func(input)` in the worker pool and caches its result.
+    Sets the `Server-Timing` header of the response, to the cache status and the stage timings of the computation.
+    """
+    try:
+        key = get_cache_key_digest(normalize_chart_key(input.year, input.month, input.day, input.hour, input.minute,
+                                                       input.second, input.utc, input.latitude, input.longitude,
+                                                       input.ayanamsa, input.house_system, endpoint = endpoint,
+                                                       return_style = input.return_style,
+                                                       include = sorted(set(input.include)) if input.include is not None else None,
+                                                       **extra))
+    except ValueError as exc:
+        raise HTTPException(status_code = 422, detail = f"Invalid chart time or UTC offset: {exc}")
+    chart_cache = app.state.chart_cache
+    result = await chart_cache.get_async(key)
+    if result is not None:
+        response.headers["Server-Timing"] = 'cache;desc="hit"'
+        return result
+
+    profile = None
+    if API_PROFILING:
+        result, profile = await run_in_worker_pool(profiled_call, func, input)
+        app.state.metrics.add_profile(profile)
+    else:
+        result = await run_in_worker_pool(func, input)
+    if result is not None:
+        await chart_cache.set_async(key, result)
+    response.headers["Server-Timing"] = ", ".join(['cache;desc="miss"'] + ([format_server_timing(profile)] if profile else []))
+    return result
+
+
+def compute_chart_data(input: ChartInput):
+    """Computes the requested sections of the horoscope data of the chart input, runs in a worker process"""
     horoscope = VedicAstro.VedicHoroscopeData(input.year, input.month, input.day, 
                                               input.hour, input.minute, input.second,
                                               input.latitude, input.longitude, 
                                               input.utc,
                                               input.ayanamsa, input.house_system)
-    chart = horoscope.generate_chart()
-    
-    planets_data = horoscope.get_planets_data_from_chart(chart)
-    houses_data = horoscope.get_houses_data_from_chart(chart)
-    planet_significators = horoscope.get_planet_wise_significators(planets_data, houses_data)
-    planetary_aspects = horoscope.get_planetary_aspects(chart)
-    house_significators = horoscope.get_house_wise_significators(planets_data, houses_data)
-    vimshottari_dasa_table = horoscope.compute_vimshottari_dasa(chart)
-    consolidated_chart_data = horoscope.get_consolidated_chart_data(planets_data=planets_data, 
-                                                                    houses_data=houses_data,
-                                                                    return_style = input.return_style)
-
-    return {
-        "planets_data": [planet._asdict() for planet in planets_data],
-        "houses_data": [house._asdict() for house in houses_data],
-        "planet_significators": planet_significators,
-        "planetary_aspects": planetary_aspects,
-        "house_significators": house_significators,
-        "vimshottari_dasa_table": vimshottari_dasa_table,
-        "consolidated_chart_data": consolidated_chart_data
-    }
+    return ChartResult(horoscope, input.return_style).to_dict(input.include)
 
-@app.post("/get_all_horary_data")
-async def get_horary_data(input: HoraryChartInput):
+def compute_horary_data(input: HoraryChartInput):
     """
-    Generates all data for a given horary number, time and location as per KP Astrology system
+    Computes the requested sections of the horary data of the horary chart input, runs in a worker process.
+    Returns None if there is no match
     """
-    matched_time, vhd_hora_houses_chart, houses_data  = horary_chart.find_exact_ascendant_time(input.year, input.month, input.day, input.utc, input.latitude, input.longitude, input.horary_number, input.ayanamsa)
+    # The horary search needs an UTC offset, resolve a timezone name at the time of the horary question
+    utc_offset = utils.resolve_utc_offset(input.utc, datetime(input.year, input.month, input.day, input.hour, input.minute))
+    horary_match = horary_chart.find_exact_ascendant_time(input.year, input.month, input.day, utc_offset, input.latitude, input.longitude, input.horary_number, input.ayanamsa)
+    if horary_match is None:
+        return None
+    matched_time, vhd_hora_houses_chart, houses_data = horary_match
     vhd_hora = VedicAstro.VedicHoroscopeData(input.year, input.month, input.day, 
                                               input.hour, input.minute, input.second,
-                                              input.utc, input.latitude, input.longitude, 
+                                              input.latitude, input.longitude, utc_offset,
                                               input.ayanamsa, input.house_system)
-    
-    vhd_hora_planets_chart = vhd_hora.generate_chart()
-    planets_data = vhd_hora.get_planets_data_from_chart(vhd_hora_planets_chart, vhd_hora_houses_chart)
-    planet_significators = vhd_hora.get_planet_wise_significators(planets_data, houses_data)
-    planetary_aspects = vhd_hora.get_planetary_aspects(vhd_hora_planets_chart)
-    house_significators = vhd_hora.get_house_wise_significators(planets_data, houses_data)
-    vimshottari_dasa_table = vhd_hora.compute_vimshottari_dasa(vhd_hora_planets_chart)
-    consolidated_chart_data = vhd_hora.get_consolidated_chart_data(planets_data=planets_data, 
-                                                                    houses_data=houses_data,
-                                                                    return_style = input.return_style)
-
-    return {
-        "planets_data": [planet._asdict() for planet in planets_data],
-        "houses_data": [house._asdict() for house in houses_data],
-        "planet_significators": planet_significators,
-        "planetary_aspects": planetary_aspects,
-        "house_significators": house_significators,
-        "vimshottari_dasa_table": vimshottari_dasa_table,
-        "consolidated_chart_data": consolidated_chart_data
-    }
\ No newline at end of file
+    return ChartResult(vhd_hora, input.return_style, vhd_hora_houses_chart, houses_data).to_dict(input.include)
+
+def compute_charts_chunk(inputs_df: pl.DataFrame, chart_id_offset: int, output_format: str):
+    """
+    Computes the planets and houses data of a chunk of the bulk chart inputs with the batch chart engine,
+    as one row per chart, runs in a worker process.
+    Returns the NDJSON lines as bytes for the `ndjson` output format, else a `pyarrow.Table`.
+    """
+    planets_df, houses_df = batch.compute_charts(*[inputs_df[col].to_numpy() for col in BATCH_INPUT_COLS[:8]],
+                                                 utc_offset = inputs_df["utc"].to_numpy(),
+                                                 ayanamsa = inputs_df["ayanamsa"].to_numpy(),
+                                                 house_system = inputs_df["house_system"].to_numpy())
+    charts_df = planets_df.group_by("ChartID", maintain_order = True)\
+                          .agg(pl.struct(VedicAstro.PLANETS_TABLE_COLS).alias("planets_data"))\
+                          .join(houses_df.group_by("ChartID", maintain_order = True)
+                                         .agg(pl.struct(VedicAstro.HOUSES_TABLE_COLS).alias("houses_data")), on = "ChartID")\
+                          .with_columns(pl.col("ChartID") + chart_id_offset)
+    if output_format == "ndjson":
+        return charts_df.write_ndjson().encode()
+    return charts_df.to_arrow()
+
+
+async def read_batch_inputs(request: Request):
+    """
+    Reads the bulk chart inputs from the request body, either a JSON list of `ChartInput` records,
+    or an Arrow (IPC file or stream) / Parquet table with the `ChartInput` fields as columns
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    body = await request.body()
+    try:
+        if content_type == "application/json":
+            inputs = TypeAdapter(list[ChartInput]).validate_json(body)
+            inputs_df = pl.DataFrame([input.model_dump() for input in inputs],
+                                     schema = {col: pl.Utf8 if col in ["utc", "ayanamsa", "house_system"] else
+                                               pl.Float64 if col in ["latitude", "longitude"] else pl.Int64
+                                               for col in BATCH_INPUT_COLS})
+        elif content_type in [ARROW_FILE_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE]:
+            read_table = {ARROW_FILE_MEDIA_TYPE: pl.read_ipc, ARROW_STREAM_MEDIA_TYPE: pl.read_ipc_stream,
+                          PARQUET_MEDIA_TYPE: pl.read_parquet}[content_type]
+            inputs_df = read_table(io.BytesIO(body))
+            # Default ayanamsa and house system, same as `ChartInput`
+            inputs_df = inputs_df.with_columns([pl.lit(ChartInput.model_fields[col].default).alias(col)
+                                                for col in ["ayanamsa", "house_system"] if col not in inputs_df.columns])
+            missing_cols = [col for col in BATCH_INPUT_COLS if col not in inputs_df.columns]
+            if missing_cols:
+                raise HTTPException(status_code = 422, detail = f"Missing input columns: {missing_cols}")
+        else:
+            raise HTTPException(status_code = 415, detail = f"Unsupported content type {content_type!r}, expected "
+                                f"application/json, {ARROW_FILE_MEDIA_TYPE}, {ARROW_STREAM_MEDIA_TYPE} or {PARQUET_MEDIA_TYPE}")
+    except ValidationError as exc:
+        raise HTTPException(status_code = 422, detail = exc.errors(include_url = False))
+    except (pl.exceptions.PolarsError, OSError) as exc:
+        raise HTTPException(status_code = 422, detail = f"Could not read the input table: {exc}")
+
+    for col, mapping in [("ayanamsa", batch.SWE_AYANAMSA_MAPPING), ("house_system", batch.SWE_HOUSE_SYSTEM_MAPPING)]:
+        unsupported = set(inputs_df[col].unique().to_list()) - set(mapping)
+        if unsupported:
+            raise HTTPException(status_code = 422, detail = f"Unsupported {col} values: {sorted(unsupported, key = str)}, "
+                                                            f"expected one of {list(mapping)}")
+    if inputs_df.is_empty():
+        raise HTTPException(status_code = 422, detail = "No chart inputs")
+    # Validate the chart times and resolve the timezone names to their UTC offsets, before submitting any chunk
+    try:
+        batch.check_chart_times(*[inputs_df[col].to_numpy() for col in BATCH_INPUT_COLS[:6]])
+        utc_offsets = [utils.resolve_utc_offset(utc, datetime(int(year), int(month), int(day), int(hour), int(minute)))
+                       for utc, year, month, day, hour, minute in
+                       inputs_df.select(["utc", "year", "month", "day", "hour", "minute"]).iter_rows()]
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code = 422, detail = f"Invalid chart time or UTC offset: {exc}")
+    return inputs_df.with_columns(pl.Series("utc", utc_offsets, dtype = pl.Utf8)).select(BATCH_INPUT_COLS)
+
+async def stream_charts_chunks(inputs_df: pl.DataFrame, output_format: str, chunk):
+    """
+    Yields the computed chunks of the bulk charts in the input order (starting with the given first `chunk`),
+    as NDJSON lines or Arrow IPC stream messages.
+    Keeps up to one chunk per worker in progress, so only a few chunks are held in memory at any time.
+    """
+    chunk_offsets = collections.deque(range(API_BATCH_CHUNK_SIZE, len(inputs_df), API_BATCH_CHUNK_SIZE))
+    pending_chunks = collections.deque()
+    arrow_sink, arrow_writer, arrow_schema = io.BytesIO(), None, None
+    try:
+        while True:
+            while chunk_offsets and len(pending_chunks) < API_WORKERS:
+                offset = chunk_offsets.popleft()
+                pending_chunks.append(asyncio.ensure_future(run_in_worker_pool(
+                    compute_charts_chunk, inputs_df.slice(offset, API_BATCH_CHUNK_SIZE), offset, output_format,
+                    wait_for_slot = True)))
+            if output_format == "ndjson":
+                yield chunk
+            else:
+                if arrow_writer is None:
+                    arrow_schema = chunk.schema
+                    arrow_writer = pa.ipc.new_stream(arrow_sink, arrow_schema)
+                arrow_writer.write_table(chunk.cast(arrow_schema))
+                yield arrow_sink.getvalue()
+                arrow_sink.seek(0)
+                arrow_sink.truncate()
+            if not pending_chunks:
+                break
+            chunk = await pending_chunks.popleft()
+        if arrow_writer is not None:
+            arrow_writer.close()
+            yield arrow_sink.getvalue()
+    finally:
+        for pending_chunk in pending_chunks:
+            pending_chunk.cancel()
+
+
+@app.get("/metrics", response_class = PlainTextResponse)
+async def get_metrics():
+    """Returns the metrics of the service, in the Prometheus text format"""
+    chart_cache = app.state.chart_cache
+    metrics = [("vedicastro_api_cache_entries", "gauge", "Number of chart results in the in-process cache", len(chart_cache))]
+    metrics += [(f"vedicastro_api_cache_{name}_total", "counter", f"Number of chart results cache {name.replace('_', ' ')}", count)
+                for name, count in chart_cache.stats.items()]
+    return "".join(f"# HELP {name} {help}\n# TYPE {name} {metric_type}\n{name} {value}\n"
+                   for name, metric_type, help, value in metrics) + app.state.metrics.to_prometheus()
+
+
+@app.post("/get_all_horoscope_data")
+async def get_chart_data(input: ChartInput, response: Response):
+    """
+    Generates all data for a given time and location, based on the selected ayanamsa & house system.
+    Only the sections listed in `include` are computed, if given
+    """
+    return await run_cached(compute_chart_data, input, "chart", response)
+
+@app.post("/get_all_horary_data")
+async def get_horary_data(input: HoraryChartInput, response: Response):
+    """
+    Generates all data for a given horary number, time and location as per KP Astrology system.
+    Only the sections listed in `include` are computed, if given
+    """
+    horary_data = await run_cached(compute_horary_data, input, "horary", response, horary_number = input.horary_number)
+    if horary_data is None:
+        raise HTTPException(status_code = 404, detail = "No matching Ascendant time found for the given input")
+    return horary_data
+
+@app.post("/charts/batch")
+async def get_charts_batch(request: Request, format: str = "ndjson"):
+    """
+    Computes the planets and houses data of many charts with the batch chart engine, and streams them back in the input order,
+    one row per chart with the `ChartID` (row index of the inputs), `planets_data` and `houses_data`.
+    The request body is a JSON list of `ChartInput` records, or an Arrow / Parquet table with the same fields as columns.
+    `format` is either `ndjson` (one JSON line per chart) or `arrow` (Arrow IPC stream).
+    """
+    if format not in ["ndjson", "arrow"]:
+        raise HTTPException(status_code = 422, detail = f"Unsupported format {format!r}, expected 'ndjson' or 'arrow'")
+    inputs_df = await read_batch_inputs(request)
+    # Compute the first chunk before responding, so that overload and errors are reported with the status code
+    first_chunk = await run_in_worker_pool(compute_charts_chunk, inputs_df.slice(0, API_BATCH_CHUNK_SIZE), 0, format)
+    return StreamingResponse(stream_charts_chunks(inputs_df, format, first_chunk),
+                             media_type = NDJSON_MEDIA_TYPE if format == "ndjson" else ARROW_STREAM_MEDIA_TYPE)
@@ -0,0 +1,46 @@
+import time
+import numpy as np
+from vedicastro.VedicAstro import VedicHoroscopeData
+from vedicastro.aspect_engine import ASPECT_PLANETS, get_aspects_frame
+from test_suite.references import generate_birth_records
+from test_suite.references import get_planetary_aspects_pairwise, get_planetary_aspects_15_pairwise
+
+"""
+Benchmark of the vectorized aspect engine, against the original pairwise loops of `get_planetary_aspects`
+(calling `aspects.getAspect` for each ordered pair of planets) and `get_planetary_aspects_15`, from `test_suite/references.py`
+(`test_suite/aspects_test.py` checks that they produce identical aspects).
+Also times `get_aspects_frame` on a stack of charts.
+Run from the root of this repo with: `python -m benchmarks.bench_aspects`
+"""
+
+def run_aspects_benchmark(nr_charts: int = 300, seed: int = 108):
+    records = generate_birth_records(nr_charts, seed)
+    pairwise_time, engine_time, nr_aspects = 0.0, 0.0, 0
+    lons, speeds = [], []
+    for row in zip(*records.values()):
+        vhd = VedicHoroscopeData(*[value.item() for value in row], "Asia/Kolkata", "Krishnamurti", "Placidus")
+        chart = vhd.generate_chart()
+        lons.append([chart.get(planet).lon for planet in ASPECT_PLANETS])
+        speeds.append([chart.get(planet).lonspeed for planet in ASPECT_PLANETS])
+
+        start = time.perf_counter()
+        get_planetary_aspects_pairwise(chart), get_planetary_aspects_15_pairwise(chart)
+        pairwise_time += time.perf_counter() - start
+        start = time.perf_counter()
+        output = (vhd.get_planetary_aspects(chart), vhd.get_planetary_aspects_15(chart))
+        engine_time += time.perf_counter() - start
+        nr_aspects += len(output[0])
+
+    start = time.perf_counter()
+    aspects_df = get_aspects_frame(np.array(lons), np.array(speeds))
+    stack_time = time.perf_counter() - start
+
+    print(f"Timed {nr_charts} charts ({nr_aspects} aspects)")
+    print(f"Pairwise loops: {pairwise_time / nr_charts * 1e3:.3f} ms/chart")
+    print(f"Aspect engine:  {engine_time / nr_charts * 1e3:.3f} ms/chart  ({pairwise_time / engine_time:.1f}x)")
+    print(f"Stacked charts: {stack_time / nr_charts * 1e3:.4f} ms/chart  ({len(aspects_df)} aspects, each pair once)")
+    return {"pairwise_ms_per_chart": pairwise_time / nr_charts * 1e3, "engine_ms_per_chart": engine_time / nr_charts * 1e3,
+            "stacked_ms_per_chart": stack_time / nr_charts * 1e3}
+
+if __name__ == "__main__":
+    run_aspects_benchmark()
@@ -0,0 +1,38 @@
+import time
+from vedicastro.VedicAstro import VedicHoroscopeData
+from vedicastro.batch import compute_charts
+from test_suite.references import generate_birth_records
+
+"""
+Benchmark of the batch chart engine `vedicastro.batch.compute_charts`, against the per-object path of
+constructing a `VedicHoroscopeData` and a `flatlib.Chart` and generating the planets and houses data for each chart.
+Run from the root of this repo with: `python -m benchmarks.bench_batch_charts`
+"""
+
+def run_per_object_path(records: dict, ayanamsa: str, house_system: str):
+    for row in zip(*records.values()):
+        year, month, day, hour, minute, second, lat, lon = [value.item() for value in row]
+        vhd = VedicHoroscopeData(year, month, day, hour, minute, second, lat, lon, "Asia/Kolkata", ayanamsa, house_system)
+        chart = vhd.generate_chart()
+        vhd.get_planets_data_from_chart(chart)
+        vhd.get_houses_data_from_chart(chart)
+
+def run_batch_charts_benchmark(nr_charts: int = 2000, utc_offset: str = "+5:30",
+                               ayanamsa: str = "Krishnamurti", house_system: str = "Placidus"):
+    records = generate_birth_records(nr_charts)
+
+    start = time.perf_counter()
+    run_per_object_path(records, ayanamsa, house_system)
+    per_object_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compute_charts(**records, utc_offset = utc_offset, ayanamsa = ayanamsa, house_system = house_system)
+    batch_time = time.perf_counter() - start
+
+    print(f"Per-object path: {nr_charts / per_object_time:10,.0f} charts/sec  ({per_object_time:.3f} s)")
+    print(f"Batch engine:    {nr_charts / batch_time:10,.0f} charts/sec  ({batch_time:.3f} s)")
+    print(f"Speedup: {per_object_time / batch_time:.1f}x")
+    return {"per_object_charts_per_sec": nr_charts / per_object_time, "batch_charts_per_sec": nr_charts / batch_time}
+
+if __name__ == "__main__":
+    run_batch_charts_benchmark()
@@ -0,0 +1,38 @@
+import time
+from flatlib.chart import Chart
+from vedicastro.VedicAstro import VedicHoroscopeData
+from test_suite.references import generate_birth_records, StrParsingHoroscopeData
+
+"""
+Benchmark of the per chart data tables methods, which read the numeric attributes of the flatlib objects directly,
+against the original implementations from `test_suite/references.py`, which parse `str(obj)` of every object
+(`test_suite/chart_data_native_test.py` checks that they produce identical planets, houses and transit data).
+Run from the root of this repo with: `python -m benchmarks.bench_chart_data_native`
+"""
+
+def time_chart_data_tables(vhd: VedicHoroscopeData, chart: Chart, nr_repeats: int):
+    """Returns the time (secs) per chart for generating the planets and houses data of the chart"""
+    start = time.perf_counter()
+    for _ in range(nr_repeats):
+        vhd.get_planets_data_from_chart(chart), vhd.get_houses_data_from_chart(chart)
+    return (time.perf_counter() - start) / nr_repeats
+
+def run_chart_data_native_benchmark(nr_charts: int = 200, nr_repeats: int = 20, time_zone: str = "Asia/Kolkata",
+                                    ayanamsa: str = "Krishnamurti", house_system: str = "Placidus"):
+    records = generate_birth_records(nr_charts)
+    str_parsing_time, native_time = 0.0, 0.0
+    for row in zip(*records.values()):
+        args = [value.item() for value in row] + [time_zone, ayanamsa, house_system]
+        native_vhd, str_parsing_vhd = VedicHoroscopeData(*args), StrParsingHoroscopeData(*args)
+        chart = native_vhd.generate_chart()
+        str_parsing_time += time_chart_data_tables(str_parsing_vhd, chart, nr_repeats)
+        native_time += time_chart_data_tables(native_vhd, chart, nr_repeats)
+
+    print(f"Timed {nr_charts} charts")
+    print(f"str(obj) parsing: {str_parsing_time / nr_charts * 1e3:.3f} ms/chart")
+    print(f"Native attributes: {native_time / nr_charts * 1e3:.3f} ms/chart")
+    print(f"Speedup: {str_parsing_time / native_time:.2f}x")
+    return {"str_parsing_ms_per_chart": str_parsing_time / nr_charts * 1e3, "native_ms_per_chart": native_time / nr_charts * 1e3}
+
+if __name__ == "__main__":
+    run_chart_data_native_benchmark()
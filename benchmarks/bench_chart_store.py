@@ -0,0 +1,62 @@
+import gc
+import time
+import tracemalloc
+from vedicastro.VedicAstro import VedicHoroscopeData
+from vedicastro.chart_store import ChartStore
+from test_suite.references import generate_birth_records
+
+"""
+Memory benchmark of the array-backed `ChartStore`, against the lists of `PlanetsData` / `HousesData` named tuples
+returned by `VedicHoroscopeData` (`test_suite/chart_store_test.py` checks that it decodes back to identical named tuples).
+The retained memory of each representation is measured with `tracemalloc`.
+Run from the root of this repo with: `python -m benchmarks.bench_chart_store`
+"""
+
+def get_retained_bytes(build):
+    """Returns the result of `build()` and the memory it retains in bytes"""
+    gc.collect()
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    retained_bytes = tracemalloc.get_traced_memory()[0] - start_bytes
+    tracemalloc.stop()
+    return result, retained_bytes
+
+def compute_charts_records(records: dict):
+    charts = []
+    for row in zip(*records.values()):
+        vhd = VedicHoroscopeData(*[value.item() for value in row], "+5:30", "Krishnamurti", "Placidus")
+        chart = vhd.generate_chart()
+        charts.append((vhd.get_planets_data_from_chart(chart), vhd.get_houses_data_from_chart(chart)))
+    return charts
+
+def run_chart_store_benchmark(nr_charts: int = 2000, seed: int = 108):
+    records = generate_birth_records(nr_charts, seed)
+    charts, records_bytes = get_retained_bytes(lambda: compute_charts_records(records))
+    store, store_bytes = get_retained_bytes(lambda: ChartStore.from_records(charts))
+    start = time.perf_counter()
+    ChartStore.from_records(charts)
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for chart_id in range(nr_charts):
+        store.planets_data(chart_id), store.houses_data(chart_id)
+    decode_time = time.perf_counter() - start
+
+    store.to_polars()  # Warm up, the first conversion pays for the polars / arrow set up
+    start = time.perf_counter()
+    planets_df, houses_df = store.to_polars()
+    polars_time = time.perf_counter() - start
+
+    nr_rows = sum(len(planets_data) + len(houses_data) for planets_data, houses_data in charts)
+    print(f"Stored {nr_charts} charts ({nr_rows:,} rows)")
+    print(f"Lists of named tuples: {records_bytes / 1e6:8.2f} MB  ({records_bytes / nr_rows:6.1f} bytes/row)")
+    print(f"ChartStore:            {store_bytes / 1e6:8.2f} MB  ({store_bytes / nr_rows:6.1f} bytes/row, "
+          f"{records_bytes / store_bytes:.1f}x smaller, arrays {store.nbytes / 1e6:.2f} MB)")
+    print(f"Encode: {encode_time / nr_charts * 1e3:.4f} ms/chart  Decode: {decode_time / nr_charts * 1e3:.4f} ms/chart  "
+          f"To polars: {polars_time * 1e3:.1f} ms ({len(planets_df) + len(houses_df):,} rows)")
+    return {"records_bytes": records_bytes, "store_bytes": store_bytes, "nr_rows": nr_rows}
+
+if __name__ == "__main__":
+    run_chart_store_benchmark()
@@ -0,0 +1,45 @@
+import time
+from vedicastro.VedicAstro import VedicHoroscopeData
+from vedicastro.batch import compute_charts
+from vedicastro.consolidated import compute_consolidated_charts_batch
+from test_suite.references import generate_birth_records
+from test_suite.references import get_consolidated_chart_data_polars
+
+"""
+Benchmark of the sign bucket builder used by `get_consolidated_chart_data`, against the original polars
+group by with `map_elements` from `test_suite/references.py` (`test_suite/consolidated_chart_test.py` checks that they
+produce identical output in both return styles). Also times the batched columnar mode `compute_consolidated_charts_batch` on the batch tables.
+Run from the root of this repo with: `python -m benchmarks.bench_consolidated_chart`
+"""
+
+def run_consolidated_chart_benchmark(nr_charts: int = 300, seed: int = 108):
+    records = generate_birth_records(nr_charts, seed)
+    polars_time, bucket_time = 0.0, 0.0
+    for row in zip(*records.values()):
+        vhd = VedicHoroscopeData(*[value.item() for value in row], "Asia/Kolkata", "Krishnamurti", "Placidus")
+        chart = vhd.generate_chart()
+        planets_data, houses_data = vhd.get_planets_data_from_chart(chart), vhd.get_houses_data_from_chart(chart)
+
+        start = time.perf_counter()
+        for return_style in ("dataframe_records", None):
+            get_consolidated_chart_data_polars(planets_data, houses_data, return_style)
+        polars_time += time.perf_counter() - start
+        start = time.perf_counter()
+        for return_style in ("dataframe_records", None):
+            vhd.get_consolidated_chart_data(planets_data, houses_data, return_style)
+        bucket_time += time.perf_counter() - start
+
+    batch_planets_df, batch_houses_df = compute_charts(**records, utc_offset = "+5:30")
+    start = time.perf_counter()
+    consolidated_df = compute_consolidated_charts_batch(batch_planets_df, batch_houses_df)
+    batch_time = time.perf_counter() - start
+
+    print(f"Timed {nr_charts} charts ({len(consolidated_df)} sign rows)")
+    print(f"Polars group by: {polars_time / nr_charts * 1e3:.3f} ms/chart")
+    print(f"Sign buckets:    {bucket_time / nr_charts * 1e3:.3f} ms/chart  ({polars_time / bucket_time:.1f}x)")
+    print(f"Batched columns: {batch_time / nr_charts * 1e3:.4f} ms/chart  ({polars_time / batch_time:.1f}x)")
+    return {"polars_ms_per_chart": polars_time / nr_charts * 1e3, "bucket_ms_per_chart": bucket_time / nr_charts * 1e3,
+            "batch_ms_per_chart": batch_time / nr_charts * 1e3}
+
+if __name__ == "__main__":
+    run_consolidated_chart_benchmark()
@@ -0,0 +1,51 @@
+import time
+import polars as pl
+from flatlib import angle
+from vedicastro.utils import (dms_to_decdeg, dms_to_mins, dms_difference, dms_to_decdeg_expr, dms_to_mins_expr,
+                              dms_difference_expr, decdeg_to_dms_array)
+from test_suite.references import generate_dms_frame
+
+"""
+Benchmark of the vectorized DMS conversions in `utils`, against their scalar versions applied per row with
+`map_elements` (as the KP table load did), on DataFrame columns of DMS strings in lazy queries.
+Also times `decdeg_to_dms_array` against `flatlib.angle.toString`.
+`test_suite/dms_utils_test.py` checks that they produce identical output.
+Run from the root of this repo with: `python -m benchmarks.bench_dms_utils`
+"""
+
+def run_dms_utils_benchmark(nr_rows: int = 200_000, seed: int = 108):
+    df = generate_dms_frame(nr_rows, seed)
+    conversions = {"dms_to_decdeg": (pl.col("DMS1").map_elements(dms_to_decdeg, return_dtype = pl.Float64),
+                                     dms_to_decdeg_expr(pl.col("DMS1"))),
+                   "dms_to_mins": (pl.col("DMS1").map_elements(dms_to_mins, return_dtype = pl.Float64),
+                                   dms_to_mins_expr(pl.col("DMS1"))),
+                   "dms_difference": (pl.struct(["DMS1", "DMS2"]).map_elements(
+                                          lambda row: dms_difference(row["DMS1"], row["DMS2"]), return_dtype = pl.Utf8),
+                                      dms_difference_expr(pl.col("DMS1"), pl.col("DMS2")))}
+    timings = {}
+    for name, (scalar_expr, vector_expr) in conversions.items():
+        start = time.perf_counter()
+        df.lazy().select(scalar_expr).collect()
+        scalar_time = time.perf_counter() - start
+        start = time.perf_counter()
+        df.lazy().select(vector_expr).collect()
+        vector_time = time.perf_counter() - start
+        timings[name] = {"scalar_ms": scalar_time * 1e3, "vector_ms": vector_time * 1e3}
+
+    dec_degs = df["DecDeg"].to_numpy()
+    start = time.perf_counter()
+    [angle.toString(value) for value in dec_degs.tolist()]
+    to_string_time = time.perf_counter() - start
+    start = time.perf_counter()
+    decdeg_to_dms_array(dec_degs)
+    format_time = time.perf_counter() - start
+    timings["decdeg_to_dms"] = {"scalar_ms": to_string_time * 1e3, "vector_ms": format_time * 1e3}
+
+    print(f"Timed {nr_rows:,} rows")
+    for name, timing in timings.items():
+        print(f"{name:16} scalar {timing['scalar_ms']:8.1f} ms  vectorized {timing['vector_ms']:8.1f} ms  "
+              f"({timing['scalar_ms'] / timing['vector_ms']:.1f}x)")
+    return timings
+
+if __name__ == "__main__":
+    run_dms_utils_benchmark()
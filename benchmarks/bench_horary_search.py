@@ -0,0 +1,96 @@
+import time
+import swisseph as swe
+from vedicastro.VedicAstro import VedicHoroscopeData
+from vedicastro.horary_chart import (SWE_AYANAMAS, get_horary_ascendant_degree, find_all_ascendant_times,
+                                     jd_to_datetime)
+from vedicastro.utils import utc_offset_str_to_float
+
+"""
+Benchmark of the horary ascendant search, comparing the number of house (`swe.houses_ex`) evaluations and the
+wall time of the original adaptive stepping loop of `find_exact_ascendant_time` against the bracketed root solver,
+across all the 249 horary numbers.
+Run from the root of this repo with: `python -m benchmarks.bench_horary_search`
+"""
+
+class HousesEvalCounter:
+    """Wraps `swe.houses_ex` to count the number of house evaluations"""
+    def __init__(self):
+        self.count = 0
+        self.houses_ex = swe.houses_ex
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+        return self.houses_ex(*args, **kwargs)
+
+def find_exact_ascendant_time_stepping(year: int, month: int, day: int, utc_offset: str, lat: float, lon: float,
+                                       horary_number: int, ayanamsa : str):
+    """Original adaptive stepping loop of `find_exact_ascendant_time`, used as the reference"""
+    horary_asc = get_horary_ascendant_degree(horary_number)
+    horary_asc_deg = horary_asc["ZodiacDegreeLocation"]
+    req_sublord = horary_asc["SubLord"]
+    utc_float =  utc_offset_str_to_float(utc_offset)
+
+    utc = swe.utc_time_zone(year, month, day, hour = 0, minutes = 0, seconds = 0, offset = utc_float)
+    _ , jd_start = swe.utc_to_jd(*utc)
+    jd_end = jd_start + 1
+
+    swe.set_sid_mode(SWE_AYANAMAS.get(ayanamsa))
+    current_time = jd_start
+    while current_time <= jd_end:
+        cusps, _ = swe.houses_ex(current_time, lat, lon, b'P', flags = swe.FLG_SIDEREAL)
+        asc_lon_deg = cusps[0]
+        asc_deg_diff = asc_lon_deg - horary_asc_deg
+        asc_deg_diff_abs = abs(asc_deg_diff)
+
+        if asc_deg_diff_abs > 10:
+            inc_factor = 0.005
+        elif asc_deg_diff_abs >= 1.0:
+            inc_factor = 1
+        elif asc_deg_diff_abs >= 0.1:
+            inc_factor = 10
+        else:
+            inc_factor = 100
+
+        if (asc_lon_deg > 355 and horary_asc_deg == 0.0):
+            inc_factor = 100
+
+        if 0.0001 < asc_deg_diff <= 0.001:
+            matched_time = jd_to_datetime(current_time, utc_float)
+            secs_final = matched_time.second + (matched_time.microsecond) / 1_000_000
+            vhd_hora = VedicHoroscopeData(year, month, day, matched_time.hour, matched_time.minute, secs_final,
+                                          lat, lon, utc_offset, ayanamsa, "Placidus")
+            houses_chart = vhd_hora.generate_chart()
+            houses_data = vhd_hora.get_houses_data_from_chart(houses_chart)
+            if houses_data[0].SubLord == req_sublord:
+                return matched_time, houses_chart, houses_data
+
+        current_time += 1.0 / (24 * 60 * 60 * inc_factor)
+    return None
+
+def run_horary_search_benchmark(year: int = 2024, month: int = 2, day: int = 5, utc_offset: str = "+5:30",
+                                lat: float = 11.020085773931049, lon: float = 76.98319647719487,
+                                ayanamsa: str = "Krishnamurti"):
+    counter = HousesEvalCounter()
+    swe.houses_ex = counter
+    results = {}
+    try:
+        for name, search_func in [("stepping", find_exact_ascendant_time_stepping), ("root_solver", find_all_ascendant_times)]:
+            counter.count = 0
+            nr_matches = 0
+            start = time.perf_counter()
+            for horary_number in range(1, 250):
+                matches = search_func(year, month, day, utc_offset, lat, lon, horary_number, ayanamsa)
+                nr_matches += (1 if matches else 0) if name == "stepping" else len(matches)
+            elapsed = time.perf_counter() - start
+            results[name] = {"evaluations": counter.count, "wall_time": elapsed, "matches": nr_matches}
+            print(f"{name:<12} {counter.count:>12,} house evaluations ({counter.count / 249:>10,.1f} per horary number)"
+                  f"  {elapsed:8.2f} s  {nr_matches} matches")
+    finally:
+        swe.houses_ex = counter.houses_ex
+
+    print(f"Evaluations reduced by {results['stepping']['evaluations'] / results['root_solver']['evaluations']:.0f}x, "
+          f"wall time reduced by {results['stepping']['wall_time'] / results['root_solver']['wall_time']:.0f}x")
+    return results
+
+if __name__ == "__main__":
+    run_horary_search_benchmark()
@@ -0,0 +1,42 @@
+import time
+import numpy as np
+from vedicastro.VedicAstro import VedicHoroscopeData, HouseCuspIndex
+from test_suite.references import get_house_linear_scan
+
+"""
+Benchmark of `HouseCuspIndex`, which assigns longitudes to the houses of a fixed (natal / horary) houses chart,
+against the original linear 12 step scan over the sorted cusps of `get_planet_in_house`, from `test_suite/references.py`
+(`test_suite/house_cusp_index_test.py` checks that the scalar and vectorized lookups match the linear scan).
+Run from the root of this repo with: `python -m benchmarks.bench_house_cusp_index`
+"""
+
+def run_house_cusp_index_benchmark(nr_longitudes: int = 1_000_000, seed: int = 108):
+    vhd = VedicHoroscopeData(1991, 11, 25, 13, 5, 0, 11.0, 76.96, "Asia/Kolkata", "Krishnamurti", "Placidus")
+    houses_chart = vhd.generate_chart()
+    cusps = sorted([(house.lon, int(house.id.replace('House', ''))) for house in houses_chart.houses])
+    cusp_index = HouseCuspIndex.from_chart(houses_chart)
+
+    rng = np.random.default_rng(seed)
+    longitudes = np.concatenate([rng.uniform(0, 360, nr_longitudes), [cusp_lon for cusp_lon, _ in cusps], [0.0]])
+    lon_list = longitudes.tolist()
+
+    start = time.perf_counter()
+    [get_house_linear_scan(cusps, lon) for lon in lon_list]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    [cusp_index.house_for(lon) for lon in lon_list]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cusp_index.houses_for(longitudes)
+    vectorized_time = time.perf_counter() - start
+
+    print(f"Timed {len(longitudes)} longitudes")
+    print(f"Linear scan:       {linear_time:.3f} s")
+    print(f"bisect house_for:  {scalar_time:.3f} s  ({linear_time / scalar_time:.1f}x)")
+    print(f"numpy houses_for:  {vectorized_time:.3f} s  ({linear_time / vectorized_time:.1f}x)")
+    return {"linear_secs": linear_time, "bisect_secs": scalar_time, "vectorized_secs": vectorized_time}
+
+if __name__ == "__main__":
+    run_house_cusp_index_benchmark()
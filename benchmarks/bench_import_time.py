@@ -0,0 +1,50 @@
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+"""
+Import-time benchmark of the vedicastro modules, to track cold-start regressions.
+Each module is imported in a fresh python interpreter, and the median import time (as reported by `python -X importtime`)
+over a number of runs is compared against a budget (in milliseconds).
+Run from the root of this repo with: `python -m benchmarks.bench_import_time`
+"""
+
+## Import time budgets (in milliseconds) of each module
+IMPORT_TIME_BUDGETS_MS = {"vedicastro.utils": 20, "vedicastro.VedicAstro": 100, "vedicastro.horary_chart": 120}
+
+def measure_import_time(module_name: str) -> float:
+    """Returns the cumulative import time (in milliseconds) of the module in a fresh interpreter"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                            capture_output = True, text = True, check = True)
+    for line in reversed(result.stderr.splitlines()):
+        _, cumulative_us, name = line.split("|")
+        if name.strip() == module_name:
+            return int(cumulative_us) / 1000
+    raise RuntimeError(f"Import time of {module_name} not found")
+
+def run_import_time_benchmark(nr_runs: int = 10, scale: float = 1.0, output_path: str = None):
+    results, regressions = {}, []
+    for module_name, budget_ms in IMPORT_TIME_BUDGETS_MS.items():
+        timings = [measure_import_time(module_name) for _ in range(nr_runs)]
+        median_ms = statistics.median(timings)
+        results[module_name] = {"median_ms": median_ms, "min_ms": min(timings), "budget_ms": budget_ms * scale}
+        status = "OK" if median_ms <= budget_ms * scale else "REGRESSION"
+        if status != "OK":
+            regressions.append(module_name)
+        print(f"{module_name:<26} median {median_ms:8.1f} ms   min {min(timings):8.1f} ms   budget {budget_ms * scale:6.0f} ms   {status}")
+
+    if output_path:
+        with open(output_path, "w") as f:
+            json.dump(results, f, indent = 2)
+    return results, regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Import-time benchmark of the vedicastro modules")
+    parser.add_argument("--runs", type = int, default = 10, help = "Number of fresh interpreter imports per module")
+    parser.add_argument("--scale", type = float, default = 1.0, help = "Scale factor for the budgets, for slower machines")
+    parser.add_argument("--output", default = None, help = "Path of a JSON file to save the results")
+    args = parser.parse_args()
+    _, regressions = run_import_time_benchmark(args.runs, args.scale, args.output)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,33 @@
+import timeit
+import numpy as np
+from vedicastro.VedicAstro import get_rl_nl_sl_lookup, get_rl_nl_sl_lookup_array
+from test_suite.references import get_rl_nl_sl_data_nested_loop
+
+"""
+Micro-benchmark of the KP Sub / Sub Sub Lord lookup, comparing the original nested loop against
+the bisect based scalar lookup and the numpy based vectorized lookup.
+Run from the root of this repo with: `python -m benchmarks.bench_rl_nl_sl_lookup`
+"""
+
+def run_rl_nl_sl_lookup_benchmark(nr_samples: int = 100_000, repeat: int = 5):
+    longitudes = np.random.default_rng(108).uniform(0, 360, nr_samples)
+    longitudes_list = longitudes.tolist()
+
+    timings = {
+        "nested_loop": lambda: [get_rl_nl_sl_data_nested_loop(deg) for deg in longitudes_list],
+        "bisect_lookup": lambda: [get_rl_nl_sl_lookup(deg) for deg in longitudes_list],
+        "vectorized_lookup": lambda: get_rl_nl_sl_lookup_array(longitudes),
+    }
+
+    results = {}
+    for name, func in timings.items():
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        results[name] = best
+        print(f"{name:<20} {best:8.4f} s  {best / nr_samples * 1e6:8.3f} µs/lookup  {nr_samples / best:14,.0f} lookups/s")
+
+    print(f"Speedup of bisect lookup over nested loop: {results['nested_loop'] / results['bisect_lookup']:.1f}x")
+    print(f"Speedup of vectorized lookup over nested loop: {results['nested_loop'] / results['vectorized_lookup']:.1f}x")
+    return results
+
+if __name__ == "__main__":
+    run_rl_nl_sl_lookup_benchmark()
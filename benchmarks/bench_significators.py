@@ -0,0 +1,46 @@
+import time
+from vedicastro.VedicAstro import VedicHoroscopeData
+from vedicastro.batch import compute_charts
+from vedicastro.significators import compute_significators_batch
+from test_suite.references import generate_birth_records
+from test_suite.references import get_planet_wise_significators_scan, get_house_wise_significators_scan
+
+"""
+Benchmark of the significator engine used by `get_planet_wise_significators` and `get_house_wise_significators`,
+against the original table scans from `test_suite/references.py` (`test_suite/significators_test.py` checks that they
+produce identical significators). Also times the batched columnar mode `compute_significators_batch` on the batch tables.
+Run from the root of this repo with: `python -m benchmarks.bench_significators`
+"""
+
+def run_significators_benchmark(nr_charts: int = 300, seed: int = 108):
+    records = generate_birth_records(nr_charts, seed)
+    scan_time, engine_time = 0.0, 0.0
+    for row in zip(*records.values()):
+        vhd = VedicHoroscopeData(*[value.item() for value in row], "Asia/Kolkata", "Krishnamurti", "Placidus")
+        chart = vhd.generate_chart()
+        planets_data, houses_data = vhd.get_planets_data_from_chart(chart), vhd.get_houses_data_from_chart(chart)
+
+        start = time.perf_counter()
+        get_planet_wise_significators_scan(planets_data, houses_data)
+        get_house_wise_significators_scan(planets_data, houses_data)
+        scan_time += time.perf_counter() - start
+        start = time.perf_counter()
+        vhd.get_planet_wise_significators(planets_data, houses_data)
+        vhd.get_house_wise_significators(planets_data, houses_data)
+        engine_time += time.perf_counter() - start
+
+    # Batched columnar mode, on the batch tables of the same charts
+    batch_planets_df, batch_houses_df = compute_charts(**records, utc_offset = "+5:30")
+    start = time.perf_counter()
+    planet_significators_df, house_significators_df = compute_significators_batch(batch_planets_df, batch_houses_df)
+    batch_time = time.perf_counter() - start
+
+    print(f"Timed {nr_charts} charts ({len(planet_significators_df)} planet, {len(house_significators_df)} house significators)")
+    print(f"Table scans:     {scan_time / nr_charts * 1e3:.3f} ms/chart")
+    print(f"Inverted index:  {engine_time / nr_charts * 1e3:.3f} ms/chart  ({scan_time / engine_time:.1f}x)")
+    print(f"Batched columns: {batch_time / nr_charts * 1e3:.4f} ms/chart  ({scan_time / batch_time:.1f}x)")
+    return {"scan_ms_per_chart": scan_time / nr_charts * 1e3, "engine_ms_per_chart": engine_time / nr_charts * 1e3,
+            "batch_ms_per_chart": batch_time / nr_charts * 1e3}
+
+if __name__ == "__main__":
+    run_significators_benchmark()
@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+
+"""
+Benchmark suite of the public `VedicHoroscopeData` methods and the horary ascendant search, over a fixed corpus of
+charts and locations, to compare the performance between commits.
+Each benchmark runs over the whole corpus for a number of repeats, and the per call min / median / mean times are
+saved as JSON, along with the git commit and the machine details.
+Run from the root of this repo with: `python -m benchmarks.bench_suite run` (saves `benchmarks/results/<commit>.json`)
+and compare two runs with: `python -m benchmarks.bench_suite compare base.json new.json`
+"""
+
+## Fixed corpus of (latitude, longitude, utc offset) locations, from the equator to high latitudes
+BENCH_LOCATIONS = [(13.0827, 80.2707, "+5:30"), (11.0201, 76.9832, "+5:30"), (40.7128, -74.0060, "-5:00"),
+                   (51.5074, -0.1278, "+0:00"), (-33.8688, 151.2093, "+10:00"), (64.1466, -21.9426, "+0:00")]
+BENCH_NR_CHARTS = 60
+BENCH_SEED = 108
+## Horary numbers searched on the horary date, at each location
+BENCH_HORARY_NUMBERS = [1, 42, 83, 124, 165, 206, 249]
+BENCH_HORARY_DATE = (2024, 2, 5)
+
+BENCHMARKS = {}
+
+def benchmark(name: str):
+    """Registers a benchmark, which takes the corpus and returns the list of calls to time"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+def build_corpus(nr_charts: int = BENCH_NR_CHARTS, seed: int = BENCH_SEED):
+    """Returns the corpus of charts, as dicts of the `VedicHoroscopeData`, its chart, planets and houses data"""
+    # Imported here, so that comparing results does not need the chart dependencies
+    from vedicastro.VedicAstro import VedicHoroscopeData
+    from test_suite.references import generate_birth_records
+    records = generate_birth_records(nr_charts, seed)
+    corpus = []
+    for idx, row in enumerate(zip(*[records[col] for col in ["year", "month", "day", "hour", "minute", "second"]])):
+        latitude, longitude, utc = BENCH_LOCATIONS[idx % len(BENCH_LOCATIONS)]
+        vhd = VedicHoroscopeData(*[value.item() for value in row], latitude, longitude, utc, "Krishnamurti", "Placidus")
+        chart = vhd.generate_chart()
+        corpus.append({"vhd": vhd, "chart": chart, "planets_data": vhd.get_planets_data_from_chart(chart),
+                       "houses_data": vhd.get_houses_data_from_chart(chart)})
+    return corpus
+
+@benchmark("generate_chart")
+def bench_generate_chart(corpus):
+    return [item["vhd"].generate_chart for item in corpus]
+
+@benchmark("get_planets_data_from_chart")
+def bench_get_planets_data_from_chart(corpus):
+    return [lambda item = item: item["vhd"].get_planets_data_from_chart(item["chart"]) for item in corpus]
+
+@benchmark("get_houses_data_from_chart")
+def bench_get_houses_data_from_chart(corpus):
+    return [lambda item = item: item["vhd"].get_houses_data_from_chart(item["chart"]) for item in corpus]
+
+@benchmark("get_planet_in_house")
+def bench_get_planet_in_house(corpus):
+    return [lambda item = item: item["vhd"].get_planet_in_house(item["chart"], item["chart"]) for item in corpus]
+
+@benchmark("get_rl_nl_sl_data")
+def bench_get_rl_nl_sl_data(corpus):
+    return [lambda item = item: [item["vhd"].get_rl_nl_sl_data(planet.LonDecDeg) for planet in item["planets_data"]]
+            for item in corpus]
+
+@benchmark("get_planetary_aspects")
+def bench_get_planetary_aspects(corpus):
+    return [lambda item = item: item["vhd"].get_planetary_aspects(item["chart"]) for item in corpus]
+
+@benchmark("get_planetary_aspects_15")
+def bench_get_planetary_aspects_15(corpus):
+    return [lambda item = item: item["vhd"].get_planetary_aspects_15(item["chart"]) for item in corpus]
+
+@benchmark("get_planetary_aspects_vedic")
+def bench_get_planetary_aspects_vedic(corpus):
+    return [lambda item = item: item["vhd"].get_planetary_aspects_vedic(item["planets_data"]) for item in corpus]
+
+@benchmark("get_planet_wise_significators")
+def bench_get_planet_wise_significators(corpus):
+    return [lambda item = item: item["vhd"].get_planet_wise_significators(item["planets_data"], item["houses_data"])
+            for item in corpus]
+
+@benchmark("get_house_wise_significators")
+def bench_get_house_wise_significators(corpus):
+    return [lambda item = item: item["vhd"].get_house_wise_significators(item["planets_data"], item["houses_data"])
+            for item in corpus]
+
+@benchmark("compute_vimshottari_dasa")
+def bench_compute_vimshottari_dasa(corpus):
+    return [lambda item = item: item["vhd"].compute_vimshottari_dasa(item["chart"]) for item in corpus]
+
+@benchmark("compute_vimshottari_dasa_periods")
+def bench_compute_vimshottari_dasa_periods(corpus):
+    return [lambda item = item: item["vhd"].compute_vimshottari_dasa_periods(item["chart"]) for item in corpus]
+
+@benchmark("get_consolidated_chart_data")
+def bench_get_consolidated_chart_data(corpus):
+    return [lambda item = item: item["vhd"].get_consolidated_chart_data(item["planets_data"], item["houses_data"])
+            for item in corpus]
+
+@benchmark("get_transit_details")
+def bench_get_transit_details(corpus):
+    return [item["vhd"].get_transit_details for item in corpus]
+
+@benchmark("find_exact_ascendant_time")
+def bench_find_exact_ascendant_time(corpus):
+    from vedicastro.horary_chart import find_exact_ascendant_time
+    return [lambda latitude = latitude, longitude = longitude, utc = utc, horary_number = horary_number:
+            find_exact_ascendant_time(*BENCH_HORARY_DATE, utc, latitude, longitude, horary_number, "Krishnamurti")
+            for latitude, longitude, utc in BENCH_LOCATIONS for horary_number in BENCH_HORARY_NUMBERS]
+
+def time_calls(calls: list, repeats: int):
+    """Returns the per call timings (in microseconds) of each repeat of all the calls"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for call in calls:
+            call()
+        timings.append((time.perf_counter_ns() - start) / len(calls) / 1e3)
+    return timings
+
+def get_git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output = True, text = True, check = True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run_benchmark_suite(repeats: int = 5, name_filter: str = None, output_path: str = None):
+    corpus = build_corpus()
+    results = {}
+    for name, bench_func in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        calls = bench_func(corpus)
+        # Warm up run, for the lazy imports and caches
+        time_calls(calls, 1)
+        timings = time_calls(calls, repeats)
+        results[name] = {"calls": len(calls), "repeats": repeats, "min_us": min(timings),
+                         "median_us": statistics.median(timings), "mean_us": statistics.mean(timings)}
+        print(f"{name:34} {results[name]['median_us']:12,.1f} us/call  (min {results[name]['min_us']:,.1f})")
+
+    commit = get_git_commit()
+    report = {"metadata": {"commit": commit, "timestamp": datetime.now(timezone.utc).isoformat(timespec = "seconds"),
+                           "python": platform.python_version(), "platform": platform.platform(),
+                           "processor": platform.processor(), "nr_charts": len(corpus), "seed": BENCH_SEED},
+              "benchmarks": results}
+    output_path = output_path if output_path else f"benchmarks/results/{commit}.json"
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok = True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent = 2)
+    print(f"Saved the results to {output_path}")
+    return report
+
+def compare_results(base_path: str, new_path: str, threshold: float = 1.10):
+    """Compares the median timings of two runs, returns the names of the benchmarks slower by more than the threshold"""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"Base: {base['metadata']['commit']}  New: {new['metadata']['commit']}")
+    regressions = []
+    for name, new_result in new["benchmarks"].items():
+        base_result = base["benchmarks"].get(name)
+        if base_result is None:
+            print(f"{name:34} {'':>12} {new_result['median_us']:12,.1f} us  (new)")
+            continue
+        ratio = new_result["median_us"] / base_result["median_us"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            flag = "  improved"
+        print(f"{name:34} {base_result['median_us']:12,.1f} {new_result['median_us']:12,.1f} us  {ratio:6.2f}x{flag}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Benchmark suite of the VedicHoroscopeData methods and horary search")
+    subparsers = parser.add_subparsers(dest = "command", required = True)
+    run_parser = subparsers.add_parser("run", help = "Run the benchmarks and save the results as JSON")
+    run_parser.add_argument("--repeats", type = int, default = 5)
+    run_parser.add_argument("--filter", default = None, help = "Only run the benchmarks with this substring in their name")
+    run_parser.add_argument("--output", default = None, help = "Results JSON path (default: benchmarks/results/<commit>.json)")
+    compare_parser = subparsers.add_parser("compare", help = "Compare the results JSON of two runs")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type = float, default = 1.10, help = "Slowdown ratio flagged as a regression")
+    args = parser.parse_args()
+    if args.command == "run":
+        run_benchmark_suite(args.repeats, args.filter, args.output)
+    else:
+        sys.exit(1 if compare_results(args.base, args.new, args.threshold) else 0)
@@ -0,0 +1,67 @@
+import time
+from datetime import datetime, timedelta
+import swisseph as swe
+from vedicastro.transits import find_transit_events, iter_transits
+
+"""
+Benchmark of the transit event finder `find_transit_events`, against dense sampling of the transits every minute
+(the original approach of calling `get_transit_details` every minute), comparing the number of `swe.calc_ut`
+evaluations and the wall time. Every sign and sub lord change seen by the dense sampling must match an event,
+which must fall within the minute before it.
+Run from the root of this repo with: `python -m benchmarks.bench_transit_events`
+"""
+
+class CalcEvalCounter:
+    """Wraps `swe.calc_ut` to count the number of planet position evaluations"""
+    def __init__(self):
+        self.count = 0
+        self.calc_ut = swe.calc_ut
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+        return self.calc_ut(*args, **kwargs)
+
+def find_transit_events_dense_sampling(start: datetime, end: datetime, planets: list, step: timedelta = timedelta(minutes = 1)):
+    """Returns the (timestamp, planet, level, from, to) sign and sub lord changes seen by sampling the transits every step"""
+    events, prev_values = [], {}
+    for row in iter_transits(start, end, step, planets):
+        for level, value in (("Sign", row.PlanetSign), ("SubLord", row.SubLord)):
+            key = (row.PlanetName, level)
+            if key in prev_values and prev_values[key] != value:
+                events.append((row.timestamp, row.PlanetName, level, prev_values[key], value))
+            prev_values[key] = value
+    return events
+
+def run_transit_events_benchmark(start: datetime = datetime(2024, 3, 1), end: datetime = datetime(2024, 5, 1),
+                                 planets: list = None):
+    # Mercury is retrograde in April 2024
+    planets = planets if planets else ["Sun", "Moon", "Mercury", "Venus", "Mars", "Rahu"]
+    counter = CalcEvalCounter()
+    swe.calc_ut = counter
+    try:
+        start_time = time.perf_counter()
+        dense_events = find_transit_events_dense_sampling(start, end, planets)
+        dense_time, dense_evals = time.perf_counter() - start_time, counter.count
+
+        counter.count = 0
+        start_time = time.perf_counter()
+        events = find_transit_events(start, end, planets, levels = ["Sign", "SubLord"])
+        events_time, events_evals = time.perf_counter() - start_time, counter.count
+    finally:
+        swe.calc_ut = counter.calc_ut
+
+    sort_key = lambda event: (event[1], event[2], event[0])
+    events = [(event.timestamp, event.PlanetName, event.EventType, event.FromValue, event.ToValue) for event in events]
+    mismatches = len(events) != len(dense_events)
+    for dense_event, event in zip(sorted(dense_events, key = sort_key), sorted(events, key = sort_key)):
+        mismatches += (dense_event[1:] != event[1:]) or not (timedelta(0) <= dense_event[0] - event[0] < timedelta(minutes = 1))
+
+    print(f"Found {len(events)} events, {len(dense_events)} by dense sampling, {mismatches} mismatches")
+    print(f"Dense sampling: {dense_evals:10,} calc_ut evals  {dense_time:.3f} s")
+    print(f"Event finder:   {events_evals:10,} calc_ut evals  {events_time:.3f} s")
+    print(f"Speedup: {dense_evals / events_evals:.0f}x evals, {dense_time / events_time:.0f}x wall time")
+    assert not mismatches
+    return {"dense_evals": dense_evals, "dense_secs": dense_time, "events_evals": events_evals, "events_secs": events_time}
+
+if __name__ == "__main__":
+    run_transit_events_benchmark()
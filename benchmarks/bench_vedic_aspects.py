@@ -0,0 +1,56 @@
+import time
+import numpy as np
+from vedicastro.VedicAstro import VedicHoroscopeData, RASHIS
+from vedicastro.aspect_engine import get_vedic_aspects_frame
+from test_suite.references import generate_birth_records
+from test_suite.references import VEDIC_ASPECT_EXCLUDED_OBJECTS, get_planetary_aspects_vedic_lambdas
+
+"""
+Benchmark of the Vedic aspect lookup table engine used by `get_planetary_aspects_vedic`, against the original
+rule lambdas from `test_suite/references.py` (`test_suite/vedic_aspects_test.py` checks that they produce identical aspects).
+Also times `get_vedic_aspects_frame` on a stack of charts, and between pairs of charts (compatibility matching).
+Run from the root of this repo with: `python -m benchmarks.bench_vedic_aspects`
+"""
+
+def run_vedic_aspects_benchmark(nr_charts: int = 300, seed: int = 108):
+    records = generate_birth_records(nr_charts, seed)
+    lambdas_time, table_time = 0.0, 0.0
+    all_planets_data = []
+    for row in zip(*records.values()):
+        vhd = VedicHoroscopeData(*[value.item() for value in row], "Asia/Kolkata", "Krishnamurti", "Placidus")
+        planets_data = vhd.get_planets_data_from_chart(vhd.generate_chart())
+
+        start = time.perf_counter()
+        get_planetary_aspects_vedic_lambdas(planets_data)
+        lambdas_time += time.perf_counter() - start
+        start = time.perf_counter()
+        vhd.get_planetary_aspects_vedic(planets_data)
+        table_time += time.perf_counter() - start
+
+        planets_data = [planet for planet in planets_data if planet.Object not in VEDIC_ASPECT_EXCLUDED_OBJECTS]
+        all_planets_data.append(planets_data)
+
+    planet_names = [planet.Object for planet in all_planets_data[0]]
+    sign_idx = np.array([[RASHIS.index(planet.Rasi) for planet in planets_data] for planets_data in all_planets_data])
+    house_nrs = np.array([[planet.HouseNr for planet in planets_data] for planets_data in all_planets_data])
+
+    start = time.perf_counter()
+    aspects_df = get_vedic_aspects_frame(sign_idx, house_nrs, planet_names)
+    stack_time = time.perf_counter() - start
+
+    # Compatibility matching, between the charts and the next chart
+    start = time.perf_counter()
+    cross_df = get_vedic_aspects_frame(sign_idx, house_nrs, planet_names, np.roll(sign_idx, -1, axis = 0),
+                                       np.roll(house_nrs, -1, axis = 0))
+    cross_time = time.perf_counter() - start
+
+    print(f"Timed {nr_charts} charts ({len(aspects_df)} aspects, {len(cross_df)} cross chart aspects)")
+    print(f"Rule lambdas:   {lambdas_time / nr_charts * 1e3:.3f} ms/chart")
+    print(f"Lookup table:   {table_time / nr_charts * 1e3:.3f} ms/chart  ({lambdas_time / table_time:.1f}x)")
+    print(f"Stacked charts: {stack_time / nr_charts * 1e3:.4f} ms/chart  ({lambdas_time / stack_time:.0f}x)")
+    print(f"Cross charts:   {cross_time / nr_charts * 1e3:.4f} ms/chart pair")
+    return {"lambdas_ms_per_chart": lambdas_time / nr_charts * 1e3, "table_ms_per_chart": table_time / nr_charts * 1e3,
+            "stacked_ms_per_chart": stack_time / nr_charts * 1e3, "cross_ms_per_chart_pair": cross_time / nr_charts * 1e3}
+
+if __name__ == "__main__":
+    run_vedic_aspects_benchmark()
@@ -0,0 +1,61 @@
+import time
+import asyncio
+import argparse
+import collections
+import numpy as np
+import httpx
+
+"""
+Load test of the `VedicAstroAPI` service, which fires requests at a running service with a fixed number of concurrent
+clients, and reports the p50 / p99 latencies, the throughput and the response status codes.
+Start the service first (Eg: `uvicorn VedicAstroAPI:app --port 8088`), then run from the root of this repo with:
+`python -m benchmarks.load_test_api --endpoint horary --concurrency 16 --requests 200`
+"""
+
+CHART_PAYLOAD = {"year": 2024, "month": 2, "day": 5, "hour": 14, "minute": 35, "second": 0, "utc": "+5:30",
+                 "latitude": 12.9716, "longitude": 77.5946, "ayanamsa": "Krishnamurti", "house_system": "Placidus"}
+
+ENDPOINTS = {"chart": "/get_all_horoscope_data", "horary": "/get_all_horary_data"}
+
+def get_payload(endpoint: str, request_nr: int):
+    """Returns the request payload, varying the horary number and chart time across the requests"""
+    payload = dict(CHART_PAYLOAD, minute = request_nr % 60)
+    if endpoint == "horary":
+        payload["horary_number"] = request_nr % 249 + 1
+    return payload
+
+async def run_client(client: httpx.AsyncClient, endpoint: str, request_nrs: collections.deque, results: list):
+    while request_nrs:
+        request_nr = request_nrs.popleft()
+        start = time.perf_counter()
+        try:
+            response = await client.post(ENDPOINTS[endpoint], json = get_payload(endpoint, request_nr))
+            status = response.status_code
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+        results.append((status, time.perf_counter() - start))
+
+async def run_load_test(url: str, endpoint: str, concurrency: int, nr_requests: int, timeout: float = 120):
+    request_nrs, results = collections.deque(range(nr_requests)), []
+    async with httpx.AsyncClient(base_url = url, timeout = timeout) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[run_client(client, endpoint, request_nrs, results) for _ in range(concurrency)])
+        total_time = time.perf_counter() - start
+
+    latencies = np.array([latency for status, latency in results if status == 200]) * 1e3
+    print(f"{endpoint}: {nr_requests} requests, {concurrency} concurrent clients, {total_time:.2f} s "
+          f"({nr_requests / total_time:.1f} requests/s)")
+    print(f"Status codes: {dict(collections.Counter(status for status, _ in results))}")
+    if len(latencies):
+        print(f"Latency of OK responses: p50 {np.percentile(latencies, 50):.1f} ms  p99 {np.percentile(latencies, 99):.1f} ms  "
+              f"max {latencies.max():.1f} ms")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Load test of the VedicAstroAPI service")
+    parser.add_argument("--url", default = "http://127.0.0.1:8088")
+    parser.add_argument("--endpoint", choices = list(ENDPOINTS), default = "chart")
+    parser.add_argument("--concurrency", type = int, default = 16)
+    parser.add_argument("--requests", type = int, default = 200)
+    args = parser.parse_args()
+    asyncio.run(run_load_test(args.url, args.endpoint, args.concurrency, args.requests))
@@ -13,7 +13,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/diliprk/VedicAstro",
-    package_data={'vedicastro': ['data/*.csv']},
+    package_data={'vedicastro': ['data/*.csv', 'data/*.arrow']},
     packages=find_packages(),
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -21,7 +21,7 @@ setup(
         "Operating System :: OS Independent",
     ],
     python_requires='>=3.11',
-    install_requires=["tqdm","polars","fastapi","uvicorn","prettytable","ipykernel","pyswisseph"],
+    install_requires=["tqdm","polars","numpy","pyarrow","fastapi","uvicorn","prettytable","ipykernel","pyswisseph"],
     dependency_links=["git+https://github.com/diliprk/flatlib.git@sidereal#egg=flatlib"]
 )
 
@@ -0,0 +1,50 @@
+import types
+import numpy as np
+from vedicastro.VedicAstro import get_object_name
+from vedicastro.aspect_engine import ASPECT_PLANETS, get_aspects_frame
+from test_suite.references import get_planetary_aspects_pairwise, get_planetary_aspects_15_pairwise
+
+"""
+Tests of the vectorized aspect engine `vedicastro.aspect_engine`, used by `get_planetary_aspects` and
+`get_planetary_aspects_15`, against their original pairwise loops (calling `aspects.getAspect` for each ordered pair
+of planets), which must produce identical aspects on random charts.
+Run from the root of this repo with: `python -m pytest test_suite/aspects_test.py`
+"""
+
+class SnappedChart:
+    """Chart stand-in, with the longitudes of the planets snapped to a coarse grid, to hit exact 15° multiples"""
+    def __init__(self, rng):
+        self.objects = {planet: types.SimpleNamespace(id = planet, lon = float(rng.integers(0, 360 * 4) / 4 + rng.choice([0, 0.001, 0.0004, 0.0005])))
+                        for planet in ASPECT_PLANETS}
+
+    def get(self, planet):
+        return self.objects[planet]
+
+def test_planetary_aspects_match_the_pairwise_loop(random_charts):
+    for vhd, chart in random_charts:
+        assert vhd.get_planetary_aspects(chart) == get_planetary_aspects_pairwise(chart)
+
+def test_planetary_aspects_15_match_the_pairwise_loop(random_charts):
+    for vhd, chart in random_charts:
+        assert vhd.get_planetary_aspects_15(chart) == get_planetary_aspects_15_pairwise(chart)
+
+def test_planetary_aspects_15_on_exact_multiples(random_charts):
+    rng = np.random.default_rng(108)
+    nr_aspects = 0
+    for vhd, _ in random_charts:
+        snapped_chart = SnappedChart(rng)
+        expected = get_planetary_aspects_15_pairwise(snapped_chart)
+        assert vhd.get_planetary_aspects_15(snapped_chart) == expected
+        nr_aspects += len(expected)
+    assert nr_aspects > 0
+
+def test_aspects_frame_matches_the_pairwise_loop(random_charts):
+    lons = np.array([[chart.get(planet).lon for planet in ASPECT_PLANETS] for _, chart in random_charts])
+    speeds = np.array([[chart.get(planet).lonspeed for planet in ASPECT_PLANETS] for _, chart in random_charts])
+    planet_names = [get_object_name(planet) for planet in ASPECT_PLANETS]
+    aspects_df = get_aspects_frame(lons, speeds, planet_names = planet_names)
+    # The frame has each pair once, in the order of `ASPECT_PLANETS`
+    expected_rows = [(chart_id, aspect["P1"], aspect["P2"], float(aspect["AspectDeg"]))
+                     for chart_id, (_, chart) in enumerate(random_charts) for aspect in get_planetary_aspects_pairwise(chart)
+                     if planet_names.index(aspect["P1"]) < planet_names.index(aspect["P2"])]
+    assert aspects_df.select(["ChartID", "P1", "P2", "AspectDeg"]).rows() == expected_rows
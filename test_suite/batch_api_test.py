@@ -0,0 +1,65 @@
+import io
+import json
+import polars as pl
+import pytest
+from fastapi.testclient import TestClient
+import VedicAstroAPI
+
+"""
+Tests of the bulk chart endpoint `/charts/batch` of `VedicAstroAPI`, whose timezone name inputs must give the same
+charts as their UTC offsets, and whose invalid chart times and UTC offsets must be rejected with a 422 error,
+before any chunk is computed.
+Run from the root of this repo with: `python -m pytest test_suite/batch_api_test.py`
+"""
+
+CHART_INPUT = {"year": 1990, "month": 5, "day": 3, "hour": 10, "minute": 20, "second": 0, "utc": "+5:30",
+               "latitude": 11.02, "longitude": 76.98, "ayanamsa": "Krishnamurti", "house_system": "Placidus"}
+
+@pytest.fixture(scope = "module")
+def client():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(VedicAstroAPI, "API_WORKERS", 1)
+        # Small chunks, to check that the later chunks are validated along with the first one
+        monkeypatch.setattr(VedicAstroAPI, "API_BATCH_CHUNK_SIZE", 2)
+        with TestClient(VedicAstroAPI.app) as client:
+            yield client
+
+def get_charts(response) -> list:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_timezone_names_match_the_utc_offsets(client):
+    inputs = [{**CHART_INPUT, "month": month} for month in range(1, 6)]
+    offset_inputs = inputs + [{**CHART_INPUT, "utc": "-5:00", "month": 1}, {**CHART_INPUT, "utc": "-4:00", "month": 7}]
+    name_inputs = [{**input, "utc": "Asia/Kolkata"} for input in inputs] + \
+                  [{**CHART_INPUT, "utc": "America/New_York", "month": 1}, {**CHART_INPUT, "utc": "America/New_York", "month": 7}]
+    offset_response = client.post("/charts/batch", json = offset_inputs)
+    name_response = client.post("/charts/batch", json = name_inputs)
+    assert offset_response.status_code == name_response.status_code == 200
+    assert get_charts(name_response) == get_charts(offset_response)
+    assert [chart["ChartID"] for chart in get_charts(name_response)] == list(range(len(inputs) + 2))
+
+def test_timezone_names_in_an_arrow_table(client):
+    sink = io.BytesIO()
+    pl.DataFrame([{**CHART_INPUT, "utc": "Asia/Kolkata"}]).write_ipc(sink)
+    response = client.post("/charts/batch", content = sink.getvalue(),
+                           headers = {"content-type": VedicAstroAPI.ARROW_FILE_MEDIA_TYPE})
+    assert response.status_code == 200
+    assert get_charts(response) == get_charts(client.post("/charts/batch", json = [CHART_INPUT]))
+
+@pytest.mark.parametrize("chart_input, message", [
+    ({"month": 13}, "Invalid month"),
+    ({"day": 40}, "Invalid day"),
+    ({"month": 2, "day": 30}, "Invalid day"),
+    ({"hour": 25}, "Invalid hour"),
+    ({"minute": 61}, "Invalid minute"),
+    ({"utc": "Nowhere/Atlantis"}, "Unknown timezone"),
+    ({"utc": "+5"}, "Invalid UTC offset"),
+    ({"utc": "+5:75"}, "Invalid UTC offset"),
+    ({"utc": "+25:00"}, "Invalid UTC offset"),
+])
+def test_invalid_inputs_are_rejected(client, chart_input, message):
+    # The invalid input is in the last chunk
+    inputs = [CHART_INPUT] * 4 + [{**CHART_INPUT, **chart_input}]
+    response = client.post("/charts/batch", json = inputs)
+    assert response.status_code == 422
+    assert message in response.json()["detail"]
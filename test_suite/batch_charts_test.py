@@ -0,0 +1,89 @@
+import pytest
+from vedicastro.VedicAstro import VedicHoroscopeData
+from vedicastro.batch import compute_charts, SWE_AYANAMSA_MAPPING, SWE_HOUSE_SYSTEM_MAPPING, BATCH_OBJECTS
+from test_suite.references import generate_birth_records
+
+"""
+Tests of the batch chart engine `vedicastro.batch.compute_charts`, whose planets and houses rows must equal
+`get_planets_data_from_chart` and `get_houses_data_from_chart` of each chart (without `Syzygy` and `Pars Fortuna`),
+across all the ayanamsas and house systems, and of its input broadcasting and validation.
+Run from the root of this repo with: `python -m pytest test_suite/batch_charts_test.py`
+"""
+
+def test_scalar_inputs_are_a_single_chart():
+    planets_df, houses_df = compute_charts(1990, 5, 3, 10, 20, 0, 11.02, 76.98, "+5:30")
+    column_planets_df, column_houses_df = compute_charts([1990], [5], [3], [10], [20], [0], [11.02], [76.98], ["+5:30"])
+    assert planets_df.equals(column_planets_df) and houses_df.equals(column_houses_df)
+    assert planets_df["ChartID"].unique().to_list() == [0]
+
+def test_scalar_year_is_broadcast():
+    planets_df, houses_df = compute_charts(1990, [5, 6], 3, 10, 20, 0, 11.02, 76.98, "+5:30")
+    column_planets_df, column_houses_df = compute_charts([1990, 1990], [5, 6], 3, 10, 20, 0, 11.02, 76.98, "+5:30")
+    assert planets_df.equals(column_planets_df) and houses_df.equals(column_houses_df)
+    assert houses_df["ChartID"].n_unique() == 2
+
+def test_float_utc_offsets_match_the_str_offsets():
+    planets_df, houses_df = compute_charts([1990, 2001], 5, 3, 10, 20, 0, 11.02, 76.98, [5.5, -3.5])
+    str_planets_df, str_houses_df = compute_charts([1990, 2001], 5, 3, 10, 20, 0, 11.02, 76.98, ["+5:30", "-3:30"])
+    assert planets_df.equals(str_planets_df) and houses_df.equals(str_houses_df)
+
+def test_mismatched_column_lengths_raise():
+    with pytest.raises(ValueError, match = "same length"):
+        compute_charts([1990, 1991], [5, 6, 7], 3, 10, 20, 0, 11.02, 76.98, "+5:30")
+
+## Number of random charts, for each ayanamsa and house system
+NR_CHARTS = 10
+
+def get_expected_rows(row: tuple, utc_offset: str, ayanamsa: str, house_system: str):
+    """Returns the planets and houses rows of the chart, from `VedicHoroscopeData`"""
+    vhd = VedicHoroscopeData(*row, utc_offset, ayanamsa, house_system)
+    chart = vhd.generate_chart()
+    planets_rows = [tuple(planet) for planet in vhd.get_planets_data_from_chart(chart) if planet.Object in BATCH_OBJECTS]
+    return planets_rows, [tuple(house) for house in vhd.get_houses_data_from_chart(chart)]
+
+def get_chart_rows(df, chart_id: int):
+    return df.filter(df["ChartID"] == chart_id).drop("ChartID").rows()
+
+@pytest.mark.parametrize("ayanamsa", list(SWE_AYANAMSA_MAPPING))
+@pytest.mark.parametrize("house_system", list(SWE_HOUSE_SYSTEM_MAPPING))
+def test_charts_match_the_chart_data(ayanamsa, house_system):
+    records = generate_birth_records(NR_CHARTS)
+    planets_df, houses_df = compute_charts(**records, utc_offset = "-3:30", ayanamsa = ayanamsa, house_system = house_system)
+    for chart_id, row in enumerate(zip(*records.values())):
+        planets_rows, houses_rows = get_expected_rows([value.item() for value in row], "-3:30", ayanamsa, house_system)
+        assert get_chart_rows(planets_df, chart_id) == planets_rows
+        assert get_chart_rows(houses_df, chart_id) == houses_rows
+
+def test_charts_with_ayanamsa_and_house_system_columns():
+    records = generate_birth_records(NR_CHARTS)
+    ayanamsas = [list(SWE_AYANAMSA_MAPPING)[idx % len(SWE_AYANAMSA_MAPPING)] for idx in range(NR_CHARTS)]
+    house_systems = [list(SWE_HOUSE_SYSTEM_MAPPING)[idx % len(SWE_HOUSE_SYSTEM_MAPPING)] for idx in range(NR_CHARTS)]
+    utc_offsets = ["+5:30", "-8:00", "+0:00", "+9:30", "-3:30"] * (NR_CHARTS // 5)
+    planets_df, houses_df = compute_charts(**records, utc_offset = utc_offsets, ayanamsa = ayanamsas, house_system = house_systems)
+    for chart_id, row in enumerate(zip(*records.values())):
+        planets_rows, houses_rows = get_expected_rows([value.item() for value in row], utc_offsets[chart_id],
+                                                      ayanamsas[chart_id], house_systems[chart_id])
+        assert get_chart_rows(planets_df, chart_id) == planets_rows
+        assert get_chart_rows(houses_df, chart_id) == houses_rows
+
+@pytest.mark.parametrize("chart_time, message", [
+    ({"month": 13}, "Invalid month values \\[13\\] at rows \\[1\\]"),
+    ({"month": 0}, "Invalid month"),
+    ({"day": 40}, "Invalid day values \\[40\\]"),
+    ({"month": 2, "day": 30}, "Invalid day"),
+    ({"year": 1900, "month": 2, "day": 29}, "Invalid day"),
+    ({"hour": 25}, "Invalid hour values \\[25.0\\]"),
+    ({"hour": 24}, "Invalid hour"),
+    ({"minute": 60}, "Invalid minute"),
+    ({"second": -1}, "Invalid second"),
+])
+def test_invalid_chart_times_raise(chart_time, message):
+    # The invalid value is in the second chart
+    inputs = {"year": 2000, "month": 5, "day": 3, "hour": 10, "minute": 20, "second": 0}
+    inputs = {col: [value, chart_time.get(col, value)] for col, value in inputs.items()}
+    with pytest.raises(ValueError, match = message):
+        compute_charts(**inputs, latitude = 11.02, longitude = 76.98, utc_offset = "+5:30")
+
+def test_leap_day_is_valid():
+    planets_df, _ = compute_charts([2000, 2024], 2, 29, 23, 59, 59.5, 11.02, 76.98, "+5:30")
+    assert planets_df["ChartID"].n_unique() == 2
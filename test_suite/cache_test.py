@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import pytest
+from fastapi.testclient import TestClient
+import VedicAstroAPI
+from vedicastro.cache import normalize_chart_key, get_cache_key_digest, ChartResultCache, SQLiteCacheBackend
+
+"""
+Tests of the chart cache keys of `vedicastro.cache.normalize_chart_key`, for the UTC offset and the timezone name
+forms of the chart time, of the `SQLiteCacheBackend` used from many threads and from the event loop (off the loop,
+with `get_async` / `set_async`), and of the cached `/get_all_horoscope_data` and `/get_all_horary_data` endpoints
+with both forms.
+Run from the root of this repo with: `python -m pytest test_suite/cache_test.py`
+"""
+
+CHART_INPUT = {"year": 1990, "month": 5, "day": 3, "hour": 10, "minute": 20, "second": 0,
+               "latitude": 11.02, "longitude": 76.98, "ayanamsa": "Krishnamurti", "house_system": "Placidus"}
+
+def get_chart_key(utc: str, **chart_input):
+    inputs = {**CHART_INPUT, **chart_input}
+    return normalize_chart_key(inputs.pop("year"), inputs.pop("month"), inputs.pop("day"), inputs.pop("hour"),
+                               inputs.pop("minute"), inputs.pop("second"), utc, inputs.pop("latitude"),
+                               inputs.pop("longitude"), inputs.pop("ayanamsa"), inputs.pop("house_system"), **inputs)
+
+def test_timezone_name_and_offset_share_the_key():
+    key = get_chart_key("+5:30")
+    assert key[:2] == ("1990-05-03T04:50:00", 330)
+    assert get_chart_key("Asia/Kolkata") == key
+    assert get_cache_key_digest(get_chart_key("Asia/Kolkata")) == get_cache_key_digest(key)
+
+def test_timezone_name_is_resolved_at_the_chart_time():
+    winter_key = get_chart_key("America/New_York", month = 1)
+    summer_key = get_chart_key("America/New_York", month = 7)
+    assert winter_key[1] == -300 and winter_key == get_chart_key("-5:00", month = 1)
+    assert summer_key[1] == -240 and summer_key == get_chart_key("-4:00", month = 7)
+
+def test_unknown_timezone_raises():
+    with pytest.raises(ValueError, match = "Unknown timezone"):
+        get_chart_key("Nowhere/Atlantis")
+
+class ThreadRecordingBackend(SQLiteCacheBackend):
+    """SQLite backend, which records the threads its get and set are called from"""
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.thread_ids = set()
+
+    def get(self, key: str):
+        self.thread_ids.add(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key: str, value, ttl_secs: float):
+        self.thread_ids.add(threading.get_ident())
+        super().set(key, value, ttl_secs)
+
+def test_sqlite_backend_from_many_threads(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"))
+    def set_and_get(thread_nr: int):
+        for idx in range(50):
+            backend.set(f"{thread_nr}-{idx}", {"idx": idx}, 60)
+            assert backend.get(f"{thread_nr}-{idx}")[0] == {"idx": idx}
+    threads = [threading.Thread(target = set_and_get, args = (thread_nr,)) for thread_nr in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(backend.get(f"{thread_nr}-49")[0] == {"idx": 49} for thread_nr in range(8))
+    assert backend.get("missing") is None
+    backend.set("expired", 1, -1)
+    assert backend.get("expired") is None and backend.purge_expired() == 1
+    backend.close()
+
+def test_async_cache_runs_the_backend_off_the_event_loop(tmp_path):
+    backend = ThreadRecordingBackend(str(tmp_path / "cache.sqlite"))
+    async def run():
+        chart_cache = ChartResultCache(16, 60, backend)
+        await asyncio.gather(*[chart_cache.set_async(f"key-{idx}", idx) for idx in range(4)])
+        assert await chart_cache.get_async("key-1") == 1
+        # A miss in memory is looked up in the backend (Eg: written by another process)
+        chart_cache.clear()
+        assert await chart_cache.get_async("key-2") == 2 and await chart_cache.get_async("key-9") is None
+        assert chart_cache.stats["hits"] == 1 and chart_cache.stats["backend_hits"] == 1 and chart_cache.stats["misses"] == 1
+        return threading.get_ident()
+    loop_thread_id = asyncio.run(run())
+    assert backend.thread_ids and loop_thread_id not in backend.thread_ids
+    backend.close()
+
+@pytest.fixture(scope = "module")
+def client(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(VedicAstroAPI, "API_WORKERS", 1)
+        monkeypatch.setattr(VedicAstroAPI, "API_CACHE_SQLITE_PATH", str(tmp_path_factory.mktemp("cache") / "cache.sqlite"))
+        with TestClient(VedicAstroAPI.app) as client:
+            yield client
+
+def test_horoscope_data_with_timezone_name_and_offset(client):
+    offset_response = client.post("/get_all_horoscope_data", json = {**CHART_INPUT, "utc": "+5:30"})
+    assert offset_response.status_code == 200
+    assert 'cache;desc="miss"' in offset_response.headers["Server-Timing"]
+    name_response = client.post("/get_all_horoscope_data", json = {**CHART_INPUT, "utc": "Asia/Kolkata"})
+    assert name_response.status_code == 200
+    assert 'cache;desc="hit"' in name_response.headers["Server-Timing"]
+    assert name_response.json() == offset_response.json()
+    assert client.post("/get_all_horoscope_data", json = {**CHART_INPUT, "utc": "Nowhere/Atlantis"}).status_code == 422
+
+def test_horary_data_with_timezone_name_and_offset(client):
+    horary_input = {**CHART_INPUT, "horary_number": 34}
+    offset_response = client.post("/get_all_horary_data", json = {**horary_input, "utc": "+5:30"})
+    assert offset_response.status_code == 200
+    assert 'cache;desc="miss"' in offset_response.headers["Server-Timing"]
+    name_response = client.post("/get_all_horary_data", json = {**horary_input, "utc": "Asia/Kolkata"})
+    assert name_response.status_code == 200
+    assert 'cache;desc="hit"' in name_response.headers["Server-Timing"]
+    assert name_response.json() == offset_response.json()
+    # Computed with the timezone name (a cache miss), as the resolved offset differs in summer
+    summer_input = {**horary_input, "month": 7, "latitude": 40.71, "longitude": -74.01}
+    summer_response = client.post("/get_all_horary_data", json = {**summer_input, "utc": "America/New_York"})
+    assert summer_response.status_code == 200
+    assert 'cache;desc="miss"' in summer_response.headers["Server-Timing"]
+    assert summer_response.json() == client.post("/get_all_horary_data", json = {**summer_input, "utc": "-4:00"}).json()
+    assert client.post("/get_all_horary_data", json = {**horary_input, "utc": "Nowhere/Atlantis"}).status_code == 422
@@ -0,0 +1,34 @@
+import pytest
+from vedicastro.VedicAstro import VedicHoroscopeData
+from test_suite.references import StrParsingHoroscopeData
+
+"""
+Tests of the chart data tables methods of `VedicHoroscopeData`, which read the numeric attributes of the flatlib objects
+directly, against their original implementations parsing `str(obj)` of every object, which must produce identical
+planets, houses and transit data on random charts.
+Run from the root of this repo with: `python -m pytest test_suite/chart_data_native_test.py`
+"""
+
+def get_chart_args(random_birth_records, house_system: str):
+    return [[value.item() for value in row] + ["+5:30", "Krishnamurti", house_system]
+            for row in zip(*random_birth_records.values())]
+
+@pytest.mark.parametrize("house_system", ["Placidus", "Equal", "Whole Sign"])
+def test_planets_and_houses_data_match_the_str_parsing(random_birth_records, house_system):
+    for args in get_chart_args(random_birth_records, house_system):
+        vhd, str_parsing_vhd = VedicHoroscopeData(*args), StrParsingHoroscopeData(*args)
+        chart = vhd.generate_chart()
+        assert vhd.get_planets_data_from_chart(chart) == str_parsing_vhd.get_planets_data_from_chart(chart)
+        assert vhd.get_houses_data_from_chart(chart) == str_parsing_vhd.get_houses_data_from_chart(chart)
+
+def test_planets_data_with_new_houses_chart_match_the_str_parsing(random_birth_records):
+    for args in get_chart_args(random_birth_records, "Placidus")[:20]:
+        vhd, str_parsing_vhd = VedicHoroscopeData(*args), StrParsingHoroscopeData(*args)
+        chart = vhd.generate_chart()
+        houses_chart = VedicHoroscopeData(*args[:-1], "Equal").generate_chart()
+        assert vhd.get_planets_data_from_chart(chart, houses_chart) == \
+               str_parsing_vhd.get_planets_data_from_chart(chart, houses_chart)
+
+def test_transit_details_match_the_str_parsing(random_birth_records):
+    for args in get_chart_args(random_birth_records, "Placidus")[:20]:
+        assert VedicHoroscopeData(*args).get_transit_details() == StrParsingHoroscopeData(*args).get_transit_details()
@@ -0,0 +1,41 @@
+import polars as pl
+import pytest
+from vedicastro.batch import compute_charts
+from vedicastro.chart_store import ChartStore, DMS_NULL, encode_dms, decode_dms
+
+"""
+Tests of the array-backed `vedicastro.chart_store.ChartStore`, which must decode back to the identical `PlanetsData` /
+`HousesData` named tuples of `VedicHoroscopeData`, and to the identical DataFrames of `vedicastro.batch.compute_charts`.
+Run from the root of this repo with: `python -m pytest test_suite/chart_store_test.py`
+"""
+
+@pytest.fixture(scope = "module")
+def charts_records(random_charts):
+    return [(vhd.get_planets_data_from_chart(chart), vhd.get_houses_data_from_chart(chart)) for vhd, chart in random_charts]
+
+def test_dms_round_trip():
+    for dms in ["+00:00:00", "-00:00:00", "+29:59:59", "-01:02:03", "+359:00:01"]:
+        assert decode_dms(encode_dms(dms)) == dms
+    assert encode_dms(None) == DMS_NULL and decode_dms(DMS_NULL) is None
+
+def test_records_round_trip(charts_records):
+    store = ChartStore.from_records(charts_records)
+    assert len(store) == len(charts_records)
+    for chart_id, (planets_data, houses_data) in enumerate(charts_records):
+        assert store.planets_data(chart_id) == planets_data
+        assert store.houses_data(chart_id) == houses_data
+
+def test_records_to_polars(charts_records):
+    planets_df, houses_df = ChartStore.from_records(charts_records).to_polars()
+    for df, idx in [(planets_df, 0), (houses_df, 1)]:
+        expected_df = pl.concat([pl.DataFrame(records[idx]).with_columns(pl.lit(chart_id).alias("ChartID"))
+                                 for chart_id, records in enumerate(charts_records)])
+        assert df.with_columns(pl.col(pl.Categorical).cast(pl.Utf8)).rows() == \
+               expected_df.select(df.columns).rows()
+
+def test_frames_round_trip(random_birth_records):
+    planets_df, houses_df = compute_charts(**random_birth_records, utc_offset = "+5:30")
+    store = ChartStore.from_frames(planets_df, houses_df)
+    assert len(store) == len(random_birth_records["year"])
+    for df, store_df in zip([planets_df, houses_df], store.to_polars()):
+        assert store_df.cast(dict(df.schema)).equals(df)
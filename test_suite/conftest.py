@@ -0,0 +1,23 @@
+import pytest
+from vedicastro.VedicAstro import VedicHoroscopeData
+from test_suite.references import generate_birth_records
+
+"""
+Shared fixtures of the tests in `test_suite`.
+"""
+
+## Number of random charts, which the equivalence tests check the engines on
+NR_RANDOM_CHARTS = 100
+
+@pytest.fixture(scope = "session")
+def random_birth_records():
+    return generate_birth_records(NR_RANDOM_CHARTS)
+
+@pytest.fixture(scope = "session")
+def random_charts(random_birth_records):
+    """Returns the (VedicHoroscopeData, chart) pairs of the random birth records, in the +5:30 UTC offset"""
+    charts = []
+    for row in zip(*random_birth_records.values()):
+        vhd = VedicHoroscopeData(*[value.item() for value in row], "+5:30", "Krishnamurti", "Placidus")
+        charts.append((vhd, vhd.generate_chart()))
+    return charts
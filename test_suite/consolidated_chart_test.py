@@ -0,0 +1,28 @@
+import polars as pl
+import pytest
+from vedicastro.batch import compute_charts
+from vedicastro.consolidated import compute_consolidated_charts_batch
+from test_suite.references import get_consolidated_chart_data_polars
+
+"""
+Tests of the sign bucket builder `vedicastro.consolidated`, used by `get_consolidated_chart_data`, against the original
+polars group by with `map_elements`, which must produce identical output in both return styles on random charts.
+The batched columnar mode `compute_consolidated_charts_batch` is checked against the same group by.
+Run from the root of this repo with: `python -m pytest test_suite/consolidated_chart_test.py`
+"""
+
+@pytest.mark.parametrize("return_style", ["dataframe_records", None])
+def test_consolidated_chart_matches_the_group_by(random_charts, return_style):
+    for vhd, chart in random_charts:
+        planets_data, houses_data = vhd.get_planets_data_from_chart(chart), vhd.get_houses_data_from_chart(chart)
+        assert vhd.get_consolidated_chart_data(planets_data, houses_data, return_style) == \
+               get_consolidated_chart_data_polars(planets_data, houses_data, return_style)
+
+def test_batch_consolidated_charts_match_the_group_by(random_birth_records):
+    planets_df, houses_df = compute_charts(**random_birth_records, utc_offset = "+5:30")
+    consolidated_df = compute_consolidated_charts_batch(planets_df, houses_df)
+    for chart_id in range(len(random_birth_records["year"])):
+        planets_data = planets_df.filter(pl.col("ChartID") == chart_id).drop("ChartID").to_dicts()
+        houses_data = houses_df.filter(pl.col("ChartID") == chart_id).drop("ChartID").to_dicts()
+        assert consolidated_df.filter(pl.col("ChartID") == chart_id).drop("ChartID").to_dicts() == \
+               get_consolidated_chart_data_polars(planets_data, houses_data, "dataframe_records")
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+from flatlib import const
+
+"""
+Tests of the vectorized Vimshottari Dasa engine `vedicastro.dasa`, against `VedicHoroscopeData.compute_vimshottari_dasa`
+over the random charts of the `random_charts` fixture, and of the `current_period_at` lookup.
+Run from the root of this repo with: `python -m pytest test_suite/dasa_test.py`
+"""
+
+def test_periods_match_compute_vimshottari_dasa(random_charts):
+    for vhd, chart in random_charts:
+        expected = vhd.compute_vimshottari_dasa(chart)
+        periods_df = vhd.compute_vimshottari_dasa_periods(chart, levels = 2).to_polars()
+        output = {}
+        for level, maha_dasa, bhukti, start, end in periods_df.select(["Level", "MahaDasa", "Bhukti", "Start", "End"]).iter_rows():
+            dates = {"start": start.strftime("%d-%m-%Y"), "end": end.strftime("%d-%m-%Y")}
+            if level == 1:
+                output[maha_dasa] = {**dates, "bhuktis": {}}
+            else:
+                output[maha_dasa]["bhuktis"][bhukti] = dates
+        assert output == expected
+
+def test_current_period_at_has_no_gaps(random_charts):
+    for vhd, chart in random_charts[:5]:
+        periods = vhd.compute_vimshottari_dasa_periods(chart, levels = 4)
+        starts = periods.starts[4][0]
+        for start in starts[1:].tolist():
+            start = datetime(1970, 1, 1) + timedelta(microseconds = start)
+            for ts in (start - timedelta(microseconds = 1), start):
+                period = periods.current_period_at(ts)
+                assert period is not None and period["Start"] <= ts < period["End"]
+        first_start = datetime(1970, 1, 1) + timedelta(microseconds = starts[0].item())
+        assert periods.current_period_at(first_start - timedelta(microseconds = 1)) is None
+
+def test_current_period_at_matches_the_periods(random_charts):
+    vhd, chart = random_charts[0]
+    periods = vhd.compute_vimshottari_dasa_periods(chart, levels = 2)
+    periods_df = periods.to_polars(levels = [2])
+    for maha_dasa, bhukti, start in periods_df.select(["MahaDasa", "Bhukti", "Start"]).iter_rows():
+        period = periods.current_period_at(start + timedelta(minutes = 1))
+        assert (period["MahaDasa"], period["Bhukti"], period["Start"]) == (maha_dasa, bhukti, start)
+
+def test_moon_nakshatra_lord_starts_the_dasas(random_charts):
+    for vhd, chart in random_charts:
+        periods_df = vhd.compute_vimshottari_dasa_periods(chart, levels = 1).to_polars()
+        assert periods_df["MahaDasa"][0] == vhd.get_rl_nl_sl_data(chart.get(const.MOON).lon)["NakshatraLord"]
@@ -0,0 +1,41 @@
+import numpy as np
+import polars as pl
+import pytest
+from flatlib import angle
+from vedicastro.utils import (dms_to_decdeg, dms_to_mins, dms_difference, dms_to_decdeg_expr, dms_to_mins_expr,
+                              dms_difference_expr, dms_to_decdeg_array, dms_to_mins_array, dms_difference_array,
+                              decdeg_to_dms_array)
+from test_suite.references import format_arc_secs, generate_dms_frame
+
+"""
+Tests of the vectorized DMS conversions in `vedicastro.utils`, which must match their scalar versions exactly
+(including the sign being only applied to the degrees part), and of `decdeg_to_dms_array` against `flatlib.angle.toString`.
+Run from the root of this repo with: `python -m pytest test_suite/dms_utils_test.py`
+"""
+
+@pytest.fixture(scope = "module")
+def dms_df():
+    """Random DMS strings, along with every arc-second from -2° to 2° and from 358° to 360°"""
+    edge_arc_secs = np.concatenate([np.arange(-2 * 3600, 2 * 3600), np.arange(358 * 3600, 360 * 3600 + 1)])
+    edge_df = pl.DataFrame({"DMS1": format_arc_secs(edge_arc_secs), "DMS2": format_arc_secs(edge_arc_secs[::-1]),
+                            "DecDeg": edge_arc_secs / 3600})
+    return pl.concat([generate_dms_frame(20_000), edge_df])
+
+def test_dms_to_decdeg_matches_the_scalar_version(dms_df):
+    expected = [dms_to_decdeg(dms) for dms in dms_df["DMS1"]]
+    assert dms_df.lazy().select(dms_to_decdeg_expr(pl.col("DMS1"))).collect().to_series().to_list() == expected
+    assert dms_to_decdeg_array(dms_df["DMS1"]).tolist() == expected
+
+def test_dms_to_mins_matches_the_scalar_version(dms_df):
+    expected = [dms_to_mins(dms) for dms in dms_df["DMS1"]]
+    assert dms_df.lazy().select(dms_to_mins_expr(pl.col("DMS1"))).collect().to_series().to_list() == expected
+    assert dms_to_mins_array(dms_df["DMS1"].to_list()).tolist() == expected
+
+def test_dms_difference_matches_the_scalar_version(dms_df):
+    expected = [dms_difference(dms1, dms2) for dms1, dms2 in dms_df.select(["DMS1", "DMS2"]).iter_rows()]
+    assert dms_df.lazy().select(dms_difference_expr(pl.col("DMS1"), pl.col("DMS2"))).collect().to_series().to_list() == expected
+    assert dms_difference_array(dms_df["DMS1"].to_numpy(), dms_df["DMS2"].to_numpy()).tolist() == expected
+
+def test_decdeg_to_dms_matches_flatlib(dms_df):
+    dec_degs = dms_df["DecDeg"].to_numpy()
+    assert decdeg_to_dms_array(dec_degs).tolist() == [angle.toString(value) for value in dec_degs.tolist()]
@@ -9,6 +9,7 @@ which is about 374,400 combinations. Some combinations take slightly longer beca
 clockwise procession through linear time across the zodiac, and some take a very short time. 
 For quick testing, you can change the `range(24*60)` to something minimal like `range(10)` in `minutes_progress`
 Running this script will create a .csv file in this same directory
+For a parallel and resumable run over all the cores, use `horary_validation_harness.py`
 """
 
 def run_horary_func_tests():
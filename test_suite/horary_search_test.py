@@ -0,0 +1,92 @@
+import pytest
+import swisseph as swe
+from vedicastro.horary_chart import (SWE_AYANAMAS, ASC_MATCH_OFFSET_DEG, get_horary_ascendant_degree, get_day_jd_range,
+                                     get_ascendant_longitude, find_ascendant_crossings, find_all_ascendant_times,
+                                     HoraryAscendantIndex)
+from vedicastro.utils import utc_offset_str_to_float
+
+"""
+Tests of the horary ascendant search `find_ascendant_crossings` and `find_all_ascendant_times`, checking that every
+returned time has the Ascendant at the starting degree of the horary number and its required sub lord, and that all the
+crossings within the day are returned, against a minute by minute scan of the Ascendant.
+The `HoraryAscendantIndex` of the day, and its saved and reloaded copy, must return the same matches as the search.
+Run from the root of this repo with: `python -m pytest test_suite/horary_search_test.py`
+"""
+
+## Same test date and location as `horary_functions_test.py` (Coimbatore)
+YEAR, MONTH, DAY, UTC_OFFSET = 2024, 2, 5, "+5:30"
+LATITUDE, LONGITUDE = 11.020085773931049, 76.98319647719487
+AYANAMSA = "Krishnamurti"
+
+## Horary numbers to check, with their number of matches within the test day:
+## 1 wraps around 0° Aries, 249 is the last sub division (before the wrap), and the Ascendant of
+## 134 and 135 is near the starting degree of the day, so it's crossed again ~4 minutes before the day ends
+HORARY_NUMBER_MATCHES = [(1, 1), (34, 1), (134, 2), (135, 2), (249, 1)]
+
+def get_deg_diff(lon: float, target_deg: float) -> float:
+    """Returns the difference of the longitude from the target degree, wrapped to [-180, 180)"""
+    return (lon - target_deg + 180) % 360 - 180
+
+def get_crossings_by_scan(target_deg: float) -> int:
+    """Counts the crossings of the target degree within the test day, by sampling the Ascendant every minute"""
+    jd_start, _ = get_day_jd_range(YEAR, MONTH, DAY, utc_offset_str_to_float(UTC_OFFSET))
+    diffs = [get_deg_diff(get_ascendant_longitude(jd_start + minute / 1440, LATITUDE, LONGITUDE), target_deg)
+             for minute in range(24 * 60 + 1)]
+    return sum(1 for diff, next_diff in zip(diffs, diffs[1:]) if diff < 0 <= next_diff)
+
+@pytest.mark.parametrize("horary_number, nr_matches", HORARY_NUMBER_MATCHES)
+def test_ascendant_crossings_are_at_the_target_degree(horary_number, nr_matches):
+    target_deg = get_horary_ascendant_degree(horary_number)["ZodiacDegreeLocation"] + ASC_MATCH_OFFSET_DEG
+    jd_start, jd_end = get_day_jd_range(YEAR, MONTH, DAY, utc_offset_str_to_float(UTC_OFFSET))
+    swe.set_sid_mode(SWE_AYANAMAS[AYANAMSA])
+    crossings = find_ascendant_crossings(jd_start, jd_end, LATITUDE, LONGITUDE, [target_deg])[0]
+    assert len(crossings) == nr_matches == get_crossings_by_scan(target_deg)
+    assert crossings == sorted(crossings)
+    for crossing_jd in crossings:
+        assert jd_start <= crossing_jd <= jd_end
+        assert get_deg_diff(get_ascendant_longitude(crossing_jd, LATITUDE, LONGITUDE), target_deg) == pytest.approx(0, abs = 1e-6)
+
+@pytest.mark.parametrize("horary_number, nr_matches", HORARY_NUMBER_MATCHES)
+def test_all_ascendant_times_match_the_horary_number(horary_number, nr_matches):
+    horary_asc = get_horary_ascendant_degree(horary_number)
+    matches = find_all_ascendant_times(YEAR, MONTH, DAY, UTC_OFFSET, LATITUDE, LONGITUDE, horary_number, AYANAMSA)
+    assert len(matches) == nr_matches
+    assert [matched_time for matched_time, _, _ in matches] == sorted(matched_time for matched_time, _, _ in matches)
+    for matched_time, _, houses_data in matches:
+        asc = houses_data[0]
+        assert (matched_time.year, matched_time.month, matched_time.day) == (YEAR, MONTH, DAY)
+        # The houses data rounds the longitude to 3 decimals
+        assert get_deg_diff(asc.LonDecDeg, horary_asc["ZodiacDegreeLocation"]) == pytest.approx(0, abs = 1e-3)
+        assert asc.SubLord == horary_asc["SubLord"]
+
+def get_match_rows(matches: list) -> list:
+    """Returns the matched times and houses data of the matches (the charts themselves aren't comparable)"""
+    return [(matched_time, houses_data) for matched_time, _, houses_data in matches]
+
+@pytest.fixture(scope = "module")
+def horary_index():
+    return HoraryAscendantIndex.build(YEAR, MONTH, DAY, UTC_OFFSET, LATITUDE, LONGITUDE, AYANAMSA)
+
+def test_horary_index_matches_the_search(horary_index):
+    for horary_number in range(1, 250):
+        expected = get_match_rows(find_all_ascendant_times(YEAR, MONTH, DAY, UTC_OFFSET, LATITUDE, LONGITUDE,
+                                                           horary_number, AYANAMSA))
+        assert get_match_rows(horary_index.get_matches(horary_number)) == expected
+        # The matched times are all the crossings, including the ones where the sub lord doesn't match
+        matched_times = horary_index.get_matched_times(horary_number)
+        assert all(matched_time in matched_times for matched_time, _ in expected)
+    for horary_number, nr_matches in HORARY_NUMBER_MATCHES:
+        assert len(horary_index.get_crossing_jds(horary_number)) == nr_matches
+
+def test_horary_index_save_and_load(horary_index, tmp_path):
+    file_path = str(tmp_path / "horary_index.json")
+    horary_index.save(file_path)
+    loaded_index = HoraryAscendantIndex.load(file_path)
+    assert vars(loaded_index) == vars(horary_index)
+    for horary_number, _ in HORARY_NUMBER_MATCHES:
+        assert get_match_rows(loaded_index.get_matches(horary_number)) == get_match_rows(horary_index.get_matches(horary_number))
+
+@pytest.mark.parametrize("horary_number", [0, 250])
+def test_horary_index_rejects_out_of_range_numbers(horary_index, horary_number):
+    with pytest.raises(ValueError, match = "out of range"):
+        horary_index.get_matches(horary_number)
@@ -0,0 +1,60 @@
+import numpy as np
+import polars as pl
+import pytest
+from vedicastro import horary_chart
+from test_suite.references import get_horary_ascendant_degree_filter
+
+"""
+Tests of the lazily loaded KP SubLord Divisions data and Horary Ascendant tables of `vedicastro.horary_chart`
+(the `KP_SL_DMS_DATA`, `HORARY_ASC_TABLE` and `HORARY_ASC_ARRAYS` module attributes), which must equal the values
+derived from the CSV File, whether they're loaded from the precompiled Arrow file or the CSV File itself.
+Run from the root of this repo with: `python -m pytest test_suite/horary_tables_test.py`
+"""
+
+HORARY_NUMBERS = range(1, 250)
+
+@pytest.fixture(scope = "module")
+def csv_data():
+    return horary_chart.read_kp_sl_dms_csv()
+
+@pytest.fixture
+def csv_only(monkeypatch, tmp_path):
+    """Loads the lazy attributes from the CSV File, as when the precompiled Arrow file is missing"""
+    monkeypatch.setattr(horary_chart, "ipc_file_path", str(tmp_path / "missing.arrow"))
+    for load_func in horary_chart.LAZY_ATTRIBUTES.values():
+        load_func.cache_clear()
+    yield
+    for load_func in horary_chart.LAZY_ATTRIBUTES.values():
+        load_func.cache_clear()
+
+def check_lazy_attributes(csv_data: pl.DataFrame):
+    assert horary_chart.KP_SL_DMS_DATA.equals(csv_data)
+    assert horary_chart.KP_SL_DMS_DATA is horary_chart.KP_SL_DMS_DATA
+    expected = [get_horary_ascendant_degree_filter(csv_data, horary_number) for horary_number in HORARY_NUMBERS]
+    assert [dict(zip(horary_chart.HORARY_ASC_TABLE_COLS, row)) for row in horary_chart.HORARY_ASC_TABLE] == expected
+    assert [horary_chart.get_horary_ascendant_degree(horary_number) for horary_number in HORARY_NUMBERS] == expected
+    for col in horary_chart.HORARY_ASC_TABLE_COLS:
+        assert horary_chart.HORARY_ASC_ARRAYS[col].tolist() == [data[col] for data in expected]
+    assert horary_chart.HORARY_ASC_ARRAYS["ZodiacDegreeLocation"].dtype == np.float64
+    horary_ascs = horary_chart.get_horary_ascendant_degrees([249, 1, 34])
+    assert {col: values.tolist() for col, values in horary_ascs.items()} == \
+           {col: [expected[horary_number - 1][col] for horary_number in [249, 1, 34]] for col in horary_chart.HORARY_ASC_TABLE_COLS}
+
+def test_lazy_attributes_match_the_csv(csv_data):
+    check_lazy_attributes(csv_data)
+
+def test_lazy_attributes_from_the_csv_match_the_csv(csv_data, csv_only):
+    check_lazy_attributes(csv_data)
+
+def test_arrow_file_matches_the_csv(csv_data):
+    assert pl.read_ipc(horary_chart.ipc_file_path).equals(csv_data)
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        horary_chart.HORARY_ASC_UNKNOWN
+
+def test_out_of_range_horary_numbers():
+    assert horary_chart.get_horary_ascendant_degree(0) == horary_chart.get_horary_ascendant_degree(250) == \
+           "SL Div Nr. out of range. Please provide a number between 1 and 249."
+    with pytest.raises(ValueError, match = "out of range"):
+        horary_chart.get_horary_ascendant_degrees([1, 250])
@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import argparse
+import collections
+import multiprocessing
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import polars as pl
+import swisseph as swe
+from tqdm import tqdm
+from vedicastro.horary_chart import (SWE_AYANAMAS, ASC_MATCH_OFFSET_DEG, get_horary_ascendant_degree,
+                                     find_ascendant_crossings, get_horary_matches)
+from vedicastro.utils import utc_offset_str_to_float
+
+"""
+Parallel version of the horary ascendant validation in `horary_functions_test.py`, which shards the
+(location, horary number, minute) grid across a process pool, and writes the results of each shard to its own
+Parquet chunk in the output directory as soon as it completes.
+Each minute of the grid searches the 24 hours from that minute for the first Ascendant match of the horary number,
+so every grid cell runs the root solver on a differently aligned sampling grid, and must find a match with the
+required degree and sub lord, after its minute.
+The chunks are the checkpoint: an interrupted run resumes with the same command, skipping the completed shards.
+It reports the throughput of each worker, and the grid (horary numbers, minutes, locations) is configurable,
+so it doubles as a scaling benchmark. Run from the root of this repo with, Eg:
+`python -m test_suite.horary_validation_harness --workers 8 --minutes 60 --output-dir horary_validation_results`
+Read all the results with `polars.scan_parquet("horary_validation_results/*.parquet")`.
+"""
+
+## Default test date and location parameters, same as `horary_functions_test.py`
+DEFAULT_TEST_DATE = {"year": 2024, "month": 2, "day": 5, "utc": "+5:30", "ayan": "Krishnamurti"}
+DEFAULT_LOCATIONS = [(11.020085773931049, 76.98319647719487)]
+
+HoraryShard = collections.namedtuple("HoraryShard", ["ShardID", "LocationID", "HoraryNumber", "MinuteStart", "MinuteEnd"])
+
+def get_shards(nr_locations: int, horary_numbers: list, nr_minutes: int, shard_minutes: int):
+    """Splits the (location, horary number, minute) grid into shards of `shard_minutes` minutes"""
+    shards = []
+    for location_id in range(nr_locations):
+        for horary_number in horary_numbers:
+            for minute_start in range(0, nr_minutes, shard_minutes):
+                shards.append(HoraryShard(len(shards), location_id, horary_number, minute_start,
+                                          min(minute_start + shard_minutes, nr_minutes)))
+    return shards
+
+def get_shard_path(output_dir: str, shard: HoraryShard):
+    return os.path.join(output_dir, f"shard-{shard.ShardID:07d}.parquet")
+
+def find_first_ascendant_match(start_time: datetime, utc_offset: str, lat: float, lon: float, horary_number: int,
+                               ayanamsa: str):
+    """
+    Returns the first (matched_time, houses_chart, houses_data) Ascendant match of the horary number
+    within the 24 hours from the local `start_time`, or None if there is no match
+    """
+    utc = swe.utc_time_zone(start_time.year, start_time.month, start_time.day, start_time.hour, start_time.minute,
+                            start_time.second, utc_offset_str_to_float(utc_offset))
+    _, jd_start = swe.utc_to_jd(*utc)
+    swe.set_sid_mode(SWE_AYANAMAS.get(ayanamsa))
+    target_deg = get_horary_ascendant_degree(horary_number)["ZodiacDegreeLocation"] + ASC_MATCH_OFFSET_DEG
+    crossings = find_ascendant_crossings(jd_start, jd_start + 1, lat, lon, [target_deg])[0]
+    matches = get_horary_matches(crossings, utc_offset, lat, lon, horary_number, ayanamsa)
+    return matches[0] if matches else None
+
+def run_horary_shard(shard: HoraryShard, test_date: dict, location: tuple, output_dir: str):
+    """
+    Validates the horary ascendant matches of the shard, and writes its results to its Parquet chunk.
+    Returns the (worker pid, nr of grid cells, elapsed secs) of the shard.
+    """
+    start = time.perf_counter()
+    latitude, longitude = location
+    horary_asc = get_horary_ascendant_degree(shard.HoraryNumber)
+    start_time = datetime(test_date["year"], test_date["month"], test_date["day"])
+    test_results = []
+    for minute in range(shard.MinuteStart, shard.MinuteEnd):
+        current_time = start_time + timedelta(minutes = minute)
+        horary_match = find_first_ascendant_match(current_time, test_date["utc"], latitude, longitude, shard.HoraryNumber,
+                                                  test_date["ayan"])
+        matched_time, houses_data = (horary_match[0], horary_match[2]) if horary_match else (None, None)
+        asc = houses_data[0] if houses_data else None
+        test_results.append({
+            "Latitude": latitude,
+            "Longitude": longitude,
+            "Horary_Number": shard.HoraryNumber,
+            "Horary_Time": current_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "MatchedTime": matched_time.strftime("%Y-%m-%d %H:%M:%S") if matched_time else None,
+            "is_MatchedTime_Within_Day": current_time <= matched_time < current_time + timedelta(days = 1) if matched_time else False,
+            "Req_Asc_Deg": horary_asc["ZodiacDegreeLocation"],
+            "Final_Asc_Deg": asc.LonDecDeg if asc else None,
+            "is_AscDeg_Equal": round(horary_asc["ZodiacDegreeLocation"], 2) == round(asc.LonDecDeg, 2) if asc else False,
+            "Req_Asc_SubLord": horary_asc["SubLord"],
+            "Final_Asc_SubLord": asc.SubLord if asc else None,
+            "is_SL_Match": horary_asc["SubLord"] == asc.SubLord if asc else False,
+        })
+
+    # Write to a temporary file and rename it, so that a chunk is either complete or missing
+    shard_path = get_shard_path(output_dir, shard)
+    pl.DataFrame(test_results, schema_overrides = {"MatchedTime": pl.Utf8, "Final_Asc_Deg": pl.Float64,
+                                                   "Final_Asc_SubLord": pl.Utf8}).write_parquet(shard_path + ".tmp")
+    os.replace(shard_path + ".tmp", shard_path)
+    return os.getpid(), len(test_results), time.perf_counter() - start
+
+def load_or_save_manifest(output_dir: str, config: dict):
+    """Saves the run config in the output directory, or checks that a resumed run has the same config"""
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            saved_config = json.load(f)
+        if saved_config != config:
+            raise ValueError(f"{output_dir} has the results of a different run config {saved_config}, "
+                             f"use another output directory")
+    else:
+        with open(manifest_path, "w") as f:
+            json.dump(config, f, indent = 2)
+
+def run_horary_validation(output_dir: str, workers: int = None, horary_numbers: list = None, nr_minutes: int = 24 * 60,
+                          shard_minutes: int = 60, locations: list = None, test_date: dict = None):
+    workers = workers if workers else os.cpu_count()
+    horary_numbers = horary_numbers if horary_numbers else list(range(1, 250))
+    locations = [list(location) for location in (locations if locations else DEFAULT_LOCATIONS)]
+    test_date = test_date if test_date else DEFAULT_TEST_DATE
+    os.makedirs(output_dir, exist_ok = True)
+    # The search mode keeps a resumed run from mixing in the results of the day searches of earlier versions
+    load_or_save_manifest(output_dir, {"test_date": test_date, "locations": locations, "horary_numbers": horary_numbers,
+                                       "nr_minutes": nr_minutes, "shard_minutes": shard_minutes,
+                                       "search": "first_match_from_minute"})
+
+    shards = get_shards(len(locations), horary_numbers, nr_minutes, shard_minutes)
+    pending_shards = [shard for shard in shards if not os.path.exists(get_shard_path(output_dir, shard))]
+    print(f"{len(shards)} shards of {shard_minutes} minutes, {len(shards) - len(pending_shards)} already completed, "
+          f"running {len(pending_shards)} on {workers} workers")
+
+    worker_stats = collections.defaultdict(lambda: [0, 0.0])  # pid -> [nr of grid cells, busy secs]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers = workers, mp_context = multiprocessing.get_context("spawn")) as pool:
+        jobs = [pool.submit(run_horary_shard, shard, test_date, tuple(locations[shard.LocationID]), output_dir)
+                for shard in pending_shards]
+        for job in tqdm(as_completed(jobs), total = len(jobs), desc = "Horary Ascendant Validation Progress"):
+            pid, nr_cells, elapsed = job.result()
+            worker_stats[pid][0] += nr_cells
+            worker_stats[pid][1] += elapsed
+    total_time = time.perf_counter() - start
+
+    nr_cells = sum(cells for cells, _ in worker_stats.values())
+    print(f"Validated {nr_cells:,} grid cells in {total_time:.1f} s ({nr_cells / max(total_time, 1e-9):,.1f} cells/s)")
+    for pid, (cells, busy_time) in sorted(worker_stats.items()):
+        print(f"Worker {pid}: {cells:8,} cells  {busy_time:8.1f} s busy  {cells / max(busy_time, 1e-9):8,.1f} cells/s")
+
+    summary = pl.scan_parquet(os.path.join(output_dir, "*.parquet"))\
+                .select(pl.len().alias("Rows"), pl.col("MatchedTime").is_null().sum().alias("NoMatch"),
+                        (~pl.col("is_MatchedTime_Within_Day")).sum().alias("MatchedTimeMismatches"),
+                        (~pl.col("is_AscDeg_Equal")).sum().alias("AscDegMismatches"),
+                        (~pl.col("is_SL_Match")).sum().alias("SubLordMismatches")).collect()
+    print(summary)
+    return summary
+
+def parse_horary_numbers(spec: str):
+    """Parses a horary numbers spec like `1-249` or `1,5,10-20`"""
+    horary_numbers = []
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        horary_numbers += list(range(int(first), int(last if last else first) + 1))
+    return horary_numbers
+
+def parse_locations(spec: str):
+    """Parses a locations spec like `11.02,76.98;28.61,77.21`"""
+    return [tuple(float(value) for value in location.split(",")) for location in spec.split(";")]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Parallel horary ascendant validation, with resumable Parquet chunks")
+    parser.add_argument("--output-dir", default = "horary_validation_results")
+    parser.add_argument("--workers", type = int, default = None, help = "Number of worker processes (default: number of CPUs)")
+    parser.add_argument("--horary-numbers", type = parse_horary_numbers, default = "1-249")
+    parser.add_argument("--minutes", type = int, default = 24 * 60, help = "Number of minutes of the day, from midnight")
+    parser.add_argument("--shard-minutes", type = int, default = 60)
+    parser.add_argument("--locations", type = parse_locations, default = None, help = "lat,lon;lat,lon;...")
+    args = parser.parse_args()
+    run_horary_validation(args.output_dir, args.workers, args.horary_numbers, args.minutes, args.shard_minutes, args.locations)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from vedicastro.VedicAstro import HouseCuspIndex
+from test_suite.references import get_house_linear_scan
+
+"""
+Tests of `HouseCuspIndex`, against the original linear 12 step scan over the sorted cusps of `get_planet_in_house`,
+which the scalar (`house_for`) and vectorized (`houses_for`) lookups must match, on the houses of random charts and on
+cusps wrapping past 360°, including the longitudes exactly on the cusps (and the floats either side of them).
+Run from the root of this repo with: `python -m pytest test_suite/house_cusp_index_test.py`
+"""
+
+def check_against_linear_scan(cusp_lons: list, house_nrs: list, nr_samples: int = 2000, seed: int = 108):
+    cusp_index = HouseCuspIndex(cusp_lons, house_nrs)
+    cusps = sorted(zip(cusp_lons, house_nrs))
+    edges = np.array(cusp_lons, dtype=np.float64)
+    longitudes = np.concatenate([np.random.default_rng(seed).uniform(0, 360, nr_samples), edges,
+                                 np.nextafter(edges, 0), np.nextafter(edges, 360), [0.0, np.nextafter(360.0, 0)]])
+    longitudes = longitudes[(longitudes >= 0) & (longitudes < 360)]
+    # Just below the lowest cusp, `lon + 360` of the linear scan can round up onto the wrapped cusp, where it finds no
+    # house (None), which is the last house wrapping past 360°
+    expected = [get_house_linear_scan(cusps, lon) or cusps[-1][1] for lon in longitudes.tolist()]
+    assert [cusp_index.house_for(lon) for lon in longitudes.tolist()] == expected
+    assert cusp_index.houses_for(longitudes).tolist() == expected
+
+def test_house_cusp_index_on_random_charts(random_charts):
+    for _, chart in random_charts:
+        check_against_linear_scan([house.lon for house in chart.houses],
+                                  [int(house.id.replace('House', '')) for house in chart.houses], nr_samples = 200)
+        cusp_index = HouseCuspIndex.from_chart(chart)
+        assert cusp_index.house_for(chart.houses.get('House1').lon) == 1
+
+@pytest.mark.parametrize("first_cusp", [0.0, 15.5, 345.0, 359.99])
+def test_house_cusp_index_on_wrapping_cusps(first_cusp):
+    # Unequal houses from the first cusp, so that a house spans 360°, unless the first cusp is 0°
+    sizes = np.array([25, 35, 32, 28, 27, 33, 25, 35, 32, 28, 27, 33], dtype=np.float64)
+    cusp_lons = ((first_cusp + np.concatenate([[0], np.cumsum(sizes[:-1])])) % 360).tolist()
+    check_against_linear_scan(cusp_lons, list(range(1, 13)))
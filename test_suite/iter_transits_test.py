@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+import polars as pl
+import pytest
+from vedicastro.VedicAstro import VedicHoroscopeData
+from vedicastro.transits import (TRANSIT_PLANETS, TRANSITS_TABLE_COLS, TRANSITS_TABLE_SCHEMA, iter_transits,
+                                 write_transits_parquet, find_transit_events)
+
+"""
+Tests of the transit time-series generator `vedicastro.transits.iter_transits`, whose rows must equal
+`VedicHoroscopeData.get_transit_details` at the same (UTC) instants, whatever the `batch_size`, and of its Parquet
+writer `write_transits_parquet`. Timezone aware datetimes must be converted to UTC.
+Run from the root of this repo with: `python -m pytest test_suite/iter_transits_test.py`
+"""
+
+START, END, STEP = datetime(1995, 3, 4, 5, 6), datetime(1995, 3, 14), timedelta(hours = 7, minutes = 13)
+
+@pytest.fixture(scope = "module")
+def transits_df():
+    return pl.concat(list(iter_transits(START, END, STEP, as_batches = True)))
+
+def test_transits_match_the_transit_details():
+    rows = list(iter_transits(START, END, STEP))
+    timestamps = sorted({row.timestamp for row in rows})
+    assert timestamps == [START + idx * STEP for idx in range(len(timestamps))] and timestamps[-1] + STEP >= END
+    for timestamp in timestamps:
+        vhd = VedicHoroscopeData(timestamp.year, timestamp.month, timestamp.day, timestamp.hour, timestamp.minute, 0,
+                                 0.0, 0.0, "+0:00", "Krishnamurti", "Placidus")
+        expected = {transit.PlanetName: (transit.timestamp, transit.PlanetLon, transit.PlanetSign, transit.Nakshatra,
+                                         transit.NakshatraLord, transit.SubLord, transit.isRetrograde)
+                    for transit in vhd.get_transit_details()}
+        transits = {row.PlanetName: (row.timestamp.strftime("%Y-%m-%d %H:%M:%S"), row.PlanetLon, row.PlanetSign,
+                                     row.Nakshatra, row.NakshatraLord, row.SubLord, row.isRetrograde)
+                    for row in rows if row.timestamp == timestamp}
+        assert transits == expected
+
+@pytest.mark.parametrize("batch_size", [1, 7, 32, 33, 34, 100])
+def test_batch_sizes_do_not_drop_or_duplicate_rows(transits_df, batch_size):
+    # 33 timestamps in the date range
+    batches = list(iter_transits(START, END, STEP, batch_size = batch_size, as_batches = True))
+    assert [len(batch) for batch in batches[:-1]] == [batch_size * len(TRANSIT_PLANETS)] * (len(batches) - 1)
+    assert pl.concat(batches).equals(transits_df)
+    assert list(iter_transits(START, END, STEP, batch_size = batch_size)) == list(transits_df.iter_rows())
+    assert transits_df["timestamp"].n_unique() == 33
+
+def test_write_transits_parquet(transits_df, tmp_path):
+    path = str(tmp_path / "transits.parquet")
+    assert write_transits_parquet(path, START, END, STEP, batch_size = 5) == len(transits_df)
+    assert pl.read_parquet(path).equals(transits_df)
+
+def test_write_transits_parquet_of_an_empty_range(tmp_path):
+    path = str(tmp_path / "transits.parquet")
+    assert write_transits_parquet(path, START, START, STEP) == 0
+    assert list(iter_transits(START, START, STEP)) == []
+    empty_df = pl.read_parquet(path)
+    assert empty_df.is_empty() and empty_df.columns == TRANSITS_TABLE_COLS
+    assert dict(empty_df.schema) == TRANSITS_TABLE_SCHEMA
+
+def test_timezone_aware_datetimes_are_converted_to_utc(transits_df):
+    ist = timezone(timedelta(hours = 5, minutes = 30))
+    ist_start, ist_end = START.replace(tzinfo = timezone.utc).astimezone(ist), END.replace(tzinfo = timezone.utc).astimezone(ist)
+    assert pl.concat(list(iter_transits(ist_start, ist_end, STEP, as_batches = True))).equals(transits_df)
+    # Naive datetimes are in UTC, and can be mixed with aware ones
+    assert pl.concat(list(iter_transits(ist_start, END, STEP, as_batches = True))).equals(transits_df)
+    events = find_transit_events(START, END, planets = ["Moon"])
+    assert find_transit_events(ist_start, ist_end, planets = ["Moon"]) == events
@@ -0,0 +1,299 @@
+import collections
+import numpy as np
+import polars as pl
+from flatlib import const, aspects
+from flatlib.chart import Chart
+from vedicastro.utils import clean_select_objects_split_str, dms_to_decdeg
+from vedicastro.VedicAstro import (VedicHoroscopeData, NAKSHATRAS, SIGN_LORDS, RASHIS, ASPECT_MAPPING, PLANETS_TABLE_COLS,
+                                   HOUSES_TABLE_COLS, ROMAN_HOUSE_NUMBERS)
+from vedicastro.aspect_engine import ASPECT_PLANETS
+
+"""
+Reference implementations shared by the tests in `test_suite` and the `benchmarks`: the original code of the functions
+which the optimized engines replaced (which the tests check the engines against, and the benchmarks time them against),
+and the generators of the random inputs.
+"""
+
+## Random inputs
+def generate_birth_records(nr_charts: int, seed: int = 108):
+    """Generates random birth records (times and locations) in columnar form"""
+    rng = np.random.default_rng(seed)
+    return {"year": rng.integers(1940, 2030, nr_charts), "month": rng.integers(1, 13, nr_charts),
+            "day": rng.integers(1, 29, nr_charts), "hour": rng.integers(0, 24, nr_charts),
+            "minute": rng.integers(0, 60, nr_charts), "second": rng.integers(0, 60, nr_charts),
+            "latitude": rng.uniform(-60, 60, nr_charts), "longitude": rng.uniform(-180, 180, nr_charts)}
+
+def format_arc_secs(arc_secs):
+    """Formats signed arc-seconds as `DD:MM:SS` strings, with a `-` sign for the negative values"""
+    return [f"{'-' if n < 0 else ''}{abs(n) // 3600:02d}:{abs(n) // 60 % 60:02d}:{abs(n) % 60:02d}" for n in arc_secs.tolist()]
+
+def generate_dms_frame(nr_rows: int, seed: int = 108):
+    """Generates a DataFrame of two random DMS string columns, from -2° to 360°, with their decimal degrees"""
+    rng = np.random.default_rng(seed)
+    arc_secs = rng.integers(-2 * 3600, 360 * 3600, (2, nr_rows))
+    return pl.DataFrame({f"DMS{idx + 1}": format_arc_secs(values) for idx, values in enumerate(arc_secs)})\
+             .with_columns(pl.Series("DecDeg", rng.uniform(-400, 400, nr_rows)))
+
+
+## Reference implementations
+def get_rl_nl_sl_data_nested_loop(deg: float):
+    """Original triple nested loop implementation of `VedicHoroscopeData.get_rl_nl_sl_data`, used as the reference"""
+    duration = [7, 20, 6, 10, 7, 18, 16, 19, 17]
+    lords = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
+    star_lords = lords * 3 ## lords for the 27 Nakshatras
+
+    sign_deg = deg % 360
+    sign_index = int(sign_deg // 30)
+    nakshatra_deg = sign_deg % 13.332
+    nakshatra_index = int(sign_deg // 13.332)
+    pada = int((nakshatra_deg % 13.332) // 3.325) + 1
+    nakshatra_index = nakshatra_index % len(NAKSHATRAS)
+
+    deg = deg - 120 * int(deg / 120)
+    degcum = 0
+    i = 0
+    while i < 9:
+        deg_nl = 360 / 27
+        j = i
+        while True:
+            deg_sl = deg_nl * duration[j] / 120
+            k = j
+            while True:
+                deg_ss = deg_sl * duration[k] / 120
+                degcum += deg_ss
+                if degcum >= deg:
+                    return {"Nakshatra": NAKSHATRAS[nakshatra_index], "Pada": pada,
+                            "NakshatraLord": star_lords[nakshatra_index], "RasiLord": SIGN_LORDS[sign_index],
+                            "SubLord": lords[j], "SubSubLord": lords[k] }
+                k = (k + 1) % 9
+                if k == j:
+                    break
+            j = (j + 1) % 9
+            if j == i:
+                break
+        i += 1
+
+def get_planetary_aspects_pairwise(chart):
+    """Original pairwise loop of `get_planetary_aspects`, used as the reference"""
+    aspects_dict = []
+    for p1 in ASPECT_PLANETS:
+        for p2 in ASPECT_PLANETS:
+            if p1 != p2:
+                obj1, obj2 = chart.get(p1), chart.get(p2)
+                aspect = aspects.getAspect(obj1, obj2, const.ALL_ASPECTS)
+                if aspect.exists():
+                    p1_lon, p2_lon = round(obj1.lon, 3), round(obj2.lon, 3)
+                    lon_diff = round(abs(p1_lon - p2_lon), 3)
+                    if lon_diff > 180:
+                        lon_diff = 360 - lon_diff
+                    aspects_dict.append({"P1": p1.replace("North Node", "Rahu").replace("South Node", "Ketu"),
+                                         "P2": p2.replace("North Node", "Rahu").replace("South Node", "Ketu"),
+                                         "AspectType": ASPECT_MAPPING[int(aspect.type)], "AspectDeg": aspect.type,
+                                         "AspectOrb": round(aspect.orb, 3), "P1_Lon": p1_lon, "P2_Lon": p2_lon, "LonDiff": lon_diff})
+    return aspects_dict
+
+def get_planetary_aspects_15_pairwise(chart):
+    """Original pairwise loop of `get_planetary_aspects_15`, used as the reference"""
+    aspects_dict = []
+    for p1 in ASPECT_PLANETS:
+        for p2 in ASPECT_PLANETS:
+            if p1 != p2 and {p1, p2} != {const.NORTH_NODE, const.SOUTH_NODE}:
+                p1_lon, p2_lon = round(chart.get(p1).lon, 3), round(chart.get(p2).lon, 3)
+                lon_diff = abs(p1_lon - p2_lon)
+                if lon_diff > 180:
+                    lon_diff = 360 - lon_diff
+                lon_diff = round(lon_diff, 3)
+                if abs(lon_diff % 15) == 0.0:
+                    aspects_dict.append({"P1": p1.replace("North Node", "Rahu").replace("South Node", "Ketu"),
+                                         "P2": p2.replace("North Node", "Rahu").replace("South Node", "Ketu"),
+                                         "P1_Lon": p1_lon, "P2_Lon": p2_lon, "AspectType": f"{int(lon_diff)}° Aspect",
+                                         "AspectDeg": lon_diff})
+    unique_aspects = {}
+    for aspect in aspects_dict:
+        unique_aspects.setdefault(tuple(sorted([aspect['P1'], aspect['P2']])), aspect)
+    return list(unique_aspects.values())
+
+VEDIC_ASPECT_EXCLUDED_OBJECTS = ["Asc", "Chiron", "Syzygy", "Fortuna"]
+
+def get_planetary_aspects_vedic_lambdas(planets_data):
+    """Original rule lambdas of `get_planetary_aspects_vedic`, used as the reference"""
+    planets_data = [planet for planet in planets_data if planet.Object not in VEDIC_ASPECT_EXCLUDED_OBJECTS]
+    vedic_aspects_rules = {
+        'Conjunction': lambda p1, p2: p1.Rasi == p2.Rasi or p1.HouseNr == p2.HouseNr,
+        'Opposition': lambda p1, p2: ((RASHIS.index(p1.Rasi) - RASHIS.index(p2.Rasi)) % 12 == 6 or abs(p1.HouseNr - p2.HouseNr) == 6),
+        'Trine': lambda p1, p2: ((RASHIS.index(p1.Rasi) - RASHIS.index(p2.Rasi)) % 12 in [4, 8] or abs(p1.HouseNr - p2.HouseNr) in [4, 8]),
+        'Square': lambda p1, p2: ((RASHIS.index(p1.Rasi) - RASHIS.index(p2.Rasi)) % 12 in [3, 9] or abs(p1.HouseNr - p2.HouseNr) in [3, 9]),
+        'Sextile': lambda p1, p2: ((RASHIS.index(p1.Rasi) - RASHIS.index(p2.Rasi)) % 12 in [2, 10] or abs(p1.HouseNr - p2.HouseNr) in [2, 10])
+    }
+    aspects_vedic_output, vedic_aspects_dict = [], []
+    for i in range(len(planets_data)):
+        for j in range(i + 1, len(planets_data)):
+            for aspect_name, check_func in vedic_aspects_rules.items():
+                if check_func(planets_data[i], planets_data[j]):
+                    aspects_vedic_output.append(f"{planets_data[i].Object} and {planets_data[j].Object} are in {aspect_name}")
+                    vedic_aspects_dict.append({"P1": planets_data[i].Object, "P2": planets_data[j].Object, "Aspect": aspect_name,
+                                               "P1_HouseNr": planets_data[i].HouseNr, "P2_HouseNr": planets_data[j].HouseNr,
+                                               "P1_Rasi": planets_data[i].Rasi, "P2_Rasi": planets_data[j].Rasi})
+    return vedic_aspects_dict, aspects_vedic_output
+
+def get_cross_aspects_lambdas(planets_data, other_planets_data):
+    """Reference Vedic aspects between the planets of two charts, with the original rule lambdas"""
+    vedic_aspects = []
+    for p1 in planets_data:
+        for p2 in other_planets_data:
+            _, aspects = get_planetary_aspects_vedic_lambdas([p1._replace(Object = "P1"), p2._replace(Object = "P2")])
+            vedic_aspects += [(p1.Object, p2.Object, aspect.rsplit(" ", 1)[-1]) for aspect in aspects]
+    return vedic_aspects
+
+SIGNIFICATOR_EXCLUDED_OBJECTS = ["Asc", "Chiron", "Syzygy", "Fortuna"]
+
+def get_planet_wise_significators_scan(planets_data, houses_data):
+    """Original table scans of `get_planet_wise_significators`, used as the reference"""
+    SignificatorsData = collections.namedtuple("PlanetSignificators", ["Planet", "A", "B", "C", "D"])
+    planets_data = [planet for planet in planets_data if planet.Object not in SIGNIFICATOR_EXCLUDED_OBJECTS]
+    planets_house_deposition = {data.Object: data.HouseNr for data in planets_data}
+    return [SignificatorsData(planet.Object, planets_house_deposition.get(planet.NakshatraLord, None), planet.HouseNr,
+             [data.HouseNr for data in houses_data if data.RasiLord == planet.NakshatraLord],
+             [data.HouseNr for data in houses_data if data.RasiLord == planet.Object]) for planet in planets_data]
+
+def get_house_wise_significators_scan(planets_data, houses_data):
+    """Original table scans of `get_house_wise_significators`, used as the reference"""
+    SignificatorsData = collections.namedtuple("HouseSignificators", ["House", "A", "B", "C", "D"])
+    planets_data = [planet for planet in planets_data if planet.Object not in SIGNIFICATOR_EXCLUDED_OBJECTS]
+    planet_to_star_lord = {data.Object: data.NakshatraLord for data in planets_data}
+    significators_data = []
+    for house in houses_data:
+        occupant_house_planets = [planet.Object for planet in planets_data if planet.HouseNr == house.HouseNr]
+        A = [planet.Object for planet in planets_data if planet.NakshatraLord in occupant_house_planets]
+        B = [planet.Object for planet in planets_data if planet.HouseNr == house.HouseNr]
+        C = [planet for planet, star_lord in planet_to_star_lord.items() if star_lord == house.RasiLord]
+        significators_data.append(SignificatorsData(house.Object, A, B, C, house.RasiLord))
+    return significators_data
+
+def get_unique_house_nrs_for_rasi_lord_group_by(planets_df: pl.DataFrame, planet_name: str):
+    """Original group_by implementation of `get_unique_house_nrs_for_rasi_lord`, used as the reference"""
+    grouped_df = planets_df.group_by("RasiLord").agg([pl.col('HouseNr').map_elements(list, return_dtype=pl.Object).alias('HouseNr')])
+    filtered_df = grouped_df.filter(pl.col('RasiLord') == planet_name)
+    return list(set(filtered_df['HouseNr'].to_list()[0])) if filtered_df.shape[0] else []
+
+def get_consolidated_chart_data_polars(planets_data, houses_data, return_style = None):
+    """Original polars group by of `get_consolidated_chart_data`, used as the reference"""
+    req_cols = ["Rasi","Object","isRetroGrade", "LonDecDeg" ,"SignLonDMS", "SignLonDecDeg"]
+    planets_df = pl.DataFrame(planets_data).select(req_cols)
+    houses_df = pl.DataFrame(houses_data).with_columns(pl.lit(False).alias("isRetroGrade")).select(req_cols)
+    df_concat = pl.concat([houses_df, planets_df])
+    result_df = df_concat.group_by('Rasi').agg([pl.col(col).map_elements(list, return_dtype=pl.Object).alias(col)
+                                                for col in req_cols[1:]])
+    result_df = result_df.with_columns(pl.col('Rasi').map_elements(lambda rasi: RASHIS.index(rasi), return_dtype=pl.Int32).alias('RashiOrder'))
+    result_df = result_df.sort('RashiOrder').drop('RashiOrder')
+    if return_style == "dataframe_records":
+        return result_df.to_dicts()
+    final_dict = {}
+    columns = result_df.columns
+    for row in result_df.iter_rows():
+        rasi = row[columns.index('Rasi')]
+        final_dict[rasi] = {}
+        for obj, is_retrograde, lon_dd, lon_dms, sign_lon_dd in zip(*[row[columns.index(col)] for col in req_cols[1:]]):
+            final_dict[rasi][obj] = {"is_Retrograde": is_retrograde, "LonDecDeg": lon_dd,
+                                     "SignLonDMS" : lon_dms, "SignLonDecDeg": sign_lon_dd}
+    return final_dict
+
+def get_house_linear_scan(cusps: list, lon: float):
+    """Original linear scan of `get_planet_in_house`, over the sorted (cusp lon, house nr) tuples, used as the reference"""
+    cusps = cusps + [(cusps[0][0] + 360, cusps[0][1])]
+    for i in range(12):
+        if cusps[i][0] <= lon < cusps[i+1][0] or cusps[i][0] <= lon + 360 < cusps[i+1][0]:
+            return cusps[i][1]
+
+def get_horary_ascendant_degree_filter(kp_sl_dms_data: pl.DataFrame, horary_number: int):
+    """Original implementation of `get_horary_ascendant_degree`, filtering the KP SubLord Divisions data per call, used as the reference"""
+    row = kp_sl_dms_data.filter(pl.col("SL_Div_Nr") == horary_number).select(["Sign", "From_DMS", "From_DecDeg", "SubLord"])
+    data = row.to_dicts()[0]
+
+    # Convert the sign to its starting degree in the zodiac circle
+    sign_order = {'Aries': 0, 'Taurus': 30, 'Gemini': 60, 'Cancer': 90,
+                'Leo': 120, 'Virgo': 150, 'Libra': 180, 'Scorpio': 210,
+                'Sagittarius': 240, 'Capricorn': 270, 'Aquarius': 300, 'Pisces': 330
+                }
+    data['ZodiacDegreeLocation'] = sign_order[data['Sign']] + data['From_DecDeg']
+    return data
+
+class StrParsingHoroscopeData(VedicHoroscopeData):
+    """Original `str(obj)` parsing implementations of the chart data tables methods, used as the reference"""
+
+    def get_ascendant_data(self, asc_data, PlanetsDataCollection):
+        asc_chart_data = clean_select_objects_split_str(str(asc_data))
+        asc_rl_nl_sl_data = self.get_rl_nl_sl_data(deg = asc_data.lon)
+        data_dict = {field: None for field in PlanetsDataCollection._fields}
+        data_dict["Object"] = asc_chart_data[0]
+        data_dict["Rasi"] = asc_chart_data[1]
+        data_dict["SignLonDMS"] = asc_chart_data[2]
+        data_dict["Nakshatra"] = asc_rl_nl_sl_data.get("Nakshatra", None)
+        data_dict["RasiLord"]  = asc_rl_nl_sl_data.get("RasiLord", None)
+        data_dict["SubLord"] = asc_rl_nl_sl_data.get("SubLord", None)
+        data_dict["SubSubLord"] = asc_rl_nl_sl_data.get("SubSubLord", None)
+        data_dict["NakshatraLord"] = asc_rl_nl_sl_data.get("NakshatraLord", None)
+        data_dict["LonDecDeg"] = round(asc_data.lon, 3)
+        data_dict["SignLonDecDeg"] = dms_to_decdeg(asc_chart_data[2])
+        data_dict["HouseNr"] = 1
+        return PlanetsDataCollection(**data_dict)
+
+    def get_transit_details(self):
+        TransitDetails = collections.namedtuple('TransitDetails', [
+            'timestamp', 'PlanetName', 'PlanetLon', 'PlanetSign', 'Nakshatra',
+            'NakshatraLord', 'SubLord', 'SubLordSign', 'isRetrograde'
+        ])
+        chart = self.generate_chart()
+        transit_data = []
+        timestamp = f"{self.year}-{self.month:02d}-{self.day:02d} {self.hour:02d}:{self.minute:02d}:00"
+        for planet in chart.objects:
+            if planet.id not in ["Chiron", "Syzygy", "Pars Fortuna"]:
+                planet_name = clean_select_objects_split_str(str(planet))[0]
+                rl_nl_sl_data = self.get_rl_nl_sl_data(deg = planet.lon)
+                planet_sub_lord = rl_nl_sl_data.get("SubLord", None)
+                sub_lord_sign = chart.get(planet_sub_lord.replace("Rahu","North Node").replace("Ketu", "South Node")).sign
+                transit_data.append(TransitDetails(timestamp, planet_name, round(planet.lon,3), planet.sign,
+                                                   rl_nl_sl_data.get("Nakshatra", None), rl_nl_sl_data.get("NakshatraLord", None),
+                                                   planet_sub_lord, sub_lord_sign, planet.isRetrograde()))
+        return transit_data
+
+    def get_planets_data_from_chart(self, chart: Chart, new_houses_chart: Chart = None):
+        PlanetsData = collections.namedtuple("PlanetsData",PLANETS_TABLE_COLS)
+        planet_in_house = self.get_planet_in_house(planets_chart = chart, houses_chart = new_houses_chart if new_houses_chart else chart)
+        planets_data = [self.get_ascendant_data(asc_data = chart.get(const.ASC), PlanetsDataCollection = PlanetsData)]
+        for planet in chart.objects:
+            planet_obj = clean_select_objects_split_str(str(planet))
+            planet_name, planet_lon_deg, planet_lat_deg = planet_obj[0], planet_obj[2], planet_obj[3]
+            rl_nl_sl_data = self.get_rl_nl_sl_data(deg = planet.lon)
+            planets_data.append(PlanetsData(planet_name, planet.sign, planet.isRetrograde(), round(planet.lon,3),
+                                            planet_lon_deg, round(planet.signlon, 3), planet_lat_deg, rl_nl_sl_data.get("Nakshatra", None),
+                                            rl_nl_sl_data.get("RasiLord", None), rl_nl_sl_data.get("NakshatraLord", None),
+                                            rl_nl_sl_data.get("SubLord", None), rl_nl_sl_data.get("SubSubLord", None),
+                                            planet_in_house.get(planet_name, None)))
+        return planets_data
+
+    def get_houses_data_from_chart(self, chart: Chart):
+        HousesData = collections.namedtuple("HousesData", HOUSES_TABLE_COLS)
+        houses_data = []
+        for house in chart.houses:
+            house_obj = str(house).strip('<').strip('>').split()
+            house_name, house_lon_deg, house_size = house_obj[0], house_obj[2], round(float(house_obj[3]), 3)
+            rl_nl_sl_data = self.get_rl_nl_sl_data(deg = house.lon)
+            houses_data.append(HousesData(ROMAN_HOUSE_NUMBERS.get(house_name), int(house_name.strip("House")), house.sign,
+                                          round(house.lon,3), house_lon_deg, round(house.signlon, 3), house_size,
+                                          rl_nl_sl_data.get("Nakshatra", None), rl_nl_sl_data.get("RasiLord", None),
+                                          rl_nl_sl_data.get("NakshatraLord", None), rl_nl_sl_data.get("SubLord", None),
+                                          rl_nl_sl_data.get("SubSubLord", None)))
+        return houses_data
+
+    def get_planet_in_house(self, houses_chart: Chart, planets_chart: Chart):
+        planet_in_house = {}
+        cusps = sorted([(house.lon, int(house.id.replace('House', ''))) for house in houses_chart.houses])
+        cusps.append((cusps[0][0] + 360, cusps[0][1]))
+        for planet in planets_chart.objects:
+            planet_name = clean_select_objects_split_str(str(planet))[0]
+            for i in range(12):
+                if cusps[i][0] <= planet.lon < cusps[i+1][0] or cusps[i][0] <= planet.lon + 360 < cusps[i+1][0]:
+                    planet_in_house[planet_name] = cusps[i][1]
+                    break
+        return planet_in_house
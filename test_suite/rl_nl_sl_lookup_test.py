@@ -0,0 +1,47 @@
+import numpy as np
+from tqdm import tqdm
+from vedicastro.VedicAstro import KP_SSL_BOUNDARIES, get_rl_nl_sl_lookup, get_rl_nl_sl_lookup_array
+from test_suite.references import get_rl_nl_sl_data_nested_loop
+
+"""
+This test validates the precomputed KP Sub / Sub Sub Lord lookup table against the original nested loop
+implementation of `get_rl_nl_sl_data`, for random longitudes in the 0 - 360° zodiac,
+along with all the sub sub lord boundaries (and their neighbouring floats).
+Both the scalar (bisect) and vectorized (numpy) lookups must match the original dicts exactly.
+Under pytest it checks 10,000 random longitudes (and all the boundaries), in a few seconds.
+Run the full sweep over 1 million random longitudes (about a minute) from the root of this repo with: `python -m test_suite.rl_nl_sl_lookup_test`
+"""
+
+def get_test_longitudes(nr_samples: int, seed: int = 108):
+    """
+    Returns `nr_samples` random longitudes in the 0 - 360° zodiac, along with the boundaries of all the 2,187 sub sub
+    divisions, and the floats either side of them
+    """
+    rng = np.random.default_rng(seed)
+    longitudes = rng.uniform(0, 360, nr_samples)
+    boundaries = np.array([cycle * 120 + bound for cycle in range(3) for bound in KP_SSL_BOUNDARIES])
+    return np.concatenate([longitudes, boundaries, np.nextafter(boundaries, 0), np.nextafter(boundaries, 360),
+                           [0.0, 120.0, 240.0, 359.9999999999]])
+
+def get_rl_nl_sl_lookup_mismatches(longitudes: np.ndarray, progress: bool = False):
+    """Returns the (longitude, lookup) pairs where the scalar or the vectorized lookup differ from the nested loop"""
+    vectorized = get_rl_nl_sl_lookup_array(longitudes)
+    mismatches = []
+    for idx, deg in enumerate(tqdm(longitudes.tolist(), desc="RL NL SL Lookup Validation Progress", disable=not progress)):
+        expected = get_rl_nl_sl_data_nested_loop(deg)
+        if get_rl_nl_sl_lookup(deg) != expected:
+            mismatches.append((deg, "scalar"))
+        if expected is not None and {key: vectorized[key][idx] for key in expected} != expected:
+            mismatches.append((deg, "vectorized"))
+    return mismatches
+
+def test_rl_nl_sl_lookup_matches_the_nested_loop():
+    mismatches = get_rl_nl_sl_lookup_mismatches(get_test_longitudes(nr_samples = 10_000))
+    assert not mismatches, mismatches[:10]
+
+if __name__ == "__main__":
+    # The full sweep, over 1 million random longitudes
+    longitudes = get_test_longitudes(nr_samples = 1_000_000)
+    mismatches = get_rl_nl_sl_lookup_mismatches(longitudes, progress = True)
+    print(f"Checked {len(longitudes)} longitudes, found {len(mismatches)} mismatches")
+    assert not mismatches, mismatches[:10]
@@ -0,0 +1,46 @@
+import types
+import polars as pl
+import pytest
+from vedicastro.batch import compute_charts
+from vedicastro.significators import compute_significators_batch
+from test_suite.references import (get_planet_wise_significators_scan, get_house_wise_significators_scan,
+                                   get_unique_house_nrs_for_rasi_lord_group_by)
+
+"""
+Tests of the significator engine `vedicastro.significators`, used by `get_planet_wise_significators` and
+`get_house_wise_significators`, against their original table scans, which must produce identical significators
+on random charts. The batched columnar mode `compute_significators_batch` is checked against the same table scans.
+Run from the root of this repo with: `python -m pytest test_suite/significators_test.py`
+"""
+
+@pytest.fixture(scope = "module")
+def charts_data(random_charts):
+    return [(vhd, vhd.get_planets_data_from_chart(chart), vhd.get_houses_data_from_chart(chart)) for vhd, chart in random_charts]
+
+def test_planet_wise_significators_match_the_table_scans(charts_data):
+    for vhd, planets_data, houses_data in charts_data:
+        assert vhd.get_planet_wise_significators(planets_data, houses_data) == \
+               get_planet_wise_significators_scan(planets_data, houses_data)
+
+def test_house_wise_significators_match_the_table_scans(charts_data):
+    for vhd, planets_data, houses_data in charts_data:
+        assert vhd.get_house_wise_significators(planets_data, houses_data) == \
+               get_house_wise_significators_scan(planets_data, houses_data)
+
+def test_unique_house_nrs_for_rasi_lord_match_the_group_by(charts_data):
+    for vhd, planets_data, _ in charts_data:
+        planets_df = pl.DataFrame(planets_data)
+        for planet_name in ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]:
+            assert vhd.get_unique_house_nrs_for_rasi_lord(planets_df, planet_name) == \
+                   get_unique_house_nrs_for_rasi_lord_group_by(planets_df, planet_name)
+
+def test_batch_significators_match_the_table_scans(random_birth_records):
+    planets_df, houses_df = compute_charts(**random_birth_records, utc_offset = "+5:30")
+    planet_significators_df, house_significators_df = compute_significators_batch(planets_df, houses_df)
+    for chart_id in range(len(random_birth_records["year"])):
+        planets_data = [types.SimpleNamespace(**row) for row in planets_df.filter(pl.col("ChartID") == chart_id).iter_rows(named = True)]
+        houses_data = [types.SimpleNamespace(**row) for row in houses_df.filter(pl.col("ChartID") == chart_id).iter_rows(named = True)]
+        assert planet_significators_df.filter(pl.col("ChartID") == chart_id).drop("ChartID").rows() == \
+               get_planet_wise_significators_scan(planets_data, houses_data)
+        assert house_significators_df.filter(pl.col("ChartID") == chart_id).drop("ChartID").rows() == \
+               get_house_wise_significators_scan(planets_data, houses_data)
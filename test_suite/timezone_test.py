@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+import pytest
+from vedicastro.utils import (TIMEZONE_COORDS_DECIMALS, get_timezone_name, get_utc_offset, get_utc_offsets,
+                              get_timezone_cache_info, clear_timezone_caches, resolve_utc_offset)
+
+"""
+Tests of the memoized timezone resolution of `vedicastro.utils`: the timezone name cache, keyed on the coordinates
+rounded to `TIMEZONE_COORDS_DECIMALS`, `clear_timezone_caches`, and the UTC offsets across the DST transitions.
+Run from the root of this repo with: `python -m pytest test_suite/timezone_test.py`
+"""
+
+NEW_YORK = (40.7128, -74.0060)
+
+@pytest.fixture
+def cleared_caches():
+    clear_timezone_caches()
+    yield
+    clear_timezone_caches()
+
+def test_nearby_coordinates_share_the_cache_entry(cleared_caches):
+    # Within the rounding of the coordinates
+    assert get_timezone_name(*NEW_YORK) == "America/New_York"
+    assert get_timezone_name(NEW_YORK[0] + 4e-5, NEW_YORK[1] - 4e-5) == "America/New_York"
+    cache_info = get_timezone_cache_info()["timezone_name"]
+    assert (cache_info["currsize"], cache_info["hits"], cache_info["misses"]) == (1, 1, 1)
+    # One more decimal apart is another entry
+    get_timezone_name(NEW_YORK[0] + 10 ** -TIMEZONE_COORDS_DECIMALS, NEW_YORK[1])
+    assert get_timezone_cache_info()["timezone_name"]["currsize"] == 2
+
+def test_clear_timezone_caches(cleared_caches):
+    get_timezone_name(*NEW_YORK)
+    get_utc_offset("America/New_York", datetime(2024, 1, 15, 12))
+    get_utc_offset("America/New_York", datetime(2024, 1, 15, 12))
+    cache_info = get_timezone_cache_info()
+    assert cache_info["timezone_name"]["currsize"] == 1 and cache_info["utc_offset"]["hits"] == 1
+    clear_timezone_caches()
+    assert all(info["currsize"] == info["hits"] == info["misses"] == 0 for info in get_timezone_cache_info().values())
+
+@pytest.mark.parametrize("timezone_loc, local_time, utc_offset_str", [
+    ("America/New_York", datetime(2024, 1, 15, 12), "-05:00"),
+    ("America/New_York", datetime(2024, 7, 15, 12), "-04:00"),
+    # Either side of the spring forward, at 2:00 on 10th March 2024
+    ("America/New_York", datetime(2024, 3, 10, 1, 59), "-05:00"),
+    ("America/New_York", datetime(2024, 3, 10, 3, 0), "-04:00"),
+    ("Europe/London", datetime(2024, 1, 15, 12), "+00:00"),
+    ("Europe/London", datetime(2024, 7, 15, 12), "+01:00"),
+    # Southern hemisphere, in daylight saving time in January
+    ("Australia/Sydney", datetime(2024, 1, 15, 12), "+11:00"),
+    ("Australia/Sydney", datetime(2024, 7, 15, 12), "+10:00"),
+    ("America/St_Johns", datetime(2024, 1, 15, 12), "-03:30"),
+    ("Asia/Kolkata", datetime(2024, 7, 15, 12), "+05:30"),
+])
+def test_utc_offsets_across_dst(cleared_caches, timezone_loc, local_time, utc_offset_str):
+    utc_offset = get_utc_offset(timezone_loc, local_time)
+    sign = -1 if utc_offset_str.startswith("-") else 1
+    hours, minutes = map(int, utc_offset_str[1:].split(":"))
+    assert utc_offset == (utc_offset_str, sign * timedelta(hours = hours, minutes = minutes))
+    assert resolve_utc_offset(timezone_loc, local_time) == utc_offset_str
+
+def test_batch_utc_offsets_match_the_scalar_version(cleared_caches):
+    lats, lons = [NEW_YORK[0], NEW_YORK[0], 11.02, -33.8688], [NEW_YORK[1], NEW_YORK[1], 76.98, 151.2093]
+    local_times = [datetime(2024, 1, 15, 12), datetime(2024, 7, 15, 12), datetime(2024, 7, 15, 12), datetime(2024, 1, 15, 12)]
+    expected = [(get_timezone_name(lat, lon), *get_utc_offset(get_timezone_name(lat, lon), local_time))
+                for lat, lon, local_time in zip(lats, lons, local_times)]
+    assert get_utc_offsets(lats, lons, local_times) == expected
+    assert [utc_offset_str for _, utc_offset_str, _ in expected] == ["-05:00", "-04:00", "+05:30", "+11:00"]
+
+@pytest.mark.parametrize("utc", ["+5:30", "-04:00", "+0:00"])
+def test_utc_offsets_are_resolved_as_is(utc):
+    assert resolve_utc_offset(utc, datetime(2024, 1, 15, 12)) == utc
+
+@pytest.mark.parametrize("utc, message", [("Nowhere/Atlantis", "Unknown timezone"), ("+5", "Invalid UTC offset"),
+                                          ("+5:60", "Invalid UTC offset"), ("-15:00", "Invalid UTC offset"),
+                                          (None, "Invalid UTC offset")])
+def test_invalid_utc_inputs_raise(utc, message):
+    with pytest.raises(ValueError, match = message):
+        resolve_utc_offset(utc, datetime(2024, 1, 15, 12))
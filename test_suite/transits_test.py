@@ -0,0 +1,52 @@
+from datetime import datetime
+import pytest
+from vedicastro.VedicAstro import RASHIS, NAKSHATRAS, get_rl_nl_sl_lookup
+from vedicastro.transits import TRANSIT_EVENT_LEVELS, find_transit_events, get_transit_event_divisions
+
+"""
+Tests that the transit events of `vedicastro.transits.find_transit_events` agree with `get_rl_nl_sl_lookup`:
+just before its boundary the planet is in the `FromValue` sign / lord, and just after it in the `ToValue`.
+The nakshatras are checked against their exact 360/27° arcs, as the lookup's `Nakshatra` uses the rounded `NAKSHATRA_ARC`.
+Run from the root of this repo with: `python -m pytest test_suite/transits_test.py`
+"""
+
+## Offset (in degrees) either side of the boundaries, at which the lookup is checked
+BOUNDARY_OFFSET_DEG = 1e-7
+
+def get_lookup_value(lon: float, level: str):
+    if level == "Sign":
+        return RASHIS[int(lon % 360 // 30)]
+    if level == "Nakshatra":
+        return NAKSHATRAS[int(lon % 360 // (360 / 27))]
+    return get_rl_nl_sl_lookup(lon % 360)[level]
+
+@pytest.fixture(scope = "module")
+def transit_events():
+    return find_transit_events(datetime(2024, 1, 1), datetime(2024, 3, 1), levels = TRANSIT_EVENT_LEVELS)
+
+def test_events_agree_with_the_lookup(transit_events):
+    assert {event.EventType for event in transit_events} == set(TRANSIT_EVENT_LEVELS)
+    for event in transit_events:
+        direction = -1 if event.isRetrograde else 1
+        before_lon = event.BoundaryLon - direction * BOUNDARY_OFFSET_DEG
+        after_lon = event.BoundaryLon + direction * BOUNDARY_OFFSET_DEG
+        assert get_lookup_value(before_lon, event.EventType) == event.FromValue, event
+        assert get_lookup_value(after_lon, event.EventType) == event.ToValue, event
+
+@pytest.mark.parametrize("level", TRANSIT_EVENT_LEVELS)
+def test_divisions_agree_with_the_lookup(level):
+    starts, names = get_transit_event_divisions(level)
+    ends = list(starts[1:]) + [360.0]
+    for start, end, name in zip(starts, ends, names):
+        for lon in (start + BOUNDARY_OFFSET_DEG, (start + end) / 2, end - BOUNDARY_OFFSET_DEG):
+            assert get_lookup_value(lon, level) == name, (level, lon)
+
+def test_nakshatra_events_coincide_with_sub_lord_events(transit_events):
+    sub_lord_events = {(event.timestamp, event.PlanetName, event.BoundaryLon)
+                       for event in transit_events if event.EventType == "SubLord"}
+    moon_nakshatra_events = [event for event in transit_events if event.EventType == "Nakshatra" and event.PlanetName == "Moon"]
+    assert moon_nakshatra_events
+    for event in transit_events:
+        if event.EventType == "Nakshatra":
+            # A nakshatra starts with its own sub lord, at the same boundary
+            assert (event.timestamp, event.PlanetName, event.BoundaryLon) in sub_lord_events, event
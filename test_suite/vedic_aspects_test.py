@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from vedicastro.VedicAstro import RASHIS
+from vedicastro.aspect_engine import get_vedic_aspects_frame
+from test_suite.references import VEDIC_ASPECT_EXCLUDED_OBJECTS, get_planetary_aspects_vedic_lambdas, get_cross_aspects_lambdas
+
+"""
+Tests of the Vedic aspect lookup table engine, used by `get_planetary_aspects_vedic` and `get_vedic_aspects_frame`,
+against the original rule lambdas of `get_planetary_aspects_vedic`, which must produce identical aspects on random charts,
+within a chart and between pairs of charts (compatibility matching).
+Run from the root of this repo with: `python -m pytest test_suite/vedic_aspects_test.py`
+"""
+
+@pytest.fixture(scope = "module")
+def charts_planets_data(random_charts):
+    return [(vhd, vhd.get_planets_data_from_chart(chart)) for vhd, chart in random_charts]
+
+@pytest.fixture(scope = "module")
+def stacked_planets(charts_planets_data):
+    """
+    Returns the planets data, planet names, sign indices (N x P) and house numbers (N x P) of the charts,
+    without the excluded objects
+    """
+    all_planets_data = [[planet for planet in planets_data if planet.Object not in VEDIC_ASPECT_EXCLUDED_OBJECTS]
+                        for _, planets_data in charts_planets_data]
+    return (all_planets_data, [planet.Object for planet in all_planets_data[0]],
+            np.array([[RASHIS.index(planet.Rasi) for planet in planets_data] for planets_data in all_planets_data]),
+            np.array([[planet.HouseNr for planet in planets_data] for planets_data in all_planets_data]))
+
+def test_vedic_aspects_match_the_rule_lambdas(charts_planets_data):
+    for vhd, planets_data in charts_planets_data:
+        assert vhd.get_planetary_aspects_vedic(planets_data) == get_planetary_aspects_vedic_lambdas(planets_data)
+
+def test_vedic_aspects_frame_matches_the_rule_lambdas(charts_planets_data, stacked_planets):
+    _, planet_names, sign_idx, house_nrs = stacked_planets
+    aspects_df = get_vedic_aspects_frame(sign_idx, house_nrs, planet_names)
+    expected_rows = [(chart_id, aspect["P1"], aspect["P2"], aspect["Aspect"])
+                     for chart_id, (_, planets_data) in enumerate(charts_planets_data)
+                     for aspect in get_planetary_aspects_vedic_lambdas(planets_data)[0]]
+    assert aspects_df.select(["ChartID", "P1", "P2", "Aspect"]).rows() == expected_rows
+
+def test_cross_chart_vedic_aspects_match_the_rule_lambdas(stacked_planets):
+    planets_data, planet_names, sign_idx, house_nrs = stacked_planets
+    # Compatibility matching, between each chart and the next chart
+    cross_df = get_vedic_aspects_frame(sign_idx, house_nrs, planet_names, np.roll(sign_idx, -1, axis = 0),
+                                       np.roll(house_nrs, -1, axis = 0))
+    for chart_id in range(10):
+        expected = get_cross_aspects_lambdas(planets_data[chart_id], planets_data[(chart_id + 1) % len(planets_data)])
+        assert cross_df.filter(cross_df["ChartID"] == chart_id).select(["P1", "P2", "Aspect"]).rows() == expected
@@ -1,12 +1,19 @@
-from flatlib import const, aspects
+from __future__ import annotations
+
+from flatlib import const, angle
 from flatlib.chart import Chart
 from flatlib.geopos import GeoPos
 from flatlib.datetime import Datetime, Date
 from flatlib.object import GenericObject
 
+import bisect
+import functools
 import collections
-import polars as pl
 from .utils import *
+from .instrumentation import timed, stage
+
+np = LazyModule("numpy")
+pl = LazyModule("polars")
 
 
 ## GLOBAL VARS
@@ -24,6 +31,9 @@ NAKSHATRAS = ['Ashwini','Bharani','Krittika','Rohini','Mrigashīrsha', 'Ardra',
 'Maghā', 'PūrvaPhalgunī', 'UttaraPhalgunī', 'Hasta', 'Chitra', 'Svati', 'Vishakha', 'Anuradha', 'Jyeshtha', 'Mula', 
 'PurvaAshadha','UttaraAshadha', 'Shravana', 'Dhanishta','Shatabhisha', 'PurvaBhādrapadā', 'UttaraBhādrapadā', 'Revati']
 
+## Arc of a nakshatra (in degrees) used to find the nakshatra of a longitude, by `get_rl_nl_sl_lookup`
+NAKSHATRA_ARC = 13.332
+
 AYANAMSA_MAPPING = { "Lahiri": const.AY_LAHIRI, "Lahiri_1940" : const.AY_LAHIRI_1940, 
                     "Lahiri_VP285": const.AY_LAHIRI_VP285, "Lahiri_ICRC" : const.AY_LAHIRI_ICRC, "Raman": const.AY_RAMAN,
                     "Krishnamurti": const.AY_KRISHNAMURTI, "Krishnamurti_Senthilathiban": const.AY_KRISHNAMURTI_SENTHILATHIBAN,
@@ -42,6 +52,9 @@ ASPECT_MAPPING = {  const.NO_ASPECT: "No Aspect", const.CONJUNCTION: "Conjunctio
                     const.BIQUINTILE: "Bi Quintile", const.QUINCUNX: "Quincunx",
                     }
 
+## Conventional names of the chart objects, which are renamed in the output tables
+OBJECT_NAME_MAPPING = {"North Node": "Rahu", "South Node": "Ketu", "Pars Fortuna": "Fortuna"}
+
 # Columns names for NamedTuple Collections / Final Output DataFrames
 HOUSES_TABLE_COLS = ["Object", "HouseNr","Rasi", "LonDecDeg", "SignLonDMS", "SignLonDecDeg", "DegSize",
                      "Nakshatra", "RasiLord", "NakshatraLord", "SubLord", "SubSubLord"]
@@ -49,6 +62,148 @@ HOUSES_TABLE_COLS = ["Object", "HouseNr","Rasi", "LonDecDeg", "SignLonDMS", "Sig
 PLANETS_TABLE_COLS = ["Object", "Rasi", "isRetroGrade", "LonDecDeg", "SignLonDMS", "SignLonDecDeg", "LatDMS",
                         "Nakshatra", "RasiLord", "NakshatraLord", "SubLord", "SubSubLord" ,"HouseNr"]
 
+PLANET_SIGNIFICATORS_COLS = ["Planet", "A", "B", "C", "D"]
+HOUSE_SIGNIFICATORS_COLS = ["House", "A", "B", "C", "D"]
+
+TRANSIT_DETAILS_COLS = ["timestamp", "PlanetName", "PlanetLon", "PlanetSign", "Nakshatra",
+                        "NakshatraLord", "SubLord", "SubLordSign", "isRetrograde"]
+
+## NamedTuple Collections of the output tables, defined once here instead of on each call
+PlanetsData = collections.namedtuple("PlanetsData", PLANETS_TABLE_COLS)
+HousesData = collections.namedtuple("HousesData", HOUSES_TABLE_COLS)
+TransitDetails = collections.namedtuple("TransitDetails", TRANSIT_DETAILS_COLS)
+PlanetSignificators = collections.namedtuple("PlanetSignificators", PLANET_SIGNIFICATORS_COLS)
+HouseSignificators = collections.namedtuple("HouseSignificators", HOUSE_SIGNIFICATORS_COLS)
+
+## Vimshottari lords and their dasa durations (in years), in sequence
+VIMSHOTTARI_LORDS = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
+VIMSHOTTARI_DURATIONS = [7, 20, 6, 10, 7, 18, 16, 19, 17]
+
+
+def _build_kp_sub_sub_boundaries():
+    """
+    Builds the sorted upper boundaries of the 729 Sub Sub Lord divisions of one 120° nakshatra cycle
+    (the cycle repeats thrice over the zodiac, giving the 2,187 sub sub divisions).
+    The cumulative sum is accumulated in the same order as the original nested loop,
+    so that the lookup returns bit-for-bit identical results.
+    """
+    boundaries, sub_lord_idx, sub_sub_lord_idx = [], [], []
+    degcum = 0
+    for i in range(9):
+        deg_nl = 360 / 27
+        for j in [(i + n) % 9 for n in range(9)]:
+            deg_sl = deg_nl * VIMSHOTTARI_DURATIONS[j] / 120
+            for k in [(j + n) % 9 for n in range(9)]:
+                deg_ss = deg_sl * VIMSHOTTARI_DURATIONS[k] / 120
+                degcum += deg_ss
+                boundaries.append(degcum)
+                sub_lord_idx.append(j)
+                sub_sub_lord_idx.append(k)
+    return boundaries, sub_lord_idx, sub_sub_lord_idx
+
+## KP Sub / Sub Sub Lord lookup table, built once at import
+KP_SSL_BOUNDARIES, KP_SL_INDEX, KP_SSL_INDEX = _build_kp_sub_sub_boundaries()
+
+@functools.lru_cache(maxsize=None)
+def _get_kp_ssl_arrays():
+    """Returns numpy arrays of the KP Sub Sub Lord lookup table, built on first use"""
+    return (np.array(KP_SSL_BOUNDARIES, dtype=np.float64), np.array(KP_SL_INDEX, dtype=np.int64),
+            np.array(KP_SSL_INDEX, dtype=np.int64))
+
+
+def get_object_name(object_id: str):
+    """Returns the conventional name of a chart object, like `Rahu` for `North Node`, same as `clean_select_objects_split_str`"""
+    return OBJECT_NAME_MAPPING.get(object_id, object_id)
+
+
+def get_rl_nl_sl_lookup(deg: float):
+    """
+    Returns the Rashi (Sign) Lord, Nakshatra, Nakshatra Pada, Nakshatra Lord, Sub Lord and Sub Sub Lord
+    corresponding to the given degree, using a binary search over the precomputed `KP_SSL_BOUNDARIES`.
+    """
+    ## Compute Sign lords
+    sign_deg = deg % 360  # Normalize degree to [0, 360)
+    sign_index = int(sign_deg // 30)  # Each zodiac sign is 30 degrees
+
+    # Compute Nakshatra details
+    nakshatra_deg = sign_deg % NAKSHATRA_ARC  # Each nakshatra is 13.332 degrees
+    nakshatra_index = int(sign_deg // NAKSHATRA_ARC)  # Find the nakshatra index
+    pada = int((nakshatra_deg % NAKSHATRA_ARC) // 3.325) + 1  # Each pada is 3.325 degrees
+
+    # Ensure nakshatra_index is within bounds
+    nakshatra_index = nakshatra_index % len(NAKSHATRAS)
+
+    # Compute SubLords
+    ssl_index = bisect.bisect_left(KP_SSL_BOUNDARIES, deg - 120 * int(deg / 120))
+    if ssl_index == len(KP_SSL_BOUNDARIES):
+        return None
+
+    return {"Nakshatra": NAKSHATRAS[nakshatra_index], "Pada": pada,
+            "NakshatraLord": VIMSHOTTARI_LORDS[nakshatra_index % 9], "RasiLord": SIGN_LORDS[sign_index],
+            "SubLord": VIMSHOTTARI_LORDS[KP_SL_INDEX[ssl_index]],
+            "SubSubLord": VIMSHOTTARI_LORDS[KP_SSL_INDEX[ssl_index]]}
+
+
+def get_rl_nl_sl_lookup_array(degs):
+    """
+    Vectorized form of `get_rl_nl_sl_lookup`, for an array of longitudes.
+    Returns a dict of numpy arrays with the same keys as `get_rl_nl_sl_lookup`.
+    Longitudes falling past the last boundary of the cycle (which `get_rl_nl_sl_lookup` returns as None),
+    have None in all the lord and nakshatra fields.
+    """
+    kp_ssl_boundaries, kp_sl_index, kp_ssl_index = _get_kp_ssl_arrays()
+    degs = np.asarray(degs, dtype=np.float64)
+
+    sign_deg = np.mod(degs, 360)
+    sign_index = np.floor_divide(sign_deg, 30).astype(np.int64)
+    nakshatra_deg = np.mod(sign_deg, NAKSHATRA_ARC)
+    nakshatra_index = np.floor_divide(sign_deg, NAKSHATRA_ARC).astype(np.int64) % len(NAKSHATRAS)
+    pada = np.floor_divide(np.mod(nakshatra_deg, NAKSHATRA_ARC), 3.325).astype(np.int64) + 1
+
+    ssl_index = np.searchsorted(kp_ssl_boundaries, degs - 120 * np.trunc(degs / 120), side="left")
+    out_of_range = ssl_index == len(KP_SSL_BOUNDARIES)
+    ssl_index = np.where(out_of_range, 0, ssl_index)
+
+    lords = np.array(VIMSHOTTARI_LORDS + [None], dtype=object)
+    sl_index = np.where(out_of_range, 9, kp_sl_index[ssl_index])
+    ssl_lord_index = np.where(out_of_range, 9, kp_ssl_index[ssl_index])
+    nakshatras = np.array(NAKSHATRAS + [None], dtype=object)
+    sign_lords = np.array(SIGN_LORDS + [None], dtype=object)
+
+    return {"Nakshatra": nakshatras[np.where(out_of_range, len(NAKSHATRAS), nakshatra_index)],
+            "Pada": pada,
+            "NakshatraLord": lords[np.where(out_of_range, 9, nakshatra_index % 9)],
+            "RasiLord": sign_lords[np.where(out_of_range, 12, sign_index)],
+            "SubLord": lords[sl_index], "SubSubLord": lords[ssl_lord_index]}
+
+
+class HouseCuspIndex:
+    """
+    Sorted index of the house cusps of a houses chart, which resolves the house number of any longitude with a binary search.
+    Build it once per houses chart (Eg: a natal or horary chart), and reuse it across many planet charts and transit timestamps.
+    """
+    def __init__(self, cusp_lons: list, house_nrs: list = None):
+        # Sort the cusps (the boundary between two houses) along with their house numbers
+        cusps = sorted(zip(cusp_lons, house_nrs if house_nrs else range(1, len(cusp_lons) + 1)))
+        self.cusp_lons = [cusp_lon for cusp_lon, _ in cusps]
+        self.house_nrs = [house_nr for _, house_nr in cusps]
+
+    @classmethod
+    def from_chart(cls, houses_chart: Chart):
+        """Builds the index from the houses of a `flatlib.Chart` object"""
+        return cls([house.lon for house in houses_chart.houses],
+                   [int(house.id.replace('House', '')) for house in houses_chart.houses])
+
+    def house_for(self, lon: float):
+        """Returns the house number the given longitude falls in"""
+        # Longitudes before the first cusp are overlapping into the last cusp, which is the house at index -1
+        return self.house_nrs[bisect.bisect_right(self.cusp_lons, lon) - 1]
+
+    def houses_for(self, longitudes):
+        """Returns a numpy array of the house numbers the given longitudes (array-like) fall in"""
+        idx = np.searchsorted(np.array(self.cusp_lons), np.asarray(longitudes, dtype=np.float64), side="right") - 1
+        return np.array(self.house_nrs)[idx]
+
 
 class VedicHoroscopeData:
     def __init__(self, year:int, month:int, day:int, hour:int, minute:int, second : int,
@@ -66,7 +221,7 @@ class VedicHoroscopeData:
         second: Second input to generate chart, int  (Eg: 0 - 59)
         latitude: latitude, float
         longitude: longitude, float
-        time_zone: timezone input to generate chart, str  (Eg: America/New_York)        
+        time_zone: timezone input to generate chart, str  (Eg: America/New_York), or an UTC offset str (Eg: +5:30)
         ayanamsa: ayanamsa input to generate chart, str
         house: House System to generate chart, 
         """
@@ -80,9 +235,13 @@ class VedicHoroscopeData:
         self.longitude  = longitude
         self.ayanamsa   = ayanamsa
         self.house_system = house_system
-        self.time_zone = tz if tz else TimezoneFinder().timezone_at(lat=self.latitude, lng=self.longitude)
         self.chart_time = datetime(self.year, self.month, self.day, self.hour, self.minute)
-        self.utc,_ = get_utc_offset(self.time_zone, self.chart_time)
+        with stage("timezone_lookup"):
+            self.time_zone = tz if tz else get_timezone_name(self.latitude, self.longitude)
+            if self.time_zone.startswith(('+', '-')):
+                self.utc = self.time_zone  # UTC offset given directly, like for horary charts
+            else:
+                self.utc,_ = get_utc_offset(self.time_zone, self.chart_time)
 
     def get_ayanamsa(self):
         """Returns an Ayanamsa System from flatlib.sidereal library, based on user input"""
@@ -92,6 +251,7 @@ class VedicHoroscopeData:
         """Returns an House System from flatlib.sidereal library, based on user input"""
         return HOUSE_SYSTEM_MAPPING.get(self.house_system, None)
 
+    @timed("generate_chart")
     def generate_chart(self):
         """Generates a `flatlib.Chart` object for the given time and location data"""
         date = Datetime([self.year, self.month, self.day], ["+",self.hour, self.minute, self.second], self.utc)
@@ -99,89 +259,71 @@ class VedicHoroscopeData:
         chart = Chart(date, geopos, IDs=const.LIST_OBJECTS, hsys=self.get_house_system(), mode = self.get_ayanamsa())
         return chart
 
+    @timed("planetary_aspects")
     def get_planetary_aspects(self, chart: Chart):
-        """Computes planetary aspects using flatlib modules getAspect"""
-        planets = [const.SUN, const.MOON, const.MARS, const.MERCURY, const.JUPITER, const.VENUS, const.SATURN,
-                    const.URANUS, const.NEPTUNE, const.PLUTO, const.NORTH_NODE, const.SOUTH_NODE]
-        # aspects_output = []
+        """
+        Computes planetary aspects with the same rules as flatlib modules getAspect,
+        using the vectorized aspect engine over the angular separation matrix of the planets
+        """
+        from .aspect_engine import ASPECT_PLANETS, NO_ASPECT_INDEX, compute_aspect_matrix
+        planet_objs = [chart.get(planet) for planet in ASPECT_PLANETS]
+        aspect_index, aspect_orbs = compute_aspect_matrix([obj.lon for obj in planet_objs], [obj.lonspeed for obj in planet_objs],
+                                                          aspect_list = const.ALL_ASPECTS)
         aspects_dict = []
 
-        for p1 in planets:
-            for p2 in planets:
-                if p1 != p2:
-                    obj1 = chart.get(p1)
-                    obj2 = chart.get(p2)
-                    aspect = aspects.getAspect(obj1, obj2, const.ALL_ASPECTS)
+        for i, obj1 in enumerate(planet_objs):
+            for j, obj2 in enumerate(planet_objs):
+                if aspect_index[0, i, j] != NO_ASPECT_INDEX:
+                    aspect_deg = const.ALL_ASPECTS[aspect_index[0, i, j]]
+                    aspect_type = ASPECT_MAPPING[int(aspect_deg)]  # Use global variable here
+                    aspect_orb = round(float(aspect_orbs[0, i, j]), 3)  # get the orb value
+                    # Calculate longitude difference
+                    p1_lon = round(obj1.lon, 3)
+                    p2_lon = round(obj2.lon, 3)
+                    lon_diff = round(abs(p1_lon - p2_lon), 3)
+                    if lon_diff > 180:
+                        lon_diff = 360 - lon_diff
+
                     ## Replace North and South nodes with conventional names
-                    p1_new = p1.replace("North Node", "Rahu").replace("South Node", "Ketu")
-                    p2_new = p2.replace("North Node", "Rahu").replace("South Node", "Ketu")
-                    if aspect.exists():
-                        aspect_type = ASPECT_MAPPING[int(aspect.type)]  # Use global variable here
-                        aspect_orb = round(aspect.orb, 3)  # get the orb value
-                        # Calculate longitude difference
-                        p1_lon = round(obj1.lon, 3)
-                        p2_lon = round(obj2.lon, 3)
-                        lon_diff = round(abs(p1_lon - p2_lon), 3)
-                        if lon_diff > 180:
-                            lon_diff = 360 - lon_diff
-
-                        aspects_dict.append({"P1":p1_new, "P2": p2_new, "AspectType" : aspect_type, 
-                                            "AspectDeg" : aspect.type, "AspectOrb" : aspect_orb,
-                                            "P1_Lon": p1_lon,"P2_Lon": p2_lon,"LonDiff": lon_diff})                        
-                        
+                    aspects_dict.append({"P1": get_object_name(obj1.id), "P2": get_object_name(obj2.id), "AspectType" : aspect_type, 
+                                        "AspectDeg" : aspect_deg, "AspectOrb" : aspect_orb,
+                                        "P1_Lon": p1_lon,"P2_Lon": p2_lon,"LonDiff": lon_diff})
 
         return aspects_dict
 
+    @timed("planetary_aspects_15")
     def get_planetary_aspects_15(self, chart: Chart):
         """
         Computes exact planetary aspects based on multiples of 15 degrees without using flatlib's aspect functions.
+        Each pair of planets is evaluated once, over the upper triangle of the longitude difference matrix.
         """
-        planets = [const.SUN, const.MOON, const.MARS, const.MERCURY, const.JUPITER, const.VENUS, const.SATURN,
-                const.URANUS, const.NEPTUNE, const.PLUTO, const.NORTH_NODE, const.SOUTH_NODE]
+        from .aspect_engine import ASPECT_PLANETS, find_multiple_aspects
+        planet_objs = [chart.get(planet) for planet in ASPECT_PLANETS]
+        is_multiple, aspect_degs = find_multiple_aspects([obj.lon for obj in planet_objs], multiple = 15, decimals = 3)
         aspects_dict = []
 
-        for p1 in planets:
-            for p2 in planets:
-                if p1 != p2:
-                    # Skip Rahu-Ketu pair as they're always 180 degrees apart
-                    if {p1, p2} == {const.NORTH_NODE, const.SOUTH_NODE}:
-                        continue
-
-                    obj1 = chart.get(p1)
-                    obj2 = chart.get(p2)
-                    
-                    # Replace North and South nodes with conventional names
-                    p1_name = p1.replace("North Node", "Rahu").replace("South Node", "Ketu")
-                    p2_name = p2.replace("North Node", "Rahu").replace("South Node", "Ketu")
-                    
-                    p1_lon = round(obj1.lon, 3)
-                    p2_lon = round(obj2.lon, 3)
-                    lon_diff = abs(p1_lon - p2_lon)
-                    if lon_diff > 180:
-                        lon_diff = 360 - lon_diff
-                    lon_diff = round(lon_diff, 3)
-
-                    # Check if lon_diff is a multiple of 15 degrees with a small tolerance
-                    if abs(lon_diff % 15) == 0.0 :
-                        
-                        aspects_dict.append({
-                            "P1": p1_name,
-                            "P2": p2_name,
-                            "P1_Lon": p1_lon,
-                            "P2_Lon": p2_lon,                            
-                            "AspectType": f"{int(lon_diff)}° Aspect",
-                            "AspectDeg": lon_diff
-                        })
-
-        # Remove duplicate entries using tuple sort
-        unique_aspects = {}
-        for aspect in aspects_dict:
-            planet_pair = tuple(sorted([aspect['P1'], aspect['P2']]))
-            if planet_pair not in unique_aspects:
-                unique_aspects[planet_pair] = aspect
-
-        return list(unique_aspects.values())
+        for i, obj1 in enumerate(planet_objs):
+            for j in range(i + 1, len(planet_objs)):
+                obj2 = planet_objs[j]
+                # Skip Rahu-Ketu pair as they're always 180 degrees apart
+                if {obj1.id, obj2.id} == {const.NORTH_NODE, const.SOUTH_NODE}:
+                    continue
+
+                # Check if lon_diff is a multiple of 15 degrees
+                if is_multiple[0, i, j]:
+                    lon_diff = float(aspect_degs[0, i, j])
+                    aspects_dict.append({
+                        "P1": get_object_name(obj1.id),
+                        "P2": get_object_name(obj2.id),
+                        "P1_Lon": round(obj1.lon, 3),
+                        "P2_Lon": round(obj2.lon, 3),                            
+                        "AspectType": f"{int(lon_diff)}° Aspect",
+                        "AspectDeg": lon_diff
+                    })
+
+        return aspects_dict
   
+    @timed("planetary_aspects_vedic")
     def get_planetary_aspects_vedic(self, planets_data: collections.namedtuple):
         """
         Computes the major planetary aspects according to Vedic astrology, focusing on the positions of planets in houses and signs.
@@ -190,14 +332,10 @@ class VedicHoroscopeData:
         # Get the planets data and Filter planets_data to remove objects like "Asc", "Chiron", "Syzygy", "Fortuna"
         planets_data = [planet for planet in planets_data if planet.Object not in ["Asc", "Chiron", "Syzygy", "Fortuna"]]
 
-        # Define Vedic aspect rules based on sign and house positions
-        vedic_aspects_rules = {
-            'Conjunction': lambda p1, p2: p1.Rasi == p2.Rasi or p1.HouseNr == p2.HouseNr,
-            'Opposition': lambda p1, p2: ((RASHIS.index(p1.Rasi) - RASHIS.index(p2.Rasi)) % 12 == 6 or abs(p1.HouseNr - p2.HouseNr) == 6),
-            'Trine': lambda p1, p2: ((RASHIS.index(p1.Rasi) - RASHIS.index(p2.Rasi)) % 12 in [4, 8] or abs(p1.HouseNr - p2.HouseNr) in [4, 8]),
-            'Square': lambda p1, p2: ((RASHIS.index(p1.Rasi) - RASHIS.index(p2.Rasi)) % 12 in [3, 9] or abs(p1.HouseNr - p2.HouseNr) in [3, 9]),
-            'Sextile': lambda p1, p2: ((RASHIS.index(p1.Rasi) - RASHIS.index(p2.Rasi)) % 12 in [2, 10] or abs(p1.HouseNr - p2.HouseNr) in [2, 10])
-        }
+        # Resolve the Vedic aspect rules (based on sign and house positions) of all the pairs with the precomputed lookup table
+        from .aspect_engine import VEDIC_ASPECT_NAMES, compute_vedic_aspect_masks
+        aspect_masks = compute_vedic_aspect_masks([RASHIS.index(planet.Rasi) for planet in planets_data],
+                                                  [planet.HouseNr for planet in planets_data])[0].tolist()
 
         aspects_vedic_output = []
         vedic_aspects_dict = []
@@ -205,8 +343,8 @@ class VedicHoroscopeData:
         # Check each pair of planets for aspects
         for i in range(len(planets_data)):
             for j in range(i + 1, len(planets_data)):             
-                for aspect_name, check_func in vedic_aspects_rules.items():
-                    if check_func(planets_data[i], planets_data[j]):
+                for bit, aspect_name in enumerate(VEDIC_ASPECT_NAMES):
+                    if aspect_masks[i][j] >> bit & 1:
                         aspects_vedic_output.append(f"{planets_data[i].Object} and {planets_data[j].Object} are in {aspect_name}")
                         vedic_aspects_dict.append({"P1":planets_data[i].Object, "P2": planets_data[j].Object, "Aspect" : aspect_name, 
                                                    "P1_HouseNr": planets_data[i].HouseNr, "P2_HouseNr": planets_data[j].HouseNr,
@@ -216,14 +354,14 @@ class VedicHoroscopeData:
       
     def get_ascendant_data(self, asc_data: GenericObject, PlanetsDataCollection : collections.namedtuple):
         """Generates Ascendant Data and returns the data in the format of the PlanetsDataCollection Named Tuple"""
-        asc_chart_data = clean_select_objects_split_str(str(asc_data))
+        asc_sign_lon_dms = angle.toString(asc_data.signlon)
         asc_rl_nl_sl_data = self.get_rl_nl_sl_data(deg = asc_data.lon)
         # Create a dictionary with None values for all fields
         data_dict = {field: None for field in PlanetsDataCollection._fields}
         # Update the specific fields with the ascendant data
-        data_dict["Object"] = asc_chart_data[0]
-        data_dict["Rasi"] = asc_chart_data[1]
-        data_dict["SignLonDMS"] = asc_chart_data[2]
+        data_dict["Object"] = asc_data.id
+        data_dict["Rasi"] = asc_data.sign
+        data_dict["SignLonDMS"] = asc_sign_lon_dms
         data_dict["Nakshatra"] = asc_rl_nl_sl_data.get("Nakshatra", None)
         data_dict["RasiLord"]  = asc_rl_nl_sl_data.get("RasiLord", None)
         data_dict["SubLord"] = asc_rl_nl_sl_data.get("SubLord", None)
@@ -231,63 +369,23 @@ class VedicHoroscopeData:
         data_dict["NakshatraLord"] = asc_rl_nl_sl_data.get("NakshatraLord", None)
         data_dict["isRetroGrade"] = None
         data_dict["LonDecDeg"] = round(asc_data.lon, 3)
-        data_dict["SignLonDecDeg"] = dms_to_decdeg(asc_chart_data[2])
+        data_dict["SignLonDecDeg"] = dms_to_decdeg(asc_sign_lon_dms)
         data_dict["LatDMS"] = None
         data_dict["HouseNr"] = 1
 
         # Return a new PlanetsDataCollection instance with the data
         return PlanetsDataCollection(**data_dict)
 
+    @timed("sub_lord_lookup")
     def get_rl_nl_sl_data(self, deg : float):
         """
         Returns the  Rashi (Sign) Lord, Nakshatra, Nakshatra Pada, Nakshatra Lord, Sub Lord and Sub Sub Lord 
         corresponding to the given degree.
         """
-        duration = [7, 20, 6, 10, 7, 18, 16, 19, 17]
-
-        lords = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
-
-        star_lords = lords * 3 ## lords for the 27 Nakshatras
-
-        ## Compute Sign lords
-        sign_deg = deg % 360  # Normalize degree to [0, 360)
-        sign_index = int(sign_deg // 30)  # Each zodiac sign is 30 degrees
-        
-        # Compute Nakshatra details
-        nakshatra_deg = sign_deg % 13.332  # Each nakshatra is 13.332 degrees
-        nakshatra_index = int(sign_deg // 13.332)  # Find the nakshatra index
-        pada = int((nakshatra_deg % 13.332) // 3.325) + 1  # Each pada is 3.325 degrees
-
-        # Ensure nakshatra_index is within bounds
-        nakshatra_index = nakshatra_index % len(NAKSHATRAS)        
-
-        # Compute SubLords
-        deg = deg - 120 * int(deg / 120)
-        degcum = 0
-        i = 0
-
-        while i < 9:
-            deg_nl = 360 / 27
-            j = i
-            while True:
-                deg_sl = deg_nl * duration[j] / 120
-                k = j
-                while True:
-                    deg_ss = deg_sl * duration[k] / 120
-                    degcum += deg_ss
-                    if degcum >= deg:
-                        return {"Nakshatra": NAKSHATRAS[nakshatra_index], "Pada": pada, 
-                                "NakshatraLord": star_lords[nakshatra_index], "RasiLord": SIGN_LORDS[sign_index], 
-                                "SubLord": lords[j], "SubSubLord": lords[k] }
-                    k = (k + 1) % 9
-                    if k == j:
-                        break
-                j = (j + 1) % 9
-                if j == i:
-                    break
-            i += 1  
+        return get_rl_nl_sl_lookup(deg)
 
 
+    @timed("transit_details")
     def get_transit_details(self):
         """
         Captures the rl_nl_sl transit data for all planets at the current chart time.
@@ -296,17 +394,12 @@ class VedicHoroscopeData:
         =======
         A named tuple collection containing the transit details for all planets.
         """
-        # Define the named tuple for transit details
-        TransitDetails = collections.namedtuple('TransitDetails', [
-            'timestamp', 'PlanetName', 'PlanetLon', 'PlanetSign', 'Nakshatra',
-            'NakshatraLord', 'SubLord', 'SubLordSign', 'isRetrograde'
-        ])
         chart = self.generate_chart()
         transit_data = []
         timestamp = f"{self.year}-{self.month:02d}-{self.day:02d} {self.hour:02d}:{self.minute:02d}:00"
         for planet in chart.objects:  
             if planet.id not in ["Chiron", "Syzygy", "Pars Fortuna"]:
-                planet_name = clean_select_objects_split_str(str(planet))[0]
+                planet_name = get_object_name(planet.id)
                 ## Get additional details like Nakshatra, RL, NL, SL details          
                 rl_nl_sl_data = self.get_rl_nl_sl_data(deg = planet.lon)
                 planet_star = rl_nl_sl_data.get("Nakshatra", None)
@@ -319,17 +412,16 @@ class VedicHoroscopeData:
                                                 planet_star_lord, planet_sub_lord, sub_lord_sign, planet.isRetrograde()))
         return transit_data
         
-    def get_planets_data_from_chart(self, chart: Chart, new_houses_chart: Chart = None):
+    @timed("planets_data")
+    def get_planets_data_from_chart(self, chart: Chart, new_houses_chart: Chart | HouseCuspIndex = None):
         """
         Generate the planets data table given a `flatlib.Chart` object.
         Parameters
         ==========
         chart: flatlib Chart object using which planetary positions have to be generated
-        new_houses_chart: flatlib Chart Object using which new house numbers have to be
+        new_houses_chart: flatlib Chart Object (or a `HouseCuspIndex`) using which new house numbers have to be
                         computed, typically used along with KP Horary Method
         """
-        PlanetsData = collections.namedtuple("PlanetsData",PLANETS_TABLE_COLS)
-
         # Get the house each planet is in
         planet_in_house = self.get_planet_in_house(planets_chart = chart, houses_chart = new_houses_chart) if new_houses_chart \
                         else self.get_planet_in_house(planets_chart = chart, houses_chart = chart)
@@ -340,8 +432,8 @@ class VedicHoroscopeData:
         planets_data = []
         planets_data.append(ascendant_data)
         for planet in chart.objects:
-            planet_obj = clean_select_objects_split_str(str(planet))
-            planet_name, planet_lon_deg, planet_lat_deg = planet_obj[0], planet_obj[2], planet_obj[3]
+            planet_name = get_object_name(planet.id)
+            planet_lon_deg, planet_lat_deg = angle.toString(planet.signlon), angle.toString(planet.lonspeed)
 
             ## Get additional details like Nakshatra, RL, NL, SL details
             rl_nl_sl_data = self.get_rl_nl_sl_data(deg = planet.lon)
@@ -360,13 +452,12 @@ class VedicHoroscopeData:
                                             planet_rasi_lord, planet_star_lord, planet_sub_lord, planet_ss_lord, planet_house))
         return planets_data
 
+    @timed("houses_data")
     def get_houses_data_from_chart(self, chart: Chart):
         """Generate the houses data table given a `flatlib.Chart` object"""
-        HousesData = collections.namedtuple("HousesData", HOUSES_TABLE_COLS) # Create NamedTuple Collection to store data
         houses_data = []
         for house in chart.houses:    
-            house_obj = str(house).strip('<').strip('>').split()
-            house_name, house_lon_deg, house_size = house_obj[0], house_obj[2], round(float(house_obj[3]), 3)
+            house_name, house_lon_deg, house_size = house.id, angle.toString(house.signlon), round(house.size, 3)
             house_nr = int(house_name.strip("House"))
             house_roman_nr = ROMAN_HOUSE_NUMBERS.get(house_name)
 
@@ -384,6 +475,7 @@ class VedicHoroscopeData:
                             house_size, house_star, house_rasi_lord, house_star_lord, house_sub_lord, house_ss_lord)) 
         return houses_data
 
+    @timed("consolidated_chart_data")
     def get_consolidated_chart_data(self, planets_data: collections.namedtuple, houses_data: collections.namedtuple, 
                                     return_style : str = None):
         """
@@ -391,174 +483,75 @@ class VedicHoroscopeData:
         If `return_style == "dataframe_records"`, returns the consolidated data in the form of a list of dictionaries
         If `return_style == None`, returns the consolidated data in the form of a dictionary grouped by rasi
         """
-        # Construct polars DataFrame of planets and houses data from the flatlib_sidereal Chart object
-        req_cols = ["Rasi","Object","isRetroGrade", "LonDecDeg" ,"SignLonDMS", "SignLonDecDeg"]
-        planets_df = pl.DataFrame(planets_data).select(req_cols)
-        houses_df = pl.DataFrame(houses_data).with_columns(pl.lit(False).alias("isRetroGrade")).select(req_cols)
-        
-        ## Create joined dataframe of planets and houses data
-        df_concat = pl.concat([houses_df, planets_df])
-
-        # Group by 'Rasi' and aggregate all columns into a list or first non-null value
-        result_df = df_concat.group_by('Rasi').agg([
-            pl.col('Object').map_elements(list, return_dtype=pl.Object).alias('Object'),
-            pl.col('isRetroGrade').map_elements(list, return_dtype=pl.Object).alias('isRetroGrade'),
-            pl.col('LonDecDeg').map_elements(list, return_dtype=pl.Object).alias('LonDecDeg'),
-            pl.col('SignLonDMS').map_elements(list, return_dtype=pl.Object).alias('SignLonDMS'),
-            pl.col('SignLonDecDeg').map_elements(list, return_dtype=pl.Object).alias('SignLonDecDeg'),
-            # pl.col('LatDMS').map_elements(list, return_dtype=pl.Object).alias('LatDMS')
-        ])
-
-        ## Sort by Rashis Order from `Aries` to `Pisces` in Clockwise Order
-        result_df = result_df.with_columns(pl.col('Rasi').map_elements(lambda rasi: RASHIS.index(rasi), return_dtype=pl.Int32).alias('RashiOrder'))
-        result_df = result_df.sort('RashiOrder').drop('RashiOrder') ## Sort by RashiOrder and Drop the column
+        from .consolidated import get_consolidated_chart_records
 
+        # Bucket the houses and planets into the 12 rasi slots, from `Aries` to `Pisces`
+        records = get_consolidated_chart_records(planets_data, houses_data)
 
         if return_style == "dataframe_records":
-            return result_df.to_dicts()
+            return records
         else:
-            return self.get_consolidated_chart_data_rasi_wise(df = result_df)
-
-    def get_consolidated_chart_data_rasi_wise(self, df: pl.DataFrame):
-        """Returns in dict format, the consolidated chart data stored in a polars DataFrame grouped by Rasi"""  
-        final_dict = {}
-        columns = df.columns
-
-        for row in df.iter_rows():
-            rasi = row[columns.index('Rasi')]
-            final_dict[rasi] = {}           
-            for obj, is_retrograde, lon_dd, lon_dms, sign_lon_dd in zip(row[columns.index('Object')], 
-                                                                        row[columns.index('isRetroGrade')] , 
-                                                                        row[columns.index('LonDecDeg')] , 
-                                                                        row[columns.index('SignLonDMS')] , 
-                                                                        row[columns.index('SignLonDecDeg')] ):
-
-                final_dict[rasi][obj] = {"is_Retrograde": is_retrograde, "LonDecDeg": lon_dd, 
-                                        "SignLonDMS" : lon_dms, "SignLonDecDeg": sign_lon_dd}
-        return final_dict
-
-
-    def get_planet_in_house(self, houses_chart: Chart, planets_chart: Chart):
-        """Determine which house each planet is in given a `flatlib.Chart` object"""
-        planet_in_house = {}
-
-        # Get the list of cusps (the boundary between two houses) along with their house numbers
-        cusps = sorted([(house.lon, int(house.id.replace('House', ''))) for house in houses_chart.houses])
-        # Add the first cusp (plus 360 degrees) as the end of the last house
-        cusps.append((cusps[0][0] + 360, cusps[0][1])) 
-        # print("Cusps ADJ:",cusps)
-
-        for planet in planets_chart.objects:
-            planet_name = clean_select_objects_split_str(str(planet))[0]
-            planet_lon = planet.lon
-            for i in range(12):
-                if cusps[i][0] <= planet_lon < cusps[i+1][0]:
-                    planet_in_house[planet_name] = cusps[i][1]
-                    break
-                    ## Check if planet is overlapping into the last cusp
-                elif cusps[i][0] <= planet_lon + 360 < cusps[i+1][0]:
-                    planet_in_house[planet_name] = cusps[i][1]
-                    break
-
-        return planet_in_house
-    
-    def get_unique_house_nrs_for_rasi_lord(self, planets_df : pl.DataFrame, planet_name: str):
-        """Returns the unique set of house numbers where the given planet is the rasi lord"""
-        # Group by RasiLord and aggregate HouseNr into a list
-        grouped_df = planets_df.group_by("RasiLord").agg([pl.col('HouseNr')\
-                                .map_elements(list, return_dtype=pl.Object).alias('HouseNr')])
+            return self.get_consolidated_chart_data_rasi_wise(df = records)
 
-        # Filter the DataFrame for the given planet
-        filtered_df = grouped_df.filter(pl.col('RasiLord') == planet_name)
+    def get_consolidated_chart_data_rasi_wise(self, df: pl.DataFrame | list):
+        """
+        Returns in dict format, the consolidated chart data grouped by Rasi, 
+        stored either in a polars DataFrame or as a list of dataframe records
+        """
+        from .consolidated import consolidated_records_to_rasi_wise
+        records = df.to_dicts() if isinstance(df, pl.DataFrame) else df
+        return consolidated_records_to_rasi_wise(records)
 
-        # If there are no matching rows, return an empty list
-        if filtered_df.shape[0] == 0:
-            return []
 
-        # Get the list of house numbers for the given planet
-        house_nrs = filtered_df['HouseNr'].to_list()[0]
+    def get_planet_in_house(self, houses_chart: Chart | HouseCuspIndex, planets_chart: Chart):
+        """
+        Determine which house each planet is in given a `flatlib.Chart` object.
+        `houses_chart` can also be a prebuilt `HouseCuspIndex`, to reuse the same houses across many planet charts.
+        """
+        cusp_index = houses_chart if isinstance(houses_chart, HouseCuspIndex) else HouseCuspIndex.from_chart(houses_chart)
+        return {get_object_name(planet.id): cusp_index.house_for(planet.lon) for planet in planets_chart.objects}
+    
+    def get_unique_house_nrs_for_rasi_lord(self, planets_df : pl.DataFrame, planet_name: str):
+        """Returns the unique set of house numbers where the given planet is the rasi lord"""
+        # Get the house numbers of the rows of the given planet, in the row order
+        house_nrs = planets_df.filter(pl.col('RasiLord') == planet_name)['HouseNr'].to_list()
 
         # Remove duplicates by converting the list to a set and then back to a list
         unique_house_nrs = list(set(house_nrs))
 
         return unique_house_nrs
 
+    @timed("planet_significators")
     def get_planet_wise_significators(self, planets_data: collections.namedtuple, houses_data: collections.namedtuple):
-        """Generate the ABCD significators table for each planet"""
-        significators_table_cols = ["Planet", "A", "B", "C", "D"]
-        SignificatorsData = collections.namedtuple("PlanetSignificators", significators_table_cols)
-
-        # Get the planets data and Filter planets_data to remove objects like "Asc", "Chiron", "Syzygy", "Fortuna"
-        planets_data = [planet for planet in planets_data if planet.Object not in ["Asc", "Chiron", "Syzygy", "Fortuna"]]
-
-        # Get the house each planet is in
-        planets_house_deposition = {data.Object: data.HouseNr for data in planets_data}
-
-
-        significators_data = []
-        for planet in planets_data:
-            # A. House occupied by the star lord (Nakshatra Lord) of the planet
-            A = planets_house_deposition.get(planet.NakshatraLord, None)
-
-            # B. House occupied by the planet itself
-            B = planet.HouseNr
-
-            # C. House nrs where the star lord planet is also the rashi lord
-            C = [data.HouseNr for data in houses_data if data.RasiLord == planet.NakshatraLord]
+        """Generate the ABCD significators table for each planet, from the inverted indexes of the chart"""
+        from .significators import SignificatorIndex
 
-            # D. House nrs where the planet itself is also the rashi lord
-            D = [data.HouseNr for data in houses_data if data.RasiLord == planet.Object]
-
-            # Append data to NamedTuple Collection
-            significators_data.append(SignificatorsData(planet.Object, A, B, C, D))
-
-        return significators_data
+        # A. House occupied by the star lord (Nakshatra Lord) of the planet, B. House occupied by the planet itself
+        # C. House nrs where the star lord planet is also the rashi lord, D. House nrs where the planet itself is also the rashi lord
+        significator_index = SignificatorIndex(planets_data, houses_data)
+        return [PlanetSignificators(*row) for row in significator_index.get_planet_wise_significators()]
 
+    @timed("house_significators")
     def get_house_wise_significators(self, planets_data : collections.namedtuple, houses_data: collections.namedtuple):
-        """Generate the ABCD significators table for each house"""
-        significators_table_cols = ["House", "A", "B", "C", "D"]
-        SignificatorsData = collections.namedtuple("HouseSignificators", significators_table_cols)
-
-        # Get the planets data and Filter planets_data to remove objects like "Asc", "Chiron", "Syzygy", "Fortuna"
-        planets_data = [planet for planet in planets_data if planet.Object not in ["Asc", "Chiron", "Syzygy", "Fortuna"]]
-
-        # Create a mapping of planets to their star lords (Nakshatra Lords)
-        planet_to_star_lord = {data.Object: data.NakshatraLord for data in planets_data}
-
-        significators_data = []
-        for house in houses_data:
-            # A. Planets in the star of occupants of that house
-            # A1.1) Get all the rows which match with the house.HouseNr
-            occupant_house_planets = [planet.Object for planet in planets_data if planet.HouseNr == house.HouseNr]
-            # A1.2.) For each planet in occupant_house_planets find out if that planet is the Nakshatra Lord for any row in the planets_data
-            A = [planet.Object for planet in planets_data if planet.NakshatraLord in occupant_house_planets]
+        """Generate the ABCD significators table for each house, from the inverted indexes of the chart"""
+        from .significators import SignificatorIndex
 
-            # B. Planets in that house
-            B = [planet.Object for planet in planets_data if planet.HouseNr == house.HouseNr]
-
-            # C. Planets in the star of owners of that house
-            C = [planet for planet, star_lord in planet_to_star_lord.items() if star_lord == house.RasiLord]
-
-            # D. Owner of that house
-            D = house.RasiLord
-
-            # Append data to NamedTuple Collection
-            significators_data.append(SignificatorsData(house.Object, A, B, C, D))
-
-        return significators_data
+        # A. Planets in the star of occupants of that house, B. Planets in that house
+        # C. Planets in the star of owners of that house, D. Owner of that house
+        significator_index = SignificatorIndex(planets_data, houses_data)
+        return [HouseSignificators(*row) for row in significator_index.get_house_wise_significators()]
         
 
+    @timed("vimshottari_dasa")
     def compute_vimshottari_dasa(self, chart: Chart):
         """Computes the Vimshottari Dasa for the chart"""
         # Get the moon object from the chart
         moon = chart.get(const.MOON)
-        moon_details = clean_select_objects_split_str(str(moon))
 
         # Moon's Details
         moon_rl_nl_sl = self.get_rl_nl_sl_data(deg = moon.lon)
         moon_nakshatra = moon_rl_nl_sl["Nakshatra"]
         moon_nakshatra_lord = moon_rl_nl_sl["NakshatraLord"]
-        moon_sign_lord = moon_rl_nl_sl["RasiLord"]
         # moon_sub_lord = moon_rl_nl_sl["SubLord"]
 
         # Helper function to format datetime objects to string
@@ -612,3 +605,13 @@ class VedicHoroscopeData:
             dasa_start_date = dasa_end_date
 
         return vimshottari_dasa
+
+    @timed("vimshottari_dasa_periods")
+    def compute_vimshottari_dasa_periods(self, chart: Chart, levels: int = 4):
+        """
+        Computes the Vimshottari Dasa periods (Maha Dasa, Bhukti, Antara & Sookshma) of the chart with the vectorized dasa engine.
+        Returns a `VimshottariDasaPeriods` object, use `to_polars()` for the DataFrame and `current_period_at(ts)` for the running periods.
+        """
+        from .dasa import compute_vimshottari_dasa_periods
+        birth_time = datetime(self.year, self.month, self.day, self.hour, self.minute, self.second)
+        return compute_vimshottari_dasa_periods(chart.get(const.MOON).lon, birth_time, levels = levels)
@@ -0,0 +1,191 @@
+"""
+Vectorized aspect engine, which builds the angular separation matrix of the planets once with numpy,
+and evaluates every configured aspect orb on it, for one chart (P x P) or a stack of charts (N x P x P).
+
+The aspect rules replicate `flatlib.aspects.getAspect`:
+- The faster moving object of a pair is the active object, the other one is the passive object.
+- Major aspects must be within the orb of either object, minor aspects within `MAX_MINOR_ASPECT_ORB`.
+- Pars Fortuna and the Moon Nodes only start conjunctions, but receive any aspect.
+- The first aspect of the aspect list which satisfies the above is the aspect of the pair.
+"""
+import numpy as np
+import polars as pl
+from flatlib import const, props
+from flatlib import aspects as flatlib_aspects
+
+
+## Global Constants
+## Planets of `VedicHoroscopeData.get_planetary_aspects`, in the same order
+ASPECT_PLANETS = [const.SUN, const.MOON, const.MARS, const.MERCURY, const.JUPITER, const.VENUS, const.SATURN,
+                  const.URANUS, const.NEPTUNE, const.PLUTO, const.NORTH_NODE, const.SOUTH_NODE]
+
+## Objects which only start conjunctions
+CONJUNCTION_ONLY_OBJECTS = [const.PARS_FORTUNA, const.NORTH_NODE, const.SOUTH_NODE]
+
+MAX_MINOR_ASPECT_ORB = flatlib_aspects.MAX_MINOR_ASP_ORB
+
+## Aspect index of the pairs without any aspect
+NO_ASPECT_INDEX = -1
+
+
+def compute_separation_matrix(lons):
+    """
+    Returns the closest angular distances (N x P x P) from each planet i to each planet j, in [-180, 180],
+    counter clockwise being positive, same as `flatlib.angle.closestdistance`, given the longitudes (N x P)
+    """
+    lons = np.atleast_2d(np.asarray(lons, dtype=np.float64))
+    sep = np.mod(lons[:, None, :] - lons[:, :, None], 360)
+    return np.where(sep <= 180, sep, sep - 360)
+
+def compute_aspect_matrix(lons, speeds, planets: list = ASPECT_PLANETS, aspect_list: list = const.ALL_ASPECTS,
+                          orbs: dict = None, max_minor_orb: float = MAX_MINOR_ASPECT_ORB):
+    """
+    Evaluates the aspects between all the pairs of planets, of one chart or a stack of charts.
+
+    Parameters
+    ==========
+    lons: The longitudes of the planets, (P) for one chart or (N x P) for a stack of charts
+    speeds: The longitude speeds of the planets, same shape as `lons`
+    planets: The flatlib ids of the P planets, used for their orbs and the conjunction only rule
+    aspect_list: The aspects (in degrees) to evaluate, in order of preference
+    orbs: The orbs of the planets, to override the default flatlib orbs (Eg: {"Sun": 10})
+    max_minor_orb: The maximum orb of the minor aspects
+
+    Returns
+    =======
+    A tuple of (aspect_index, aspect_orb) numpy arrays of shape (N x P x P), where `aspect_index` is the index
+    into `aspect_list` of the aspect between the planets i and j (`NO_ASPECT_INDEX` if none, and on the diagonal)
+    """
+    lons = np.atleast_2d(np.asarray(lons, dtype=np.float64))
+    speeds = np.abs(np.atleast_2d(np.asarray(speeds, dtype=np.float64)))
+    orbs = {**props.object.orb, **(orbs if orbs else {})}
+    planet_orbs = np.array([orbs[planet] for planet in planets], dtype=np.float64)
+    conjunction_only = np.array([planet in CONJUNCTION_ONLY_OBJECTS for planet in planets])
+
+    # The faster object of each pair is the active one, if the speeds are equal the second object (j) is active
+    active_is_i = speeds[:, :, None] > speeds[:, None, :]
+    lon_active = np.where(active_is_i, lons[:, :, None], lons[:, None, :])
+    lon_passive = np.where(active_is_i, lons[:, None, :], lons[:, :, None])
+    orb_active = np.where(active_is_i, planet_orbs[:, None], planet_orbs[None, :])
+    orb_passive = np.where(active_is_i, planet_orbs[None, :], planet_orbs[:, None])
+    conjunction_only_active = np.where(active_is_i, conjunction_only[:, None], conjunction_only[None, :])
+
+    sep = np.mod(lon_passive - lon_active, 360)
+    abs_sep = np.abs(np.where(sep <= 180, sep, sep - 360))
+
+    aspect_degs = np.array(aspect_list, dtype=np.float64)[:, None, None, None]
+    aspect_orbs = np.abs(abs_sep[None] - aspect_degs)  # K x N x P x P
+    is_major = np.isin(aspect_list, const.MAJOR_ASPECTS)[:, None, None, None]
+    within_orb = np.where(is_major, (aspect_orbs <= orb_active) | (aspect_orbs <= orb_passive),
+                          aspect_orbs <= max_minor_orb)
+    is_conjunction = (aspect_degs == const.CONJUNCTION)
+    valid = within_orb & (is_conjunction | ~conjunction_only_active[None])
+    valid &= ~np.eye(lons.shape[1], dtype=bool)
+
+    # The first valid aspect of the aspect list
+    first_valid = np.argmax(valid, axis=0)
+    has_aspect = valid.any(axis=0)
+    aspect_index = np.where(has_aspect, first_valid, NO_ASPECT_INDEX)
+    aspect_orb = np.where(has_aspect, np.take_along_axis(aspect_orbs, first_valid[None], axis=0)[0], 0.0)
+    return aspect_index, aspect_orb
+
+def get_aspects_frame(lons, speeds, planets: list = ASPECT_PLANETS, aspect_list: list = const.ALL_ASPECTS,
+                      orbs: dict = None, max_minor_orb: float = MAX_MINOR_ASPECT_ORB, planet_names: list = None):
+    """
+    Returns the aspects between the pairs of planets (upper triangle of the aspect matrix, i.e. each pair once)
+    of a stack of charts, as a polars DataFrame with the columns ChartID, P1, P2, AspectDeg, AspectOrb, P1_Lon, P2_Lon.
+    `planet_names` are the names to use in the output, defaulting to the flatlib ids of the planets.
+    """
+    lons = np.atleast_2d(np.asarray(lons, dtype=np.float64))
+    aspect_index, aspect_orb = compute_aspect_matrix(lons, speeds, planets, aspect_list, orbs, max_minor_orb)
+    upper_i, upper_j = np.triu_indices(lons.shape[1], k=1)
+    chart_ids, pair_ids = np.nonzero(aspect_index[:, upper_i, upper_j] != NO_ASPECT_INDEX)
+    i, j = upper_i[pair_ids], upper_j[pair_ids]
+    names = planet_names if planet_names else planets
+    return pl.DataFrame({"ChartID": chart_ids,
+                         "P1": pl.Series("P1", names, dtype=pl.Utf8).gather(i),
+                         "P2": pl.Series("P2", names, dtype=pl.Utf8).gather(j),
+                         "AspectDeg": np.array(aspect_list)[aspect_index[chart_ids, i, j]],
+                         "AspectOrb": aspect_orb[chart_ids, i, j],
+                         "P1_Lon": lons[chart_ids, i],
+                         "P2_Lon": lons[chart_ids, j]})
+
+def find_multiple_aspects(lons, multiple: float = 15, decimals: int = 3):
+    """
+    Finds the pairs of planets, whose longitude difference (rounded to `decimals`, after rounding the longitudes
+    to `decimals`, same as Python's `round`) is an exact multiple of `multiple` degrees, given the longitudes (N x P).
+    Returns a tuple of (is_multiple, aspect_degs) numpy arrays of shape (N x P x P), where `aspect_degs` is
+    the multiple of `multiple` nearest to the longitude difference.
+    """
+    lons = np.atleast_2d(np.asarray(lons, dtype=np.float64))
+    rounded_lons = np.vectorize(round)(lons, decimals).astype(np.float64)
+    lon_diff = np.abs(rounded_lons[:, :, None] - rounded_lons[:, None, :])
+    lon_diff = np.where(lon_diff > 180, 360 - lon_diff, lon_diff)
+    aspect_degs = multiple * np.round(lon_diff / multiple)
+    # Filter the candidates with a tolerance, then check them with the exact Python rounding
+    is_multiple = np.abs(lon_diff - aspect_degs) < 10 ** -decimals
+    for idx in zip(*np.nonzero(is_multiple)):
+        is_multiple[idx] = round(float(lon_diff[idx]), decimals) % multiple == 0
+    return is_multiple, aspect_degs
+
+
+## Vedic Aspects
+## Vedic aspects in order of evaluation, with the sign / house differences between the planets making each aspect
+VEDIC_ASPECT_DELTAS = {"Conjunction": [0], "Opposition": [6], "Trine": [4, 8], "Square": [3, 9], "Sextile": [2, 10]}
+VEDIC_ASPECT_NAMES = list(VEDIC_ASPECT_DELTAS)
+
+def _build_vedic_aspect_table():
+    """
+    Builds the (12 x 12) lookup table of the Vedic aspect bitmask, indexed by (sign_delta, house_delta), where
+    `sign_delta` is the sign difference modulo 12, and `house_delta` the absolute house number difference.
+    Bit k of the mask is set if the pair makes the aspect `VEDIC_ASPECT_NAMES[k]` by sign or by house.
+    """
+    table = np.zeros((12, 12), dtype=np.uint8)
+    for bit, deltas in enumerate(VEDIC_ASPECT_DELTAS.values()):
+        for delta in deltas:
+            table[delta, :] |= 1 << bit
+            table[:, delta] |= 1 << bit
+    return table
+
+VEDIC_ASPECT_TABLE = _build_vedic_aspect_table()
+
+def compute_vedic_aspect_masks(sign_idx, house_nrs, other_sign_idx = None, other_house_nrs = None):
+    """
+    Resolves the Vedic aspects between all the pairs of planets of one chart (P) or a stack of charts (N x P),
+    given the sign indices (0 = Aries) and house numbers of the planets, with a single lookup into `VEDIC_ASPECT_TABLE`.
+    If the signs and houses of other planets (Eg: of a partner chart, for compatibility matching) are given,
+    resolves the aspects between the planets and the other planets instead.
+    Returns the (N x P x P) or (N x P x Q) aspect bitmasks, see `VEDIC_ASPECT_NAMES` for the bits.
+    """
+    sign_idx, house_nrs = np.atleast_2d(sign_idx).astype(np.int64), np.atleast_2d(house_nrs).astype(np.int64)
+    other_sign_idx = sign_idx if other_sign_idx is None else np.atleast_2d(other_sign_idx).astype(np.int64)
+    other_house_nrs = house_nrs if other_house_nrs is None else np.atleast_2d(other_house_nrs).astype(np.int64)
+    sign_delta = np.mod(sign_idx[:, :, None] - other_sign_idx[:, None, :], 12)
+    house_delta = np.abs(house_nrs[:, :, None] - other_house_nrs[:, None, :])
+    return VEDIC_ASPECT_TABLE[sign_delta, house_delta]
+
+def get_vedic_aspects_frame(sign_idx, house_nrs, planet_names: list, other_sign_idx = None, other_house_nrs = None,
+                            other_planet_names: list = None):
+    """
+    Returns the Vedic aspects of a stack of charts as a polars DataFrame, with the columns ChartID, P1, P2, Aspect,
+    P1_HouseNr, P2_HouseNr, P1_SignIdx and P2_SignIdx, with one row per aspect of each pair of planets.
+    Within a chart each pair is listed once (upper triangle), while between the planets and the other planets
+    (see `compute_vedic_aspect_masks`) all the pairs are listed. `other_planet_names` default to `planet_names`.
+    """
+    sign_idx, house_nrs = np.atleast_2d(sign_idx), np.atleast_2d(house_nrs)
+    masks = compute_vedic_aspect_masks(sign_idx, house_nrs, other_sign_idx, other_house_nrs)
+    other_planet_names = other_planet_names if other_planet_names else planet_names
+    if other_sign_idx is None:
+        other_sign_idx, other_house_nrs = sign_idx, house_nrs
+        masks = masks * np.triu(np.ones(masks.shape[1:], dtype=np.uint8), k=1)
+    other_sign_idx, other_house_nrs = np.atleast_2d(other_sign_idx), np.atleast_2d(other_house_nrs)
+
+    # Unpack the bits of the masks, in the order of the aspects
+    bits = (masks[..., None] >> np.arange(len(VEDIC_ASPECT_NAMES), dtype=np.uint8)) & 1
+    chart_ids, i, j, aspect_idx = np.nonzero(bits)
+    return pl.DataFrame({"ChartID": chart_ids,
+                         "P1": pl.Series("P1", planet_names, dtype=pl.Utf8).gather(i),
+                         "P2": pl.Series("P2", other_planet_names, dtype=pl.Utf8).gather(j),
+                         "Aspect": pl.Series("Aspect", VEDIC_ASPECT_NAMES, dtype=pl.Utf8).gather(aspect_idx),
+                         "P1_HouseNr": house_nrs[chart_ids, i], "P2_HouseNr": other_house_nrs[chart_ids, j],
+                         "P1_SignIdx": sign_idx[chart_ids, i], "P2_SignIdx": other_sign_idx[chart_ids, j]})
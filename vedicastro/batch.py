@@ -0,0 +1,201 @@
+"""
+Batch chart engine, which computes the planets and houses tables of thousands of charts per call,
+by calling pyswisseph directly, instead of constructing a `VedicHoroscopeData` and `flatlib.Chart` per chart.
+
+The derived chart points `Syzygy` and `Pars Fortuna` are not computed by this engine,
+all the other objects of `VedicHoroscopeData.get_planets_data_from_chart` are computed in the same order.
+"""
+import numpy as np
+import polars as pl
+import swisseph as swe
+from .utils import utc_offset_str_to_float, decdeg_to_dms_array
+from .VedicAstro import (RASHIS, HOUSES_TABLE_COLS, PLANETS_TABLE_COLS, ROMAN_HOUSE_NUMBERS,
+                         get_rl_nl_sl_lookup_array)
+
+
+## Global Constants
+SWE_AYANAMSA_MAPPING = { "Lahiri": swe.SIDM_LAHIRI, "Lahiri_1940": swe.SIDM_LAHIRI_1940,
+                        "Lahiri_VP285": swe.SIDM_LAHIRI_VP285, "Lahiri_ICRC": swe.SIDM_LAHIRI_ICRC, "Raman": swe.SIDM_RAMAN,
+                        "Krishnamurti": swe.SIDM_KRISHNAMURTI, "Krishnamurti_Senthilathiban": swe.SIDM_KRISHNAMURTI_VP291,
+                        }
+
+SWE_HOUSE_SYSTEM_MAPPING = { "Placidus": b'P', "Equal": b'A', "Equal 2": b'E', "Whole Sign": b'W' }
+
+## Objects in the same order as `flatlib.const.LIST_OBJECTS`, Ketu is derived from Rahu
+SWE_OBJECTS = { "Sun": swe.SUN, "Moon": swe.MOON, "Mercury": swe.MERCURY, "Venus": swe.VENUS, "Mars": swe.MARS,
+                "Jupiter": swe.JUPITER, "Saturn": swe.SATURN, "Uranus": swe.URANUS, "Neptune": swe.NEPTUNE,
+                "Pluto": swe.PLUTO, "Chiron": swe.CHIRON, "Rahu": swe.MEAN_NODE,
+               }
+
+BATCH_OBJECTS = ["Asc"] + list(SWE_OBJECTS) + ["Ketu"]
+
+SWE_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_SIDEREAL
+
+## Objects are stationary below this speed (1 arc-second / day), same as flatlib
+STATIONARY_SPEED = 0.0003
+
+## Number of days in each month of a non leap year
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def _as_column(values, n: int, dtype = None):
+    """Broadcasts a scalar or a sequence of values to a numpy array of length n"""
+    if isinstance(values, (str, bytes)) or np.ndim(values) == 0:
+        return np.full(n, values, dtype = dtype if dtype else object)
+    values = np.asarray(values, dtype = dtype)
+    if len(values) != n:
+        raise ValueError(f"All the input columns must have the same length, expected {n} but got {len(values)}")
+    return values
+
+def check_chart_times(year, month, day, hour, minute, second):
+    """
+    Checks that the chart times (columns of equal length) are valid dates (in the Gregorian calendar) and times of the day,
+    raises a ValueError listing the first invalid values and their row indices otherwise
+    """
+    year, month, day = np.asarray(year), np.asarray(month), np.asarray(day)
+    hour, minute, second = np.asarray(hour), np.asarray(minute), np.asarray(second)
+    is_valid_month = (month >= 1) & (month <= 12)
+    is_leap_year = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days_in_month = DAYS_IN_MONTH[np.where(is_valid_month, month, 1) - 1] + ((month == 2) & is_leap_year)
+    for col, values, is_valid in [("month", month, is_valid_month),
+                                  ("day", day, (day >= 1) & (day <= days_in_month)),
+                                  ("hour", hour, (hour >= 0) & (hour < 24)),
+                                  ("minute", minute, (minute >= 0) & (minute < 60)),
+                                  ("second", second, (second >= 0) & (second < 60))]:
+        invalid_rows = np.flatnonzero(~is_valid)
+        if len(invalid_rows):
+            raise ValueError(f"Invalid {col} values {values[invalid_rows[:5]].tolist()} at rows {invalid_rows[:5].tolist()}"
+                             f"{' (and more)' if len(invalid_rows) > 5 else ''}")
+
+def _julian_days(year, month, day, hour, minute, second, utc_offset):
+    """Computes the julian days (UT) of the charts, same as `flatlib.datetime.Datetime`"""
+    jdn = np.array([swe.julday(int(y), int(m), int(d), 12.0) for y, m, d in zip(year, month, day)])
+    time = hour + minute / 60 + second / 3600
+    return jdn + time / 24.0 - utc_offset / 24.0 - 0.5
+
+def _planet_in_house(longitudes: np.ndarray, cusps: np.ndarray):
+    """Returns the house numbers (N x P) of the given planet longitudes (N x P), given the house cusps (N x 12)"""
+    order = np.argsort(cusps, axis = 1)
+    sorted_cusps = np.take_along_axis(cusps, order, axis = 1)
+    idx = (sorted_cusps[:, None, :] <= longitudes[:, :, None]).sum(axis = 2) - 1
+    # Planets before the first cusp overlap into the last cusp
+    idx = np.where(idx < 0, 11, idx)
+    return np.take_along_axis(order, idx, axis = 1) + 1
+
+def _lords_columns(longitudes: np.ndarray):
+    """Returns the nakshatra and lords columns for the flattened longitudes"""
+    rl_nl_sl_data = get_rl_nl_sl_lookup_array(longitudes)
+    return {col: rl_nl_sl_data[col] for col in ["Nakshatra", "RasiLord", "NakshatraLord", "SubLord", "SubSubLord"]}
+
+def compute_charts(year, month, day, hour, minute, second, latitude, longitude, utc_offset,
+                   ayanamsa = "Krishnamurti", house_system = "Placidus"):
+    """
+    Computes the planets and houses data tables for many charts at once.
+
+    Parameters
+    ==========
+    year, month, day, hour, minute, second: Columns (array-likes) of the chart times, a scalar input is broadcast
+                                            to all the charts
+    latitude, longitude: Columns of the chart locations
+    utc_offset: Column of UTC offsets, either as strings (Eg: "+5:30") or as float hours (Eg: 5.5)
+    ayanamsa: Ayanamsa, either a single ayanamsa for all charts, or a column of ayanamsas
+    house_system: House System, either a single house system for all charts, or a column of house systems
+
+    Returns
+    =======
+    A tuple of (planets_df, houses_df) polars DataFrames, with a `ChartID` column (the row index of the inputs)
+    followed by the `PLANETS_TABLE_COLS` and `HOUSES_TABLE_COLS` columns respectively.
+    Raises a ValueError if any of the chart times is invalid (Eg: month 13, day 30 of February or hour 24).
+    """
+    # The number of charts is the length of the column inputs, the scalar inputs are broadcast to all the charts
+    n = next((len(values) for values in [year, month, day, hour, minute, second, latitude, longitude, utc_offset,
+                                         ayanamsa, house_system]
+              if not isinstance(values, (str, bytes)) and np.ndim(values) > 0), 1)
+    year = _as_column(year, n, np.int64)
+    month, day = _as_column(month, n, np.int64), _as_column(day, n, np.int64)
+    hour, minute = _as_column(hour, n, np.float64), _as_column(minute, n, np.float64)
+    second = _as_column(second, n, np.float64)
+    check_chart_times(year, month, day, hour, minute, second)
+    latitude, longitude = _as_column(latitude, n, np.float64), _as_column(longitude, n, np.float64)
+    utc_offset = _as_column(utc_offset, n)
+    utc_offset = np.array([utc_offset_str_to_float(utc) if isinstance(utc, str) else float(utc) for utc in utc_offset])
+    ayanamsa, house_system = _as_column(ayanamsa, n), _as_column(house_system, n)
+
+    jd = _julian_days(year, month, day, hour, minute, second, utc_offset)
+
+    nr_objects = len(SWE_OBJECTS)
+    lons = np.empty((n, nr_objects + 2))  # Asc + planets + Ketu
+    speeds = np.zeros((n, nr_objects + 2))
+    cusps = np.empty((n, 12))
+
+    # Group the charts by ayanamsa, to set the sidereal mode once per ayanamsa
+    for ayan in np.unique(ayanamsa):
+        swe.set_sid_mode(SWE_AYANAMSA_MAPPING[ayan])
+        for i in np.flatnonzero(ayanamsa == ayan):
+            jd_i = jd[i]
+            for j, swe_id in enumerate(SWE_OBJECTS.values(), start = 1):
+                pos, _ = swe.calc_ut(jd_i, swe_id, SWE_FLAGS)
+                lons[i, j], speeds[i, j] = pos[0], pos[3]
+            house_cusps, ascmc = swe.houses_ex(jd_i, latitude[i], longitude[i],
+                                               SWE_HOUSE_SYSTEM_MAPPING[house_system[i]], SWE_FLAGS)
+            cusps[i] = house_cusps[:12]
+            lons[i, 0] = ascmc[0]
+    lons[:, -1] = (lons[:, -2] + 180) % 360
+    speeds[:, -1] = speeds[:, -2]
+
+    planets_df = _planets_frame(lons, speeds, cusps)
+    houses_df = _houses_frame(cusps)
+    return planets_df, houses_df
+
+def _planets_frame(lons: np.ndarray, speeds: np.ndarray, cusps: np.ndarray):
+    """Builds the planets DataFrame from the (N x P) longitudes and speeds"""
+    n, nr_objects = lons.shape
+    is_asc = np.tile(np.arange(nr_objects) == 0, n)
+    flat_lons, flat_speeds = lons.ravel(), speeds.ravel()
+    sign_lons = flat_lons % 30
+    sign_lon_dms = decdeg_to_dms_array(sign_lons)
+
+    # Same as `dms_to_decdeg` of the SignLonDMS string, which is used for the Ascendant
+    dms_parts = np.array([[int(part) for part in dms.split(':')] for dms in sign_lon_dms[is_asc]]).reshape(-1, 3)
+    asc_sign_lon_dec_deg = np.round(dms_parts[:, 0] + dms_parts[:, 1] / 60 + dms_parts[:, 2] / 3600, 4)
+    sign_lon_dec_deg = np.round(sign_lons, 3)
+    sign_lon_dec_deg[is_asc] = asc_sign_lon_dec_deg
+
+    is_retrograde = pl.Series("isRetroGrade", (flat_speeds <= -STATIONARY_SPEED))
+    house_nrs = _planet_in_house(lons, cusps)
+    house_nrs[:, 0] = 1
+
+    data = {"ChartID": np.repeat(np.arange(n), nr_objects),
+            "Object": np.tile(np.array(BATCH_OBJECTS, dtype = object), n),
+            "Rasi": np.array(RASHIS, dtype = object)[(flat_lons / 30).astype(np.int64)],
+            "isRetroGrade": is_retrograde,
+            "LonDecDeg": np.round(flat_lons, 3),
+            "SignLonDMS": sign_lon_dms,
+            "SignLonDecDeg": sign_lon_dec_deg,
+            "LatDMS": np.where(is_asc, None, decdeg_to_dms_array(flat_speeds)),
+            **_lords_columns(flat_lons),
+            "HouseNr": house_nrs.ravel(),
+            }
+    planets_df = pl.DataFrame({col: (values if isinstance(values, pl.Series) else pl.Series(col, values.tolist()))
+                               for col, values in data.items()})
+    return planets_df.with_columns(pl.when(pl.col("Object") == "Asc").then(None)
+                                   .otherwise(pl.col("isRetroGrade")).alias("isRetroGrade"))\
+                     .select(["ChartID"] + PLANETS_TABLE_COLS)
+
+def _houses_frame(cusps: np.ndarray):
+    """Builds the houses DataFrame from the (N x 12) house cusps"""
+    n = len(cusps)
+    flat_cusps = cusps.ravel()
+    sizes = (np.roll(cusps, -1, axis = 1) - cusps) % 360
+    data = {"ChartID": np.repeat(np.arange(n), 12),
+            "Object": np.tile(np.array(list(ROMAN_HOUSE_NUMBERS.values()), dtype = object), n),
+            "HouseNr": np.tile(np.arange(1, 13), n),
+            "Rasi": np.array(RASHIS, dtype = object)[(flat_cusps / 30).astype(np.int64)],
+            "LonDecDeg": np.round(flat_cusps, 3),
+            "SignLonDMS": decdeg_to_dms_array(flat_cusps % 30),
+            "SignLonDecDeg": np.round(flat_cusps % 30, 3),
+            "DegSize": np.round(sizes.ravel(), 3),
+            **_lords_columns(flat_cusps),
+            }
+    houses_df = pl.DataFrame({col: pl.Series(col, values.tolist()) for col, values in data.items()})
+    return houses_df.select(["ChartID"] + HOUSES_TABLE_COLS)
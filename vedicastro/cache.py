@@ -0,0 +1,161 @@
+"""
+Content-addressed cache of computed chart results, keyed on the normalized chart inputs (the UTC instant of the chart,
+rounded latitude and longitude, ayanamsa, house system etc.), so that repeated requests for the same birth data
+are served without rebuilding the chart.
+It is a bounded in-process LRU cache with a TTL, optionally backed by a shared store (Eg: `SQLiteCacheBackend`).
+"""
+import time
+import json
+import pickle
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import collections
+from datetime import datetime, timedelta
+from .utils import utc_offset_str_to_float, resolve_utc_offset
+
+
+## Global Constants
+## Decimals of the latitude & longitude in the cache keys, 4 decimals are about 11 metres
+CACHE_LATLON_DECIMALS = 4
+
+
+def normalize_chart_key(year: int, month: int, day: int, hour: int, minute: int, second: float, utc: str,
+                        latitude: float, longitude: float, ayanamsa: str, house_system: str, **extra):
+    """
+    Returns the normalized cache key tuple of the chart inputs.
+    The chart time is normalized to its UTC instant, along with the UTC offset in minutes, as the dasa dates and
+    the horary day are in local time. Any `extra` inputs (Eg: return_style, horary_number) are appended sorted by name.
+    The `utc` is an UTC offset str (Eg: +5:30) or a timezone name (Eg: Asia/Kolkata), which is resolved to its offset
+    at the chart time, like in `VedicHoroscopeData`, so both forms of the same chart share a key.
+    """
+    utc = resolve_utc_offset(utc, datetime(year, month, day, hour, minute))
+    utc_offset_mins = round(utc_offset_str_to_float(utc) * 60)
+    utc_instant = datetime(year, month, day) + timedelta(hours = hour, minutes = minute - utc_offset_mins, seconds = second)
+    return (utc_instant.isoformat(), utc_offset_mins, round(latitude, CACHE_LATLON_DECIMALS),
+            round(longitude, CACHE_LATLON_DECIMALS), ayanamsa, house_system) + tuple(sorted(extra.items()))
+
+def get_cache_key_digest(key: tuple):
+    """Returns the content address (SHA-256 hex digest) of a normalized cache key"""
+    return hashlib.sha256(json.dumps(key, separators = (",", ":")).encode()).hexdigest()
+
+
+class SQLiteCacheBackend:
+    """
+    Shared cache store in a local SQLite file, which can be used by several processes.
+    Values are pickled, so only use a file written by this package.
+    The connection can be used from any thread (Eg: with `asyncio.to_thread`), one call at a time.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread = False)
+        # Write-ahead log, so that the readers don't block the writer, and the commits don't wait for a sync to disk
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS chart_cache (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)")
+        self.conn.commit()
+
+    def get(self, key: str):
+        """Returns the (value, expires_at) of the key, or None if it is missing or expired"""
+        with self.lock:
+            row = self.conn.execute("SELECT value, expires_at FROM chart_cache WHERE key = ? AND expires_at > ?",
+                                    (key, time.time())).fetchone()
+        return (pickle.loads(row[0]), row[1]) if row else None
+
+    def set(self, key: str, value, ttl_secs: float):
+        pickled_value = pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO chart_cache VALUES (?, ?, ?)", (key, pickled_value, time.time() + ttl_secs))
+            self.conn.commit()
+
+    def purge_expired(self):
+        """Deletes the expired entries, returns the number of deleted entries"""
+        with self.lock:
+            nr_deleted = self.conn.execute("DELETE FROM chart_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            self.conn.commit()
+        return nr_deleted
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class ChartResultCache:
+    """
+    Bounded LRU cache with a TTL, of the chart results by their content address.
+    On a miss in memory, the `backend` (if given) is looked up, and its hits are kept in memory too.
+    Use `get_async` and `set_async` from the event loop, to run the backend calls in a thread.
+    Counts the hits, misses, evictions and expirations in `stats`.
+    """
+    def __init__(self, max_entries: int = 1024, ttl_secs: float = 3600, backend = None):
+        self.max_entries = max_entries
+        self.ttl_secs = ttl_secs
+        self.backend = backend
+        self.entries = collections.OrderedDict()  # key -> (expires_at, value)
+        self.stats = collections.Counter({"hits": 0, "backend_hits": 0, "misses": 0, "evictions": 0, "expirations": 0})
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: str):
+        """Returns the cached value of the key, or None on a miss"""
+        value = self._get_in_memory(key)
+        if value is None and self.backend is not None:
+            value = self._put_backend_entry(key, self.backend.get(key))
+        if value is None:
+            self.stats["misses"] += 1
+        return value
+
+    async def get_async(self, key: str):
+        """Same as `get`, with the backend lookup run in a thread, off the event loop"""
+        value = self._get_in_memory(key)
+        if value is None and self.backend is not None:
+            value = self._put_backend_entry(key, await asyncio.to_thread(self.backend.get, key))
+        if value is None:
+            self.stats["misses"] += 1
+        return value
+
+    def set(self, key: str, value):
+        self._put(key, value, self.ttl_secs)
+        if self.backend is not None:
+            self.backend.set(key, value, self.ttl_secs)
+
+    async def set_async(self, key: str, value):
+        """Same as `set`, with the backend write run in a thread, off the event loop"""
+        self._put(key, value, self.ttl_secs)
+        if self.backend is not None:
+            await asyncio.to_thread(self.backend.set, key, value, self.ttl_secs)
+
+    def _get_in_memory(self, key: str):
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            del self.entries[key]
+            self.stats["expirations"] += 1
+        return None
+
+    def _put_backend_entry(self, key: str, backend_entry):
+        if backend_entry is None:
+            return None
+        value, expires_at = backend_entry
+        self.stats["backend_hits"] += 1
+        # Keep it in memory only for the rest of its TTL in the backend
+        self._put(key, value, expires_at - time.time())
+        return value
+
+    def _put(self, key: str, value, ttl_secs: float):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = (time.monotonic() + ttl_secs, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last = False)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,75 @@
+"""
+Lazily evaluated chart result, where each section of the chart data (planets, houses, significators, aspects,
+dasa table and consolidated chart) is computed on its first access and memoized,
+so that the sections which are not requested cost nothing.
+"""
+import functools
+from flatlib.chart import Chart
+from .VedicAstro import VedicHoroscopeData
+
+
+## Global Constants
+## Sections of the chart result, in the order of the API response
+CHART_RESULT_SECTIONS = ["planets_data", "houses_data", "planet_significators", "planetary_aspects",
+                         "house_significators", "vimshottari_dasa_table", "consolidated_chart_data"]
+
+
+class ChartResult:
+    """
+    Chart data of a `VedicHoroscopeData`, computed section by section on first access.
+    For a horary chart, pass the `houses_chart` and `houses_data` of the matched horary ascendant,
+    else the houses are those of the chart itself.
+    """
+    def __init__(self, horoscope: VedicHoroscopeData, return_style: str = None, houses_chart: Chart = None,
+                 houses_data: list = None):
+        self.horoscope = horoscope
+        self.return_style = return_style
+        self.houses_chart = houses_chart
+        if houses_data is not None:
+            self.__dict__["houses_data"] = houses_data
+
+    @functools.cached_property
+    def chart(self):
+        return self.horoscope.generate_chart()
+
+    @functools.cached_property
+    def planets_data(self):
+        return self.horoscope.get_planets_data_from_chart(self.chart, self.houses_chart)
+
+    @functools.cached_property
+    def houses_data(self):
+        return self.horoscope.get_houses_data_from_chart(self.chart)
+
+    @functools.cached_property
+    def planet_significators(self):
+        return self.horoscope.get_planet_wise_significators(self.planets_data, self.houses_data)
+
+    @functools.cached_property
+    def planetary_aspects(self):
+        return self.horoscope.get_planetary_aspects(self.chart)
+
+    @functools.cached_property
+    def house_significators(self):
+        return self.horoscope.get_house_wise_significators(self.planets_data, self.houses_data)
+
+    @functools.cached_property
+    def vimshottari_dasa_table(self):
+        return self.horoscope.compute_vimshottari_dasa(self.chart)
+
+    @functools.cached_property
+    def consolidated_chart_data(self):
+        return self.horoscope.get_consolidated_chart_data(planets_data = self.planets_data, houses_data = self.houses_data,
+                                                          return_style = self.return_style)
+
+    def to_dict(self, sections: list = None):
+        """
+        Returns the requested sections (default: all the `CHART_RESULT_SECTIONS`) as a dict, in the section order,
+        with the planets and houses data rows as dicts
+        """
+        sections = CHART_RESULT_SECTIONS if sections is None else [section for section in CHART_RESULT_SECTIONS
+                                                                   if section in sections]
+        result = {section: getattr(self, section) for section in sections}
+        for section in ["planets_data", "houses_data"]:
+            if section in result:
+                result[section] = [row._asdict() for row in result[section]]
+        return result
@@ -0,0 +1,206 @@
+"""
+Array-backed store of the planets and houses data of many charts, for holding large numbers of charts in memory
+(Eg: for research over millions of charts), instead of lists of `PlanetsData` / `HousesData` named tuples.
+
+Each column is a numpy array over the rows of all the charts, with the rows of a chart between its offsets.
+The objects, signs, nakshatras and lords are stored as small integer codes into their categories, and the DMS strings
+as signed arc-seconds, so a planet row takes about 40 bytes. The rows are decoded back to the named tuples on access,
+and the store converts to Arrow (zero-copy for the numeric and code columns) and polars.
+"""
+import numpy as np
+import polars as pl
+import pyarrow as pa
+from flatlib import const
+from .VedicAstro import (RASHIS, NAKSHATRAS, VIMSHOTTARI_LORDS, ROMAN_HOUSE_NUMBERS, PLANETS_TABLE_COLS,
+                         HOUSES_TABLE_COLS, PlanetsData, HousesData, get_object_name)
+
+
+## Global Constants
+## Categories of the coded columns, the code of a value is its index in its categories
+PLANET_OBJECTS = ["Asc"] + [get_object_name(object_id) for object_id in const.LIST_OBJECTS]
+HOUSE_OBJECTS = list(ROMAN_HOUSE_NUMBERS.values())
+LORD_COLS = ["RasiLord", "NakshatraLord", "SubLord", "SubSubLord"]
+PLANET_CATEGORIES = {"Object": PLANET_OBJECTS, "Rasi": RASHIS, "Nakshatra": NAKSHATRAS,
+                     **{col: VIMSHOTTARI_LORDS for col in LORD_COLS}}
+HOUSE_CATEGORIES = {**PLANET_CATEGORIES, "Object": HOUSE_OBJECTS}
+
+## Columns stored as signed arc-seconds, a negative DMS string `-DD:MM:SS` is stored as the bitwise not of its arc-seconds,
+## so that `-00:00:00` is kept. Missing values are stored as `DMS_NULL`
+DMS_COLS = ["SignLonDMS", "LatDMS"]
+DMS_NULL = np.iinfo(np.int32).min
+
+## Numpy dtypes of the stored columns, the missing `isRetroGrade` and `HouseNr` values are stored as -1 and 0
+PLANET_DTYPES = {"Object": np.int8, "Rasi": np.int8, "isRetroGrade": np.int8, "LonDecDeg": np.float64,
+                 "SignLonDMS": np.int32, "SignLonDecDeg": np.float64, "LatDMS": np.int32, "Nakshatra": np.int8,
+                 **{col: np.int8 for col in LORD_COLS}, "HouseNr": np.uint8}
+HOUSE_DTYPES = {"Object": np.int8, "HouseNr": np.uint8, "Rasi": np.int8, "LonDecDeg": np.float64,
+                "SignLonDMS": np.int32, "SignLonDecDeg": np.float64, "DegSize": np.float64, "Nakshatra": np.int8,
+                **{col: np.int8 for col in LORD_COLS}}
+
+
+def encode_dms(dms: str):
+    """Encodes a `+DD:MM:SS` string as its signed arc-seconds (see `DMS_COLS`)"""
+    if dms is None:
+        return DMS_NULL
+    degrees, minutes, seconds = dms[1:].split(":")
+    arc_secs = int(degrees) * 3600 + int(minutes) * 60 + int(seconds)
+    return ~arc_secs if dms[0] == "-" else arc_secs
+
+def decode_dms(arc_secs: int):
+    """Decodes the signed arc-seconds of `encode_dms` back to the `+DD:MM:SS` string"""
+    if arc_secs == DMS_NULL:
+        return None
+    sign = "-" if arc_secs < 0 else "+"
+    arc_secs = ~arc_secs if arc_secs < 0 else arc_secs
+    return f"{sign}{arc_secs // 3600:02d}:{arc_secs // 60 % 60:02d}:{arc_secs % 60:02d}"
+
+def _decode_dms_column(arc_secs: np.ndarray):
+    """Vectorized `decode_dms` of a column, returns a pyarrow string array"""
+    is_negative = arc_secs < 0
+    values = np.where(is_negative, np.invert(arc_secs), arc_secs)
+    return pl.DataFrame({"is_negative": is_negative, "d": values // 3600, "m": values // 60 % 60,
+                         "s": values % 60, "is_null": arc_secs == DMS_NULL})\
+             .select(pl.when(pl.col("is_null")).then(None)
+                     .otherwise(pl.concat_str([pl.when(pl.col("is_negative")).then(pl.lit("-")).otherwise(pl.lit("+")),
+                                               pl.col("d").cast(pl.Utf8).str.zfill(2), pl.lit(":"),
+                                               pl.col("m").cast(pl.Utf8).str.zfill(2), pl.lit(":"),
+                                               pl.col("s").cast(pl.Utf8).str.zfill(2)])))\
+             .to_series().to_arrow()
+
+def _encode_dms_expr(col: str):
+    """Vectorized `encode_dms` of a DataFrame column"""
+    parts = pl.col(col).str.slice(1).str.split(":")
+    arc_secs = parts.list.get(0).cast(pl.Int32) * 3600 + parts.list.get(1).cast(pl.Int32) * 60 \
+               + parts.list.get(2).cast(pl.Int32)
+    return pl.when(pl.col(col).is_null()).then(DMS_NULL)\
+             .when(pl.col(col).str.starts_with("-")).then(-arc_secs - 1)\
+             .otherwise(arc_secs).alias(col)
+
+
+class ChartStore:
+    """
+    Planets and houses data of many charts in numpy columns, see the module docstring.
+    Build it with `from_records` (from the named tuples of `VedicHoroscopeData`) or `from_frames`
+    (from the DataFrames of `vedicastro.batch.compute_charts`).
+    """
+    __slots__ = ("planet_columns", "house_columns", "planet_offsets", "house_offsets")
+
+    def __init__(self, planet_columns: dict, house_columns: dict, planet_offsets: np.ndarray, house_offsets: np.ndarray):
+        self.planet_columns = planet_columns
+        self.house_columns = house_columns
+        self.planet_offsets = planet_offsets
+        self.house_offsets = house_offsets
+
+    def __len__(self):
+        return len(self.planet_offsets) - 1
+
+    @property
+    def nbytes(self):
+        """Total size of the stored arrays in bytes"""
+        return sum(values.nbytes for columns in (self.planet_columns, self.house_columns) for values in columns.values()) \
+               + self.planet_offsets.nbytes + self.house_offsets.nbytes
+
+    @classmethod
+    def from_records(cls, charts):
+        """Builds the store from an iterable of (planets_data, houses_data) lists of named tuples, one per chart"""
+        planet_rows, house_rows, planet_counts, house_counts = [], [], [], []
+        for planets_data, houses_data in charts:
+            planet_rows += planets_data
+            house_rows += houses_data
+            planet_counts.append(len(planets_data))
+            house_counts.append(len(houses_data))
+        planet_columns = _encode_rows(planet_rows, PLANETS_TABLE_COLS, PLANET_DTYPES, PLANET_CATEGORIES)
+        house_columns = _encode_rows(house_rows, HOUSES_TABLE_COLS, HOUSE_DTYPES, HOUSE_CATEGORIES)
+        return cls(planet_columns, house_columns, _get_offsets(planet_counts), _get_offsets(house_counts))
+
+    @classmethod
+    def from_frames(cls, planets_df: pl.DataFrame, houses_df: pl.DataFrame):
+        """Builds the store from the planets and houses DataFrames (with a `ChartID` column, sorted by it)"""
+        nr_charts = planets_df["ChartID"].max() + 1 if len(planets_df) else 0
+        planet_counts = np.bincount(planets_df["ChartID"].to_numpy(), minlength = nr_charts)
+        house_counts = np.bincount(houses_df["ChartID"].to_numpy(), minlength = nr_charts)
+        planet_columns = _encode_frame(planets_df, PLANET_DTYPES, PLANET_CATEGORIES)
+        house_columns = _encode_frame(houses_df, HOUSE_DTYPES, HOUSE_CATEGORIES)
+        return cls(planet_columns, house_columns, _get_offsets(planet_counts), _get_offsets(house_counts))
+
+    def planets_data(self, chart_id: int):
+        """Returns the planets data of the chart, as a list of `PlanetsData` named tuples"""
+        start, end = self.planet_offsets[chart_id], self.planet_offsets[chart_id + 1]
+        return [PlanetsData(*row) for row in _decode_rows(self.planet_columns, start, end, PLANET_CATEGORIES)]
+
+    def houses_data(self, chart_id: int):
+        """Returns the houses data of the chart, as a list of `HousesData` named tuples"""
+        start, end = self.house_offsets[chart_id], self.house_offsets[chart_id + 1]
+        return [HousesData(*row) for row in _decode_rows(self.house_columns, start, end, HOUSE_CATEGORIES)]
+
+    def to_arrow(self):
+        """
+        Returns the (planets, houses) `pyarrow.Table`s with a `ChartID` column, followed by the `PLANETS_TABLE_COLS`
+        and `HOUSES_TABLE_COLS` columns. The coded columns are dictionary arrays over the stored codes, and the
+        numeric columns share the stored buffers, only the DMS strings and the columns with missing values are built.
+        """
+        return (_to_arrow_table(self.planet_columns, self.planet_offsets, PLANET_CATEGORIES),
+                _to_arrow_table(self.house_columns, self.house_offsets, HOUSE_CATEGORIES))
+
+    def to_polars(self):
+        """Returns the (planets, houses) polars DataFrames of `to_arrow`, with the coded columns as Categoricals"""
+        planets_table, houses_table = self.to_arrow()
+        return pl.from_arrow(planets_table), pl.from_arrow(houses_table)
+
+def _get_offsets(counts):
+    return np.concatenate([[0], np.cumsum(counts, dtype = np.int64)])
+
+def _encode_rows(rows: list, cols: list, dtypes: dict, categories: dict):
+    """Encodes the named tuple rows to the stored columns"""
+    codes = {col: {value: code for code, value in enumerate(values)} for col, values in categories.items()}
+    columns = {}
+    for col, values in zip(cols, zip(*rows) if rows else [()] * len(cols)):
+        if col in codes:
+            values = [codes[col][value] for value in values]
+        elif col in DMS_COLS:
+            values = [encode_dms(value) for value in values]
+        elif col == "isRetroGrade":
+            values = [-1 if value is None else value for value in values]
+        elif col == "HouseNr":
+            values = [0 if value is None else value for value in values]
+        columns[col] = np.array(values, dtype = dtypes[col])
+    return columns
+
+def _encode_frame(df: pl.DataFrame, dtypes: dict, categories: dict):
+    """Encodes the DataFrame columns to the stored columns"""
+    df = df.with_columns([pl.col(col).cast(pl.Enum(values)).to_physical().alias(col) for col, values in categories.items()]
+                         + [_encode_dms_expr(col) for col in DMS_COLS if col in dtypes]
+                         + ([pl.col("isRetroGrade").cast(pl.Int8).fill_null(-1)] if "isRetroGrade" in dtypes else [])
+                         + [pl.col("HouseNr").fill_null(0)])
+    return {col: df[col].to_numpy().astype(dtype) for col, dtype in dtypes.items()}
+
+def _decode_rows(columns: dict, start: int, end: int, categories: dict):
+    """Decodes the stored rows between start and end, returns the rows as tuples of the column values"""
+    decoded = []
+    for col, values in columns.items():
+        values = values[start:end].tolist()
+        if col in categories:
+            values = [categories[col][code] for code in values]
+        elif col in DMS_COLS:
+            values = [decode_dms(arc_secs) for arc_secs in values]
+        elif col == "isRetroGrade":
+            values = [None if value < 0 else bool(value) for value in values]
+        elif col == "HouseNr":
+            values = [value if value else None for value in values]
+        decoded.append(values)
+    return zip(*decoded)
+
+def _to_arrow_table(columns: dict, offsets: np.ndarray, categories: dict):
+    arrays = {"ChartID": pa.array(np.repeat(np.arange(len(offsets) - 1), np.diff(offsets)))}
+    for col, values in columns.items():
+        if col in categories:
+            arrays[col] = pa.DictionaryArray.from_arrays(pa.array(values), pa.array(categories[col]))
+        elif col in DMS_COLS:
+            arrays[col] = _decode_dms_column(values)
+        elif col == "isRetroGrade":
+            arrays[col] = pa.array(values == 1, mask = values < 0)
+        elif col == "HouseNr" and (values == 0).any():
+            arrays[col] = pa.array(values, mask = values == 0)
+        else:
+            arrays[col] = pa.array(values)
+    return pa.table(arrays)
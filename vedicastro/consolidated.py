@@ -0,0 +1,74 @@
+"""
+Consolidated chart builder, which lists all the objects (both planets and houses) of a chart by rasi (sign),
+by bucketing the objects into the 12 sign slots in a single pass, instead of grouping polars DataFrames.
+Also has a batched columnar mode, for the consolidated charts of thousands of charts from the `vedicastro.batch` tables.
+"""
+import polars as pl
+from .VedicAstro import RASHIS
+
+
+## Global Constants
+## Columns of each object, which are collected into lists per rasi
+CONSOLIDATED_CHART_COLS = ["Object", "isRetroGrade", "LonDecDeg", "SignLonDMS", "SignLonDecDeg"]
+RASHI_ORDER = {rasi: idx for idx, rasi in enumerate(RASHIS)}
+
+
+def _new_rasi_bucket(rasi: str):
+    return {"Rasi": rasi, **{col: [] for col in CONSOLIDATED_CHART_COLS}}
+
+def _add_to_bucket(bucket: dict, obj, is_retrograde):
+    bucket["Object"].append(obj.Object)
+    bucket["isRetroGrade"].append(is_retrograde)
+    bucket["LonDecDeg"].append(obj.LonDecDeg)
+    bucket["SignLonDMS"].append(obj.SignLonDMS)
+    bucket["SignLonDecDeg"].append(obj.SignLonDecDeg)
+
+def get_consolidated_chart_records(planets_data: list, houses_data: list):
+    """
+    Returns the consolidated chart as a list of dicts, one per occupied rasi from `Aries` to `Pisces`,
+    with the Rasi and the lists of the `CONSOLIDATED_CHART_COLS` values of the houses and then planets in that rasi.
+    Houses are never retrograde.
+    """
+    buckets = [None] * 12
+    for house in houses_data:
+        idx = RASHI_ORDER[house.Rasi]
+        if buckets[idx] is None:
+            buckets[idx] = _new_rasi_bucket(house.Rasi)
+        _add_to_bucket(buckets[idx], house, False)
+    for planet in planets_data:
+        idx = RASHI_ORDER[planet.Rasi]
+        if buckets[idx] is None:
+            buckets[idx] = _new_rasi_bucket(planet.Rasi)
+        _add_to_bucket(buckets[idx], planet, planet.isRetroGrade)
+    return [bucket for bucket in buckets if bucket is not None]
+
+def consolidated_records_to_rasi_wise(records: list):
+    """Returns the consolidated chart records as a dict grouped by Rasi, and then by Object"""
+    return {record["Rasi"]: {obj: {"is_Retrograde": is_retrograde, "LonDecDeg": lon_dd,
+                                   "SignLonDMS": lon_dms, "SignLonDecDeg": sign_lon_dd}
+                             for obj, is_retrograde, lon_dd, lon_dms, sign_lon_dd in zip(record["Object"], record["isRetroGrade"],
+                                                                                         record["LonDecDeg"], record["SignLonDMS"],
+                                                                                         record["SignLonDecDeg"])}
+            for record in records}
+
+def compute_consolidated_charts_batch(planets_df: pl.DataFrame, houses_df: pl.DataFrame):
+    """
+    Computes the consolidated charts of many charts at once, by imploding the object columns per chart and rasi.
+
+    Parameters
+    ==========
+    planets_df, houses_df: The planets and houses data tables of the charts, with a `ChartID` column,
+                           Eg: as returned by `vedicastro.batch.compute_charts`
+
+    Returns
+    =======
+    A polars DataFrame with the columns ChartID, Rasi and the `CONSOLIDATED_CHART_COLS` as lists, one row per occupied
+    rasi of each chart, sorted by ChartID and rasi order, with the houses before the planets in each list
+    """
+    cols = ["ChartID", "Rasi"] + CONSOLIDATED_CHART_COLS
+    df_concat = pl.concat([houses_df.with_columns(pl.lit(False).alias("isRetroGrade")).select(cols), planets_df.select(cols)])
+    return df_concat.with_columns(pl.col("Rasi").replace(RASHI_ORDER, return_dtype = pl.UInt8).alias("RashiOrder"))\
+                    .group_by(["ChartID", "RashiOrder"], maintain_order = True)\
+                    .agg([pl.col("Rasi").first()] + [pl.col(col) for col in CONSOLIDATED_CHART_COLS])\
+                    .sort(["ChartID", "RashiOrder"])\
+                    .drop("RashiOrder")
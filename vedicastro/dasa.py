@@ -0,0 +1,183 @@
+"""
+Vectorized Vimshottari Dasa engine, which computes the Maha Dasa, Bhukti (Antar Dasa), Antara (Pratyantar Dasa) and
+Sookshma Dasa periods of one or many charts as numpy arrays of start / end timestamps.
+
+The periods follow the same convention as `VedicHoroscopeData.compute_vimshottari_dasa` (`utils.compute_new_date`):
+the durations are split into whole years, 30 day months, days, hours and minutes and added with `relativedelta`,
+to the minute, and the sub periods of each period are chained from its start.
+"""
+import functools
+import numpy as np
+import polars as pl
+from .VedicAstro import NAKSHATRAS, NAKSHATRA_ARC, VIMSHOTTARI_LORDS, VIMSHOTTARI_DURATIONS
+
+## Global Constants
+DASA_LEVEL_NAMES = ["MahaDasa", "Bhukti", "Antara", "Sookshma"]
+## Total length of all the dasas (in years), and the typical nakshatra arc (in degree - mins)
+VIMSHOTTARI_TOTAL_YEARS = 120
+TYPICAL_NAKSHATRA_ARC = 800
+
+
+def split_years_ymdhm(years: np.ndarray):
+    """Vectorized `utils.convert_years_ymdhm`, splits decimal years into whole years, months, days, hours and minutes"""
+    whole_years = np.trunc(years)
+    months = (years - whole_years) * 12
+    whole_months = np.trunc(months)
+    days = (months - whole_months) * 30
+    whole_days = np.trunc(days)
+    hours = (days - whole_days) * 24
+    whole_hours = np.trunc(hours)
+    minutes = (hours - whole_hours) * 60
+    return [values.astype(np.int64) for values in (whole_years, whole_months, whole_days, whole_hours, np.trunc(minutes))]
+
+def add_dasa_years(timestamps: np.ndarray, years: np.ndarray, direction: int = 1):
+    """
+    Vectorized `utils.compute_new_date`, adds (or subtracts with `direction = -1`) the decimal years to the
+    `datetime64[m]` timestamps, as calendar years and months (clamping the day to the end of the month, same as
+    `relativedelta`) followed by the days, hours and minutes
+    """
+    whole_years, months, days, hours, minutes = split_years_ymdhm(years)
+    dates = timestamps.astype("datetime64[D]")
+    month_starts = timestamps.astype("datetime64[M]")
+    new_months = month_starts + (direction * (whole_years * 12 + months)).astype("timedelta64[M]")
+    month_days = (new_months + 1).astype("datetime64[D]") - new_months.astype("datetime64[D]")
+    new_dates = new_months.astype("datetime64[D]") + np.minimum(dates - month_starts.astype("datetime64[D]"),
+                                                                month_days - 1)
+    time_of_day = timestamps - dates
+    return new_dates + time_of_day + (direction * (days * 1440 + hours * 60 + minutes)).astype("timedelta64[m]")
+
+
+@functools.lru_cache(maxsize=None)
+def get_dasa_period_table(level: int):
+    """
+    Returns the periods of one full Vimshottari cycle at the given level (1 = Maha Dasa, ..., 4 = Sookshma),
+    for each of the 9 starting Maha Dasa lords, as a tuple of numpy arrays:
+    - lords: (9, 9**level, level) indices into `VIMSHOTTARI_LORDS` of the lord of each level of the period
+    - start_offsets: (9, 9**level) start of the period in years, from the start of the first Maha Dasa
+    - durations: (9, 9**level) duration of the period in years
+    """
+    lengths = np.array(VIMSHOTTARI_DURATIONS, dtype=np.float64)
+    lords = ((np.arange(9)[:, None] + np.arange(9)[None, :]) % 9)[:, :, None]
+    durations = lengths[lords[:, :, 0]]
+    start_offsets = np.cumsum(durations, axis=1) - durations
+
+    for _ in range(level - 1):
+        # Sub divide each period into 9 sub periods, starting with the lord of the period
+        sub_lords = (lords[:, :, -1, None] + np.arange(9)) % 9
+        sub_durations = durations[:, :, None] * lengths[sub_lords] / VIMSHOTTARI_TOTAL_YEARS
+        sub_start_offsets = start_offsets[:, :, None] + np.cumsum(sub_durations, axis=2) - sub_durations
+        nr_periods = sub_lords.shape[1] * 9
+        lords = np.concatenate([np.repeat(lords, 9, axis=1), sub_lords.reshape(9, nr_periods, 1)], axis=2)
+        durations = sub_durations.reshape(9, nr_periods)
+        start_offsets = sub_start_offsets.reshape(9, nr_periods)
+    return lords, start_offsets, durations
+
+
+class VimshottariDasaPeriods:
+    """
+    Vimshottari Dasa periods of one or many charts, at all the levels up to `levels`.
+    The start and end timestamps are stored as int64 microseconds since the unix epoch, with one row per chart.
+    """
+    def __init__(self, levels: int, lords: dict, starts: dict, ends: dict):
+        self.levels = levels
+        self.lords  = lords   # level -> (N, 9**level, level) lord indices
+        self.starts = starts  # level -> (N, 9**level) start timestamps
+        self.ends   = ends    # level -> (N, 9**level) end timestamps
+
+    @property
+    def nr_charts(self):
+        return self.starts[1].shape[0]
+
+    def to_polars(self, levels: list = None):
+        """
+        Returns the periods as a polars DataFrame with the columns ChartID, Level, MahaDasa, Bhukti, Antara, Sookshma,
+        Start and End, ordered by chart, level and start time. Lords of levels deeper than the row's level are null.
+        """
+        levels = levels if levels else list(range(1, self.levels + 1))
+        # Concatenate the levels along the period axis, so that the flattened rows are ordered by chart and level
+        level_col = np.concatenate([np.full(self.starts[level].shape[1], level) for level in levels])
+        lords = np.concatenate([np.pad(self.lords[level], ((0, 0), (0, 0), (0, self.levels - level)), constant_values=-1)
+                                for level in levels], axis=1).reshape(-1, self.levels)
+        starts = np.concatenate([self.starts[level] for level in levels], axis=1).ravel()
+        ends = np.concatenate([self.ends[level] for level in levels], axis=1).ravel()
+
+        lord_names = pl.Series("Lord", VIMSHOTTARI_LORDS, dtype=pl.Utf8)
+        data = {"ChartID": np.repeat(np.arange(self.nr_charts), len(level_col)),
+                "Level": np.tile(level_col, self.nr_charts)}
+        for idx, level_name in enumerate(DASA_LEVEL_NAMES[:self.levels]):
+            data[level_name] = lord_names.gather(np.maximum(lords[:, idx], 0)).alias(level_name)
+        data["Start"] = pl.Series("Start", starts).cast(pl.Datetime("us"))
+        data["End"] = pl.Series("End", ends).cast(pl.Datetime("us"))
+        return pl.DataFrame(data).with_columns([pl.when(pl.col("Level") > idx).then(pl.col(level_name)).alias(level_name)
+                                                for idx, level_name in enumerate(DASA_LEVEL_NAMES[:self.levels])])
+
+    def current_period_at(self, timestamp, chart_id: int = 0):
+        """
+        Returns the running periods of the chart at the given timestamp (datetime or numpy datetime64),
+        as a dict with the lord of each level, along with the start and end of the deepest level period.
+        Uses a binary search over the start times of the deepest level periods, where each period ends at the start
+        of the next one, so that the periods cover the cycle without gaps. Returns None when the timestamp
+        falls outside the 120 year Vimshottari cycle of the chart.
+        """
+        ts = np.datetime64(timestamp, "us").astype(np.int64)
+        starts = self.starts[self.levels][chart_id]
+        idx = np.searchsorted(starts, ts, side="right") - 1
+        if idx < 0:
+            return None
+        end = starts[idx + 1] if idx + 1 < len(starts) else self.ends[self.levels][chart_id, idx]
+        if not ts < end:
+            return None
+        period = {level_name: VIMSHOTTARI_LORDS[lord]
+                  for level_name, lord in zip(DASA_LEVEL_NAMES, self.lords[self.levels][chart_id, idx])}
+        period["Start"] = np.datetime64(int(starts[idx]), "us").astype(object)
+        period["End"] = np.datetime64(int(end), "us").astype(object)
+        return period
+
+
+def compute_vimshottari_dasa_periods(moon_longitudes, birth_times, levels: int = 4):
+    """
+    Computes the Vimshottari Dasa periods of one or many charts.
+
+    Parameters
+    ==========
+    moon_longitudes: The sidereal longitudes of the Moon of each chart, float or array-like
+    birth_times: The (local) birth datetimes of each chart, datetime / numpy datetime64 or array-like of them,
+                 which are truncated to the minute
+    levels: The number of levels to compute, 1 = Maha Dasa, 2 = Bhukti, 3 = Antara, 4 = Sookshma
+
+    Returns
+    =======
+    A `VimshottariDasaPeriods` object, which can be converted to a polars DataFrame with `to_polars`
+    """
+    if not 1 <= levels <= len(DASA_LEVEL_NAMES):
+        raise ValueError(f"levels must be between 1 and {len(DASA_LEVEL_NAMES)}")
+    moon_longitudes = np.atleast_1d(np.asarray(moon_longitudes, dtype=np.float64))
+    birth_times = np.atleast_1d(np.asarray(birth_times, dtype="datetime64[us]")).astype("datetime64[m]")
+
+    # Find the Moon's nakshatra and its lord, which is the lord of the starting Maha Dasa
+    nakshatra_index = np.floor_divide(np.mod(moon_longitudes, 360), NAKSHATRA_ARC).astype(np.int64) % len(NAKSHATRAS)
+    start_lord = nakshatra_index % 9
+
+    # Compute the elapsed portion of the starting Maha Dasa at birth
+    lengths = np.array(VIMSHOTTARI_DURATIONS, dtype=np.float64)
+    elapsed_moon_mins = np.round(moon_longitudes * 60, 2) - nakshatra_index * TYPICAL_NAKSHATRA_ARC
+    remaining_arc_mins = TYPICAL_NAKSHATRA_ARC - elapsed_moon_mins
+    start_dasa_elapsed_duration = lengths[start_lord] - (lengths[start_lord] / TYPICAL_NAKSHATRA_ARC) * remaining_arc_mins
+    parent_starts = add_dasa_years(birth_times, start_dasa_elapsed_duration, direction=-1)[:, None]
+
+    lords, starts, ends = {}, {}, {}
+    for level in range(1, levels + 1):
+        level_lords, _, durations = get_dasa_period_table(level)
+        # Chain the 9 sub periods of each period of the previous level from its start
+        durations = durations[start_lord].reshape(len(start_lord), -1, 9)
+        level_starts = np.empty(durations.shape, dtype="datetime64[m]")
+        level_ends = np.empty(durations.shape, dtype="datetime64[m]")
+        period_starts = parent_starts
+        for idx in range(9):
+            level_starts[:, :, idx] = period_starts
+            period_starts = level_ends[:, :, idx] = add_dasa_years(period_starts, durations[:, :, idx])
+        lords[level] = level_lords[start_lord]
+        starts[level] = level_starts.reshape(len(start_lord), -1).astype("datetime64[us]").astype(np.int64)
+        ends[level] = level_ends.reshape(len(start_lord), -1).astype("datetime64[us]").astype(np.int64)
+        parent_starts = level_starts.reshape(len(start_lord), -1)
+    return VimshottariDasaPeriods(levels, lords, starts, ends)
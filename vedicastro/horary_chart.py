@@ -1,27 +1,83 @@
 import os
-import polars as pl
+import json
+import math
+import bisect
+import functools
 import swisseph as swe
 from datetime import datetime
-from .utils import dms_to_decdeg, utc_offset_str_to_float
+from .utils import dms_to_decdeg_expr, utc_offset_str_to_float, find_root_brent, LazyModule
 from .VedicAstro import VedicHoroscopeData
+from .instrumentation import timed, count
+
+np = LazyModule("numpy")
+pl = LazyModule("polars")
 
 ## Global Constants
 SWE_AYANAMAS = { "Krishnamurti" : swe.SIDM_KRISHNAMURTI, "Krishnamurti_Senthilathiban": swe.SIDM_KRISHNAMURTI_VP291}
+## Degrees past the start of the sub division, at which the Ascendant is matched
+ASC_MATCH_OFFSET_DEG = 0.0005
 
 # Determine the absolute path to the directory where this script is located
 current_dir = os.path.abspath(os.path.dirname(__file__))
 csv_file_path = os.path.join(current_dir, "data", "KP_SL_Divisions.csv")
-## Read KP SubLord Divisions CSV File
-KP_SL_DMS_DATA = pl.read_csv(csv_file_path)
-KP_SL_DMS_DATA = KP_SL_DMS_DATA\
-                .with_columns(pl.arange(1, KP_SL_DMS_DATA.height + 1).alias("SL_Div_Nr"))\
+## Precompiled (parsed) KP SubLord Divisions data, shipped alongside the CSV File in Arrow IPC format
+ipc_file_path = os.path.join(current_dir, "data", "KP_SL_Divisions.arrow")
+
+## Convert the sign to its starting degree in the zodiac circle
+SIGN_START_DEGREES = {'Aries': 0, 'Taurus': 30, 'Gemini': 60, 'Cancer': 90,
+                      'Leo': 120, 'Virgo': 150, 'Libra': 180, 'Scorpio': 210,
+                      'Sagittarius': 240, 'Capricorn': 270, 'Aquarius': 300, 'Pisces': 330
+                      }
+HORARY_ASC_TABLE_COLS = ("Sign", "From_DMS", "From_DecDeg", "SubLord", "ZodiacDegreeLocation")
+
+def read_kp_sl_dms_csv():
+    """Reads and parses the KP SubLord Divisions CSV File"""
+    kp_sl_dms_data = pl.read_csv(csv_file_path)
+    return kp_sl_dms_data\
+                .with_columns(pl.arange(1, kp_sl_dms_data.height + 1).alias("SL_Div_Nr"))\
                 .with_columns([
-                    pl.col('From_DMS').map_elements(dms_to_decdeg).alias('From_DecDeg'),
-                    pl.col('To_DMS').map_elements(dms_to_decdeg).alias('To_DecDeg'),
+                    dms_to_decdeg_expr(pl.col('From_DMS')).alias('From_DecDeg'),
+                    dms_to_decdeg_expr(pl.col('To_DMS')).alias('To_DecDeg'),
                     pl.col("From_DMS").str.replace_all(":", "").cast(pl.Int32).alias("From_DMS_int"),
                     pl.col("To_DMS").str.replace_all(":", "").cast(pl.Int32).alias("To_DMS_int")
                 ])
 
+def compile_kp_sl_dms_data():
+    """Parses the KP SubLord Divisions CSV File and stores it as the precompiled Arrow IPC file. Rerun when the CSV changes."""
+    read_kp_sl_dms_csv().write_ipc(ipc_file_path)
+
+@functools.lru_cache(maxsize=None)
+def get_kp_sl_dms_data():
+    """Returns the KP SubLord Divisions data, loaded on first use from the precompiled file (or the CSV File if missing)"""
+    if os.path.exists(ipc_file_path):
+        return pl.read_ipc(ipc_file_path)
+    return read_kp_sl_dms_csv()
+
+@functools.lru_cache(maxsize=None)
+def get_horary_asc_table():
+    """
+    Returns the Horary Ascendant table of the 249 horary numbers (indexed by horary_number - 1) as a tuple of rows,
+    with the starting degree of each subdivision converted to its zodiac degree location
+    """
+    return tuple((sign, from_dms, from_decdeg, sub_lord, SIGN_START_DEGREES[sign] + from_decdeg)
+                 for sign, from_dms, from_decdeg, sub_lord in
+                 get_kp_sl_dms_data().select(["Sign", "From_DMS", "From_DecDeg", "SubLord"]).iter_rows())
+
+@functools.lru_cache(maxsize=None)
+def get_horary_asc_arrays():
+    """Returns the columns of the Horary Ascendant table as numpy arrays"""
+    return {col: np.array(values, dtype = np.float64 if col in ("From_DecDeg", "ZodiacDegreeLocation") else object)
+            for col, values in zip(HORARY_ASC_TABLE_COLS, zip(*get_horary_asc_table()))}
+
+## Module attributes which are loaded on first access
+LAZY_ATTRIBUTES = {"KP_SL_DMS_DATA": get_kp_sl_dms_data, "HORARY_ASC_TABLE": get_horary_asc_table,
+                   "HORARY_ASC_ARRAYS": get_horary_asc_arrays}
+
+def __getattr__(name: str):
+    if name in LAZY_ATTRIBUTES:
+        return LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def jd_to_datetime(jdt: float, tz_offset: float):
     utc = swe.jdut1_to_utc(jdt) 
     # Convert UTC to local time - note negative sign before tzoffset to convert from UTC to IST
@@ -35,27 +91,105 @@ def get_horary_ascendant_degree(horary_number: int):
     Convert a horary number to ascendant degree of the starting subdivision
     """
     if 1 <= horary_number <= 249:
-        row = KP_SL_DMS_DATA.filter(pl.col("SL_Div_Nr") == horary_number).select(["Sign", "From_DMS", "From_DecDeg", "SubLord"])
-        data = row.to_dicts()[0]
-
-        # Convert the sign to its starting degree in the zodiac circle
-        sign_order = {'Aries': 0, 'Taurus': 30, 'Gemini': 60, 'Cancer': 90,
-                    'Leo': 120, 'Virgo': 150, 'Libra': 180, 'Scorpio': 210,
-                    'Sagittarius': 240, 'Capricorn': 270, 'Aquarius': 300, 'Pisces': 330 
-                    }
-        
-        sign_start_degree = sign_order[data['Sign']]
-
-        # Convert From_DecDeg to zodiac degree location
-        zodiac_degree_location = sign_start_degree + data['From_DecDeg']
-        data['ZodiacDegreeLocation'] = zodiac_degree_location
-        return data
+        return dict(zip(HORARY_ASC_TABLE_COLS, get_horary_asc_table()[horary_number - 1]))
     else:
         return "SL Div Nr. out of range. Please provide a number between 1 and 249."
 
-def find_exact_ascendant_time(year: int, month: int, day: int, utc_offset: str, lat: float, lon: float, horary_number: int, ayanamsa : str) -> datetime:
+def get_horary_ascendant_degrees(horary_numbers):
     """
-    Finds the exact time when the Ascendant is at the desired degree.
+    Vectorized form of `get_horary_ascendant_degree`, for many horary numbers at once.
+    Returns a dict of numpy arrays, with the same keys as `get_horary_ascendant_degree`.
+    """
+    horary_numbers = np.asarray(horary_numbers, dtype = np.int64)
+    if ((horary_numbers < 1) | (horary_numbers > 249)).any():
+        raise ValueError("SL Div Nr. out of range. Please provide numbers between 1 and 249.")
+    return {col: values[horary_numbers - 1] for col, values in get_horary_asc_arrays().items()}
+
+def get_ascendant_longitude(jd: float, lat: float, lon: float) -> float:
+    """Returns the sidereal longitude of the Ascendant (Placidus) for the given julian day and location"""
+    count("swe.houses_ex")
+    cusps, _ = swe.houses_ex(jd, lat, lon, b'P', flags = swe.FLG_SIDEREAL)
+    return cusps[0]
+
+@timed("horary.ascendant_crossings")
+def find_ascendant_crossings(jd_start: float, jd_end: float, lat: float, lon: float, target_degs: list,
+                             nr_samples: int = 48, xtol: float = 1e-10) -> list:
+    """
+    Finds all the julian days within [jd_start, jd_end], when the Ascendant crosses each of the target degrees.
+    The sidereal mode (ayanamsa) must be set with `swe.set_sid_mode`, before calling this function.
+
+    The Ascendant is sampled at `nr_samples` equally spaced times, and its longitude is unwrapped
+    (the Ascendant moves forward through the whole zodiac in a day, by less than 180° between samples),
+    so that every crossing of a target degree is bracketed between two samples.
+    Each crossing is then refined with Brent's method, to within `xtol` days.
+
+    Returns a list with the chronologically sorted crossing julian days of each target degree,
+    in the same order as `target_degs`.
+    """
+    step = (jd_end - jd_start) / nr_samples
+    sample_jds = [jd_start + i * step for i in range(nr_samples)] + [jd_end]
+    asc_lons = [get_ascendant_longitude(jd, lat, lon) for jd in sample_jds]
+
+    # Sort the targets, to find the ones within each sampled interval with a binary search
+    targets = sorted((target_deg % 360, idx) for idx, target_deg in enumerate(target_degs))
+    sorted_degs = [target_deg for target_deg, _ in targets]
+
+    crossings = [[] for _ in target_degs]
+    unwrapped_lon = asc_lons[0]
+    for i in range(nr_samples):
+        next_unwrapped_lon = unwrapped_lon + (asc_lons[i + 1] - asc_lons[i]) % 360
+        # Walk through the targets in (unwrapped_lon, next_unwrapped_lon], one zodiac cycle at a time
+        # (a crossing at the very start of the day is included in the first interval)
+        cycle_start = 360 * math.floor(unwrapped_lon / 360)
+        pos = bisect.bisect_left(sorted_degs, unwrapped_lon - cycle_start) if i == 0 else \
+              bisect.bisect_right(sorted_degs, unwrapped_lon - cycle_start)
+        while True:
+            if pos == len(sorted_degs):
+                cycle_start, pos = cycle_start + 360, 0
+            if not sorted_degs or cycle_start + sorted_degs[pos] > next_unwrapped_lon:
+                break
+            target_deg, target_idx = targets[pos]
+            target_lon = cycle_start + target_deg
+            offset_func = lambda jd: (get_ascendant_longitude(jd, lat, lon) - target_deg + 180) % 360 - 180
+            crossing_jd = find_root_brent(offset_func, sample_jds[i], sample_jds[i + 1],
+                                          fa = unwrapped_lon - target_lon, fb = next_unwrapped_lon - target_lon, xtol = xtol)
+            crossings[target_idx].append(crossing_jd)
+            pos += 1
+        unwrapped_lon = next_unwrapped_lon
+    return crossings
+
+def get_day_jd_range(year: int, month: int, day: int, utc_float: float):
+    """Returns the julian days (UT) of the start and end of the local day"""
+    utc = swe.utc_time_zone(year, month, day, hour = 0, minutes = 0, seconds = 0, offset = utc_float)
+    _ , jd_start = swe.utc_to_jd(*utc) ## Unpacks utc tuple
+    jd_end = jd_start + 1  # end of the day
+    return jd_start, jd_end
+
+@timed("horary.match_charts")
+def get_horary_matches(crossing_jds: list, utc_offset: str, lat: float, lon: float, horary_number: int, ayanamsa : str) -> list:
+    """
+    Builds the houses charts at the given Ascendant crossing times of a horary number, and
+    returns the (matched_time, houses_chart, houses_data) tuples of the ones where the Ascendant's sub lord matches.
+    """
+    req_sublord = get_horary_ascendant_degree(horary_number)["SubLord"]
+    utc_float =  utc_offset_str_to_float(utc_offset)
+    matches = []
+    for crossing_jd in crossing_jds:
+        matched_time = jd_to_datetime(crossing_jd, utc_float)
+        secs_final = matched_time.second + (matched_time.microsecond) / 1_000_000
+        vhd_hora = VedicHoroscopeData(matched_time.year, matched_time.month, matched_time.day, matched_time.hour, matched_time.minute,
+                                      secs_final, lat, lon, utc_offset, ayanamsa, "Placidus")
+        houses_chart = vhd_hora.generate_chart()
+        houses_data = vhd_hora.get_houses_data_from_chart(houses_chart)
+        asc = houses_data[0]
+        if asc.SubLord == req_sublord:
+            matches.append((matched_time, houses_chart, houses_data))
+    return matches
+
+@timed("horary.search")
+def find_all_ascendant_times(year: int, month: int, day: int, utc_offset: str, lat: float, lon: float, horary_number: int, ayanamsa : str) -> list:
+    """
+    Finds all the times within the day, when the Ascendant is at the desired degree of the horary number.
 
     Parameters:
     - year: year of the horary question (prasna)
@@ -68,66 +202,106 @@ def find_exact_ascendant_time(year: int, month: int, day: int, utc_offset: str,
     - ayanamsa: The ayanamsa to be used when constructing the chart
 
     Returns:
-    - matched_time: a datetime object, when the Ascendant matches the desired degree.
-    If no match is found within the day, returns None.
+    - matches: a list of (matched_time, houses_chart, houses_data) tuples, one for each time in the day
+    when the Ascendant matches the desired degree and sub lord, in chronological order.
     """
     ## Retrieve Horary Asc Details from given horary_number
     horary_asc = get_horary_ascendant_degree(horary_number) 
     horary_asc_deg = horary_asc["ZodiacDegreeLocation"]
-    req_sublord = horary_asc["SubLord"]   
-    utc_float =  utc_offset_str_to_float(utc_offset)
-
-    utc = swe.utc_time_zone(year, month, day, hour = 0, minutes = 0, seconds = 0, offset = utc_float)
-    _ , jd_start = swe.utc_to_jd(*utc) ## Unpacks utc tuple
-    jd_end = jd_start + 1  # end of the day
+    jd_start, jd_end = get_day_jd_range(year, month, day, utc_offset_str_to_float(utc_offset))
 
     swe.set_sid_mode(SWE_AYANAMAS.get(ayanamsa))  # set the ayanamsa
-    current_time = jd_start
-    counter = 0
-    while current_time <= jd_end:
-        cusps, _ = swe.houses_ex(current_time, lat, lon, b'P', flags = swe.FLG_SIDEREAL)
-        asc_lon_deg = cusps[0]
-        asc_deg_diff = asc_lon_deg - horary_asc_deg
-        asc_deg_diff_abs = abs(asc_deg_diff)
-
-        # Adjust increment factor based on the magnitude of degree difference
-        if asc_deg_diff_abs > 10:
-            inc_factor = 0.005  # largest steps when far away
-        elif asc_deg_diff_abs >= 1.0:
-            inc_factor = 1  # larger steps when moderately away
-        elif asc_deg_diff_abs >= 0.1:
-            inc_factor = 10  # smaller steps when getting closer
-        else:
-            inc_factor = 100  # very small steps when very close
-
-        # Special handling for cyclical transition near 360 degrees for horary_number == 1
-        if (asc_lon_deg > 355 and horary_asc_deg == 0.0):
-            inc_factor = 100  # Use very small steps to avoid overshooting the target for horary_number == 1
-
-        # For Debugging purpose
-        # current_time_dt = jd_to_datetime(current_time, utc_float)
-        # print(f"CurrentTimeDT: {current_time_dt}  Itr.Counter: {counter}  Inc.Factor: {inc_factor}  TargetDeg: {horary_asc_deg}   AscLonDeg:{asc_lon_deg}  AscDegDiff: {asc_deg_diff_abs}")
-
-        if 0.0001 < asc_deg_diff <= 0.001:
-            matched_time = jd_to_datetime(current_time, utc_float)
-            secs_final = matched_time.second + (matched_time.microsecond) / 1_000_000
-            vhd_hora = VedicHoroscopeData(year, month, day, matched_time.hour, matched_time.minute, secs_final, utc_offset, lat, lon, ayanamsa, "Placidus")
-            houses_chart = vhd_hora.generate_chart()
-            houses_data = vhd_hora.get_houses_data_from_chart(houses_chart)
-            asc = houses_data[0]
-            # print(f"**UNMATCHED**===ReqSubLord: {req_sublord} || CurrentAscSL: {asc.SubLord}")
-            if asc.SubLord == req_sublord:
-                # print(f"Nr.Iterations: {counter} || Matched Time: {matched_time} || Final Ascendant: {asc_lon_deg} || ReqSL: {req_sublord} || CurrentAscSL: {asc.SubLord}")
-                return matched_time, houses_chart, houses_data
-            
-        
-        current_time += 1.0 / (24 * 60 * 60 * inc_factor)  # Adjust time increment based on the factor
-        counter += 1
+    # Target the middle of the (0.0001, 0.001] degrees window past the start of the sub division
+    crossings = find_ascendant_crossings(jd_start, jd_end, lat, lon, [horary_asc_deg + ASC_MATCH_OFFSET_DEG])[0]
+    return get_horary_matches(crossings, utc_offset, lat, lon, horary_number, ayanamsa)
+
+def find_exact_ascendant_time(year: int, month: int, day: int, utc_offset: str, lat: float, lon: float, horary_number: int, ayanamsa : str) -> datetime:
+    """
+    Finds the exact time when the Ascendant is at the desired degree.
+
+    Parameters:
+    - year: year of the horary question (prasna)
+    - month: month of the horary question
+    - day: day of the horary question
+    - utc_offset: The UTC offset of the horary question's location, i.e of the predictor (astrologer)
+    - lat: Latitude pertaining to the horary question's predictor (astrologer)
+    - lon: Longitude pertaining to the horary question's predictor (astrologer).
+    - horary_number: The horary number for which to retrieve the ascendant details to match.
+    - ayanamsa: The ayanamsa to be used when constructing the chart
+
+    Returns:
+    - matched_time: a datetime object, when the Ascendant first matches the desired degree,
+    along with the houses chart and houses data at that time.
+    If no match is found within the day, returns None.
+    """
+    matches = find_all_ascendant_times(year, month, day, utc_offset, lat, lon, horary_number, ayanamsa)
+    if matches:
+        return matches[0]
 
     print("No matching Ascendant time found for the given input")
     return None
 
 
+class HoraryAscendantIndex:
+    """
+    Index of the Ascendant crossing times of all the 249 horary numbers (KP sub lord divisions),
+    for a given date, location and ayanamsa, computed in one sweep of the day.
+    Build it once with `HoraryAscendantIndex.build`, then look up any horary number in constant time.
+    The index can be stored with `save` and reloaded with `HoraryAscendantIndex.load`.
+    """
+    def __init__(self, year: int, month: int, day: int, utc_offset: str, lat: float, lon: float, ayanamsa: str,
+                 crossings: list):
+        self.year       = year
+        self.month      = month
+        self.day        = day
+        self.utc_offset = utc_offset
+        self.latitude   = lat
+        self.longitude  = lon
+        self.ayanamsa   = ayanamsa
+        self.crossings  = crossings  # Crossing julian days, indexed by horary_number - 1
+
+    @classmethod
+    def build(cls, year: int, month: int, day: int, utc_offset: str, lat: float, lon: float, ayanamsa: str,
+              nr_samples: int = 48):
+        """Computes the Ascendant crossing times of all the 249 horary numbers within the day"""
+        jd_start, jd_end = get_day_jd_range(year, month, day, utc_offset_str_to_float(utc_offset))
+        target_degs = (get_horary_asc_arrays()["ZodiacDegreeLocation"] + ASC_MATCH_OFFSET_DEG).tolist()
+        swe.set_sid_mode(SWE_AYANAMAS.get(ayanamsa))  # set the ayanamsa
+        crossings = find_ascendant_crossings(jd_start, jd_end, lat, lon, target_degs, nr_samples = nr_samples)
+        return cls(year, month, day, utc_offset, lat, lon, ayanamsa, crossings)
+
+    def get_crossing_jds(self, horary_number: int) -> list:
+        """Returns the julian days (UT) when the Ascendant crosses the starting degree of the horary number"""
+        if not 1 <= horary_number <= 249:
+            raise ValueError("SL Div Nr. out of range. Please provide a number between 1 and 249.")
+        return self.crossings[horary_number - 1]
+
+    def get_matched_times(self, horary_number: int) -> list:
+        """Returns the local datetimes when the Ascendant crosses the starting degree of the horary number"""
+        utc_float = utc_offset_str_to_float(self.utc_offset)
+        return [jd_to_datetime(crossing_jd, utc_float) for crossing_jd in self.get_crossing_jds(horary_number)]
+
+    def get_matches(self, horary_number: int) -> list:
+        """Returns the same (matched_time, houses_chart, houses_data) tuples as `find_all_ascendant_times`"""
+        return get_horary_matches(self.get_crossing_jds(horary_number), self.utc_offset, self.latitude, self.longitude,
+                                  horary_number, self.ayanamsa)
+
+    def save(self, file_path: str):
+        """Stores the index as a JSON file"""
+        with open(file_path, "w") as f:
+            json.dump({"year": self.year, "month": self.month, "day": self.day, "utc_offset": self.utc_offset,
+                       "latitude": self.latitude, "longitude": self.longitude, "ayanamsa": self.ayanamsa,
+                       "crossings": self.crossings}, f)
+
+    @classmethod
+    def load(cls, file_path: str):
+        """Reloads an index stored with `save`"""
+        with open(file_path) as f:
+            data = json.load(f)
+        return cls(data["year"], data["month"], data["day"], data["utc_offset"], data["latitude"], data["longitude"],
+                   data["ayanamsa"], data["crossings"])
+
+
 if __name__== "__main__":
     year = 2024
     month = 2
@@ -0,0 +1,148 @@
+"""
+Optional instrumentation of the chart pipeline, with per stage timers and call counters.
+It is off unless a profile is being collected with `collect_profile()`, in which case the stages (functions decorated
+with `timed`) and counters (`count`) within the context are recorded into the profile.
+When off, a timed function only costs a context variable lookup per call.
+
+Eg:
+    with collect_profile() as profile:
+        chart = vhd.generate_chart()
+    print(profile.to_dict())
+"""
+import time
+import functools
+import contextlib
+import contextvars
+import collections
+
+_active_profile = contextvars.ContextVar("vedicastro_active_profile", default = None)
+
+
+class Profile:
+    """
+    Timings and counters collected for one unit of work (Eg: an API request).
+    Stage timings are inclusive, a stage which calls another timed stage includes its time.
+    """
+    def __init__(self):
+        self.stage_secs = collections.Counter()
+        self.stage_calls = collections.Counter()
+        self.counters = collections.Counter()
+
+    def add_stage(self, name: str, elapsed_secs: float):
+        self.stage_secs[name] += elapsed_secs
+        self.stage_calls[name] += 1
+
+    def to_dict(self):
+        """Returns the profile as a plain (picklable and JSON serializable) dict"""
+        return {"stages": {name: {"secs": secs, "calls": self.stage_calls[name]} for name, secs in self.stage_secs.items()},
+                "counters": dict(self.counters)}
+
+def is_profiling():
+    """Returns True if a profile is being collected in the current context"""
+    return _active_profile.get() is not None
+
+@contextlib.contextmanager
+def collect_profile():
+    """Collects the stage timings and counters within the context into a new `Profile`, which is yielded"""
+    profile = Profile()
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+
+@contextlib.contextmanager
+def stage(name: str):
+    """Times the block as a stage of the active profile, if any"""
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_stage(name, time.perf_counter() - start)
+
+def timed(name: str):
+    """Decorator, which times each call of the function as a stage of the active profile, if any"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _active_profile.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.add_stage(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def count(name: str, n: int = 1):
+    """Increments the counter of the active profile, if any"""
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.counters[name] += n
+
+def format_server_timing(profile: dict, extra_metrics: dict = None):
+    """
+    Formats the stages of a profile dict (and any `extra_metrics` durations in secs) as a `Server-Timing` header value,
+    with the durations in milliseconds and the number of calls of each stage as its description
+    """
+    metrics = [f"{_server_timing_name(name)};dur={stats['secs'] * 1e3:.3f};desc=\"{stats['calls']} calls\""
+               for name, stats in (profile or {}).get("stages", {}).items()]
+    metrics += [f"{_server_timing_name(name)};dur={secs * 1e3:.3f}" for name, secs in (extra_metrics or {}).items()]
+    return ", ".join(metrics)
+
+def _server_timing_name(name: str):
+    """Server-Timing metric names are tokens, so replace the other characters (Eg: `.`) with `-`"""
+    return "".join(char if char.isalnum() or char in "!#$%&'*+-^_`|~" else "-" for char in name)
+
+
+class MetricsRegistry:
+    """
+    Aggregates the profiles and request timings of a process, for a Prometheus text format `/metrics` endpoint.
+    """
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.stage_secs = collections.Counter()
+        self.stage_calls = collections.Counter()
+        self.counters = collections.Counter()
+        self.requests = collections.Counter()  # (endpoint, status) -> nr of requests
+        self.request_secs = collections.Counter()  # endpoint -> total secs
+
+    def add_profile(self, profile: dict):
+        for name, stats in profile.get("stages", {}).items():
+            self.stage_secs[name] += stats["secs"]
+            self.stage_calls[name] += stats["calls"]
+        self.counters.update(profile.get("counters", {}))
+
+    def add_request(self, endpoint: str, status: int, elapsed_secs: float):
+        self.requests[(endpoint, status)] += 1
+        self.request_secs[endpoint] += elapsed_secs
+
+    def to_prometheus(self):
+        """Returns the metrics in the Prometheus text format"""
+        families = [
+            ("requests_total", "counter", "Number of requests by endpoint and status",
+             [({"endpoint": endpoint, "status": status}, value) for (endpoint, status), value in self.requests.items()]),
+            ("request_seconds_total", "counter", "Total time of the requests by endpoint",
+             [({"endpoint": endpoint}, value) for endpoint, value in self.request_secs.items()]),
+            ("stage_seconds_total", "counter", "Total time of the chart pipeline stages",
+             [({"stage": name}, value) for name, value in self.stage_secs.items()]),
+            ("stage_calls_total", "counter", "Number of calls of the chart pipeline stages",
+             [({"stage": name}, value) for name, value in self.stage_calls.items()]),
+            ("events_total", "counter", "Number of counted events (Eg: swe.houses_ex calls)",
+             [({"name": name}, value) for name, value in self.counters.items()]),
+        ]
+        lines = []
+        for name, metric_type, help, samples in families:
+            lines += [f"# HELP {self.prefix}_{name} {help}", f"# TYPE {self.prefix}_{name} {metric_type}"]
+            lines += [f"{self.prefix}_{name}{{{','.join(f'{key}={_label_value(value)}' for key, value in labels.items())}}} {value}"
+                      for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+def _label_value(value):
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
@@ -0,0 +1,106 @@
+"""
+Significator engine, which builds inverted indexes of a chart once (rasi lord -> houses, house -> occupants,
+star lord -> planets), and emits the KP planet-wise and house-wise ABCD significators tables from them in linear time.
+Also has a batched columnar mode, for the significators of thousands of charts from the `vedicastro.batch` tables.
+"""
+import collections
+import polars as pl
+
+
+## Global Constants
+## Objects which are not significators
+SIGNIFICATOR_EXCLUDED_OBJECTS = ["Asc", "Chiron", "Syzygy", "Fortuna"]
+
+
+class SignificatorIndex:
+    """
+    Inverted indexes of the planets and houses data of a chart, used to generate the ABCD significators tables.
+    The lists in the indexes are in the order of the planets / houses data, same as the original table scans.
+    """
+    def __init__(self, planets_data: list, houses_data: list):
+        self.planets_data = [planet for planet in planets_data if planet.Object not in SIGNIFICATOR_EXCLUDED_OBJECTS]
+        self.houses_data = houses_data
+        self.planet_order = {planet.Object: idx for idx, planet in enumerate(self.planets_data)}
+        self.planet_house = {planet.Object: planet.HouseNr for planet in self.planets_data}
+        self.rasi_lord_houses = collections.defaultdict(list)
+        for house in houses_data:
+            self.rasi_lord_houses[house.RasiLord].append(house.HouseNr)
+        self.house_occupants = collections.defaultdict(list)
+        self.star_lord_planets = collections.defaultdict(list)
+        for planet in self.planets_data:
+            self.house_occupants[planet.HouseNr].append(planet.Object)
+            self.star_lord_planets[planet.NakshatraLord].append(planet.Object)
+
+    def get_planet_wise_significators(self):
+        """Returns the (Planet, A, B, C, D) significators of each planet"""
+        return [(planet.Object,
+                 self.planet_house.get(planet.NakshatraLord, None),  # A. House occupied by the star lord of the planet
+                 planet.HouseNr,  # B. House occupied by the planet itself
+                 list(self.rasi_lord_houses.get(planet.NakshatraLord, [])),  # C. Houses ruled by the star lord
+                 list(self.rasi_lord_houses.get(planet.Object, [])))  # D. Houses ruled by the planet itself
+                for planet in self.planets_data]
+
+    def get_house_wise_significators(self):
+        """Returns the (House, A, B, C, D) significators of each house"""
+        significators_data = []
+        for house in self.houses_data:
+            occupants = self.house_occupants.get(house.HouseNr, [])
+            # A. Planets in the star of occupants of that house, in the order of the planets data
+            A = sorted((planet for occupant in occupants for planet in self.star_lord_planets.get(occupant, [])),
+                       key=self.planet_order.get)
+            # B. Planets in that house, C. Planets in the star of owners of that house, D. Owner of that house
+            significators_data.append((house.Object, A, list(occupants), list(self.star_lord_planets.get(house.RasiLord, [])),
+                                       house.RasiLord))
+        return significators_data
+
+
+def _implode_by(df: pl.DataFrame, keys: list, value_col: str, alias: str):
+    """Groups the DataFrame by the keys, collecting the values into lists in the row order"""
+    return df.group_by(keys, maintain_order=True).agg(pl.col(value_col).alias(alias))
+
+def compute_significators_batch(planets_df: pl.DataFrame, houses_df: pl.DataFrame):
+    """
+    Computes the planet-wise and house-wise ABCD significators of many charts at once, with polars joins and groupings.
+
+    Parameters
+    ==========
+    planets_df, houses_df: The planets and houses data tables of the charts, with a `ChartID` column,
+                           Eg: as returned by `vedicastro.batch.compute_charts`
+
+    Returns
+    =======
+    A tuple of (planet_significators_df, house_significators_df) polars DataFrames, with the columns
+    ChartID, Planet / House, A, B, C, D, where the C and D columns of the planets (A, B, C of the houses) are lists
+    """
+    planets_df = planets_df.filter(~pl.col("Object").is_in(SIGNIFICATOR_EXCLUDED_OBJECTS))\
+                           .select(["ChartID", "Object", "HouseNr", "NakshatraLord"]).with_row_index("PlanetOrder")
+    houses_df = houses_df.select(["ChartID", "Object", "HouseNr", "RasiLord"]).with_row_index("HouseOrder")
+    planet_house = planets_df.select(["ChartID", pl.col("Object").alias("Lord"), pl.col("HouseNr").alias("LordHouseNr")])
+    rasi_lord_houses = _implode_by(houses_df, ["ChartID", "RasiLord"], "HouseNr", "Houses").rename({"RasiLord": "Lord"})
+    empty_list = lambda col: pl.col(col).fill_null(pl.lit([], dtype=pl.List(pl.Int64)))
+
+    planet_significators_df = planets_df\
+        .join(planet_house, left_on=["ChartID", "NakshatraLord"], right_on=["ChartID", "Lord"], how="left", coalesce=True)\
+        .join(rasi_lord_houses.rename({"Houses": "C"}), left_on=["ChartID", "NakshatraLord"], right_on=["ChartID", "Lord"], how="left", coalesce=True)\
+        .join(rasi_lord_houses.rename({"Houses": "D"}), left_on=["ChartID", "Object"], right_on=["ChartID", "Lord"], how="left", coalesce=True)\
+        .sort("PlanetOrder")\
+        .select(["ChartID", pl.col("Object").alias("Planet"), pl.col("LordHouseNr").alias("A"), pl.col("HouseNr").alias("B"),
+                 empty_list("C"), empty_list("D")])
+
+    # A. The planets in the star of the occupants of a house, are the planets whose star lord is in that house
+    star_lord_house_planets = planets_df\
+        .join(planet_house, left_on=["ChartID", "NakshatraLord"], right_on=["ChartID", "Lord"], how="inner")\
+        .sort("PlanetOrder")
+    house_occupants = _implode_by(planets_df, ["ChartID", "HouseNr"], "Object", "B")
+    star_lord_planets = _implode_by(planets_df, ["ChartID", "NakshatraLord"], "Object", "C")
+    empty_str_list = lambda col: pl.col(col).fill_null(pl.lit([], dtype=pl.List(pl.Utf8)))
+
+    house_significators_df = houses_df\
+        .join(_implode_by(star_lord_house_planets, ["ChartID", "LordHouseNr"], "Object", "A"),
+              left_on=["ChartID", "HouseNr"], right_on=["ChartID", "LordHouseNr"], how="left", coalesce=True)\
+        .join(house_occupants, on=["ChartID", "HouseNr"], how="left", coalesce=True)\
+        .join(star_lord_planets, left_on=["ChartID", "RasiLord"], right_on=["ChartID", "NakshatraLord"], how="left", coalesce=True)\
+        .sort("HouseOrder")\
+        .select(["ChartID", pl.col("Object").alias("House"), empty_str_list("A"), empty_str_list("B"), empty_str_list("C"),
+                 pl.col("RasiLord").alias("D")])
+    return planet_significators_df, house_significators_df
@@ -0,0 +1,259 @@
+"""
+Transit time-series generator, which streams the positions and KP lords of the planets over a date range,
+by calling pyswisseph directly for each timestamp, instead of constructing a `VedicHoroscopeData` and `flatlib.Chart` per snapshot.
+Also has an event finder, for the exact sign, nakshatra, KP sub lord and sub sub lord ingress times of the planets.
+"""
+import functools
+import collections
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import polars as pl
+import swisseph as swe
+from .utils import find_root_brent
+from .VedicAstro import (RASHIS, NAKSHATRAS, VIMSHOTTARI_LORDS, KP_SSL_BOUNDARIES, KP_SL_INDEX, KP_SSL_INDEX,
+                         get_rl_nl_sl_lookup_array)
+from .batch import SWE_AYANAMSA_MAPPING, SWE_OBJECTS, SWE_FLAGS, STATIONARY_SPEED
+
+
+## Global Constants
+## Planets of `VedicHoroscopeData.get_transit_details`, Ketu is derived from Rahu
+TRANSIT_PLANETS = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto", "Rahu", "Ketu"]
+
+TRANSITS_TABLE_COLS = ["timestamp", "PlanetName", "PlanetLon", "LonSpeed", "PlanetSign", "Nakshatra",
+                       "NakshatraLord", "SubLord", "isRetrograde"]
+
+TransitRow = collections.namedtuple("TransitRow", TRANSITS_TABLE_COLS)
+
+## Column types of the transits DataFrames, Eg: for an empty date range
+TRANSITS_TABLE_SCHEMA = {"timestamp": pl.Datetime("us"), "PlanetName": pl.Utf8, "PlanetLon": pl.Float64, "LonSpeed": pl.Float64,
+                         "PlanetSign": pl.Utf8, "Nakshatra": pl.Utf8, "NakshatraLord": pl.Utf8, "SubLord": pl.Utf8,
+                         "isRetrograde": pl.Boolean}
+
+DEFAULT_TRANSITS_BATCH_SIZE = 10_000
+
+
+def _as_utc(dt: datetime):
+    """Converts a timezone aware datetime to a naive UTC datetime, a naive datetime is already taken as UTC"""
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+def _planet_swe_id(planet: str):
+    """Returns the pyswisseph object id of the planet, Ketu is computed from Rahu"""
+    return SWE_OBJECTS["Rahu" if planet == "Ketu" else planet]
+
+def compute_transit_positions(jds: np.ndarray, planets: list = None, ayanamsa: str = "Krishnamurti"):
+    """
+    Computes the sidereal longitudes and speeds of the planets at the given julian days (UT).
+    Returns a tuple of (longitudes, speeds) numpy arrays, both of shape (nr of jds, nr of planets)
+    """
+    planets = planets if planets else TRANSIT_PLANETS
+    swe.set_sid_mode(SWE_AYANAMSA_MAPPING[ayanamsa])
+    lons, speeds = np.empty((len(jds), len(planets))), np.empty((len(jds), len(planets)))
+    for j, planet in enumerate(planets):
+        swe_id = _planet_swe_id(planet)
+        for i, jd in enumerate(jds.tolist()):
+            pos, _ = swe.calc_ut(jd, swe_id, SWE_FLAGS)
+            lons[i, j], speeds[i, j] = pos[0], pos[3]
+        if planet == "Ketu":
+            lons[:, j] = (lons[:, j] + 180) % 360
+    return lons, speeds
+
+def _transits_frame(timestamps: np.ndarray, lons: np.ndarray, speeds: np.ndarray, planets: list):
+    """Builds the transits DataFrame of a batch, ordered by timestamp and then by planet"""
+    flat_lons, flat_speeds = lons.ravel(), speeds.ravel()
+    rl_nl_sl_data = get_rl_nl_sl_lookup_array(flat_lons)
+    data = {"timestamp": pl.Series("timestamp", np.repeat(timestamps, len(planets))),
+            "PlanetName": np.tile(np.array(planets, dtype=object), len(timestamps)),
+            "PlanetLon": np.round(flat_lons, 3),
+            "LonSpeed": flat_speeds,
+            "PlanetSign": np.array(RASHIS, dtype=object)[(flat_lons / 30).astype(np.int64)],
+            "Nakshatra": rl_nl_sl_data["Nakshatra"],
+            "NakshatraLord": rl_nl_sl_data["NakshatraLord"],
+            "SubLord": rl_nl_sl_data["SubLord"],
+            "isRetrograde": flat_speeds <= -STATIONARY_SPEED,
+            }
+    return pl.DataFrame({col: (values if isinstance(values, pl.Series) else pl.Series(col, values.tolist()))
+                         for col, values in data.items()})
+
+def iter_transits(start: datetime, end: datetime, step: timedelta, planets: list = None, ayanamsa: str = "Krishnamurti",
+                  batch_size: int = DEFAULT_TRANSITS_BATCH_SIZE, as_batches: bool = False):
+    """
+    Streams the transits of the planets at every `step` from `start` (inclusive) to `end` (exclusive).
+    The timestamps are in UTC.
+
+    Parameters
+    ==========
+    start, end: The datetimes of the date range, naive datetimes are in UTC and timezone aware ones are converted to UTC
+    step: The time step between two transit snapshots, Eg: timedelta(minutes = 1)
+    planets: The planets to compute, from `TRANSIT_PLANETS` (default: all of them)
+    ayanamsa: Ayanamsa, from `SWE_AYANAMSA_MAPPING`
+    batch_size: The number of timestamps computed per batch, which bounds the memory used
+    as_batches: If True, yields one polars DataFrame (with the `TRANSITS_TABLE_COLS` columns) per batch,
+                otherwise yields one `TransitRow` per planet per timestamp
+
+    Returns
+    =======
+    A generator of `TransitRow` named tuples, or of polars DataFrames if `as_batches` is True
+    """
+    planets = planets if planets else TRANSIT_PLANETS
+    start, end = _as_utc(start), _as_utc(end)
+    nr_steps = max(0, -(-(end - start) // step))  # Ceil division, to exclude the end
+    step_days = step / timedelta(days=1)
+    start_jd = swe.julday(start.year, start.month, start.day,
+                          start.hour + start.minute / 60 + (start.second + start.microsecond / 1e6) / 3600)
+    start_ts = np.datetime64(start, "us")
+    step_us = np.timedelta64(step // timedelta(microseconds=1), "us")
+
+    for batch_start in range(0, nr_steps, batch_size):
+        steps = np.arange(batch_start, min(batch_start + batch_size, nr_steps))
+        lons, speeds = compute_transit_positions(start_jd + steps * step_days, planets, ayanamsa)
+        transits_df = _transits_frame(start_ts + steps * step_us, lons, speeds, planets)
+        if as_batches:
+            yield transits_df
+        else:
+            yield from (TransitRow(*row) for row in transits_df.iter_rows())
+
+def write_transits_parquet(path: str, start: datetime, end: datetime, step: timedelta, planets: list = None,
+                           ayanamsa: str = "Krishnamurti", batch_size: int = DEFAULT_TRANSITS_BATCH_SIZE):
+    """
+    Writes the transits of `iter_transits` to a Parquet file, one row group per batch,
+    so that long runs (Eg: a year at minute resolution) stay in bounded memory. Returns the number of rows written.
+    An empty date range is written as an empty table, with the `TRANSITS_TABLE_SCHEMA` columns.
+    """
+    import pyarrow.parquet as pq
+    nr_rows, writer = 0, None
+    try:
+        for transits_df in iter_transits(start, end, step, planets, ayanamsa, batch_size, as_batches=True):
+            table = transits_df.to_arrow()
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            nr_rows += len(transits_df)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        pl.DataFrame(schema = TRANSITS_TABLE_SCHEMA).write_parquet(path)
+    return nr_rows
+
+
+## Transit Events
+TRANSIT_EVENT_LEVELS = ["Sign", "Nakshatra", "SubLord", "SubSubLord"]
+
+TransitEvent = collections.namedtuple("TransitEvent", ["timestamp", "PlanetName", "EventType", "BoundaryLon",
+                                                       "FromValue", "ToValue", "isRetrograde"])
+
+
+@functools.lru_cache(maxsize=None)
+def get_transit_event_divisions(level: str):
+    """
+    Returns the divisions of the zodiac for an event level, as a tuple of (start longitudes, names) numpy arrays,
+    where the division i spans [start[i], start[i+1]).
+    The nakshatra, sub and sub sub divisions are all taken from the KP Sub Sub Lord table `KP_SSL_BOUNDARIES`
+    (a nakshatra being 81 sub sub divisions, i.e. 360/27 degrees), so that the boundaries shared by the levels are
+    the same floats, and their events the same instants.
+    """
+    if level == "Sign":
+        return np.arange(12) * 30.0, np.array(RASHIS, dtype=object)
+    ssl_starts = np.array([0.0] + KP_SSL_BOUNDARIES[:-1])
+    # The 120° nakshatra cycle repeats thrice over the zodiac
+    starts = np.concatenate([ssl_starts + 120 * cycle for cycle in range(3)])
+    if level == "Nakshatra":
+        return starts[::81], np.array(NAKSHATRAS, dtype=object)
+    if level == "SubSubLord":
+        return starts, np.array([VIMSHOTTARI_LORDS[idx] for idx in KP_SSL_INDEX] * 3, dtype=object)
+    if level == "SubLord":
+        return starts[::9], np.array([VIMSHOTTARI_LORDS[idx] for idx in KP_SL_INDEX[::9]] * 3, dtype=object)
+    raise ValueError(f"Unknown event level {level}, must be one of {TRANSIT_EVENT_LEVELS}")
+
+def _planet_position(jd: float, planet: str):
+    """Returns the (longitude, speed) of the planet at the julian day (UT), the sidereal mode must be already set"""
+    pos, _ = swe.calc_ut(jd, _planet_swe_id(planet), SWE_FLAGS)
+    return ((pos[0] + 180) % 360 if planet == "Ketu" else pos[0]), pos[3]
+
+def _unwrap_lon(lon: float, ref_lon: float):
+    """Unwraps the longitude to within 180° of the reference longitude"""
+    return ref_lon + (lon - ref_lon + 180) % 360 - 180
+
+def _find_planet_events(planet: str, jds: np.ndarray, lons: np.ndarray, speeds: np.ndarray, levels: list, xtol: float):
+    """
+    Finds the events of one planet between the sampled julian days. The samples are split at the stations
+    (where the speed changes sign), so that the planet moves monotonically in each interval, and crosses each
+    boundary in it exactly once, which is then refined with Brent's method. Returns a list of (jd, level, from, to, is_retrograde)
+    """
+    jds, lons, speeds = jds.tolist(), lons.tolist(), speeds.tolist()
+    points = [(jds[0], lons[0], speeds[0])]
+    for i in range(1, len(jds)):
+        if np.sign(speeds[i - 1]) * np.sign(speeds[i]) < 0:
+            station_jd = find_root_brent(lambda jd: _planet_position(jd, planet)[1], jds[i - 1], jds[i],
+                                         speeds[i - 1], speeds[i], xtol = xtol)
+            points.append((station_jd, *_planet_position(station_jd, planet)))
+        points.append((jds[i], lons[i], speeds[i]))
+
+    events = []
+    for (jd_a, lon_a, _), (jd_b, lon_b, _) in zip(points, points[1:]):
+        lon_b = _unwrap_lon(lon_b, lon_a)
+        if lon_a == lon_b:
+            continue
+        is_retrograde = lon_b < lon_a
+        unwrapped_lon = lambda jd: _unwrap_lon(_planet_position(jd, planet)[0], lon_a)
+        for level in levels:
+            starts, names = get_transit_event_divisions(level)
+            extended_starts = np.concatenate([starts - 360, starts, starts + 360])
+            # Boundaries crossed going from lon_a to lon_b, in the order of crossing
+            if is_retrograde:
+                lo, hi = np.searchsorted(extended_starts, [lon_b, lon_a], side = "right")
+                crossed = range(hi - 1, lo - 1, -1)
+            else:
+                lo, hi = np.searchsorted(extended_starts, [lon_a, lon_b], side = "right")
+                crossed = range(lo, hi)
+            for idx in crossed:
+                boundary = extended_starts[idx]
+                # Moving direct, the planet enters the division starting at the boundary, else the one ending at it
+                division = idx % len(starts)
+                prev_division = (division - 1) % len(starts)
+                from_value, to_value = ((names[division], names[prev_division]) if is_retrograde
+                                        else (names[prev_division], names[division]))
+                event_jd = find_root_brent(lambda jd: unwrapped_lon(jd) - boundary, jd_a, jd_b,
+                                           lon_a - boundary, lon_b - boundary, xtol = xtol)
+                events.append((event_jd, level, float(boundary % 360), from_value, to_value, bool(is_retrograde)))
+    return events
+
+def find_transit_events(start: datetime, end: datetime, planets: list = None, ayanamsa: str = "Krishnamurti",
+                        levels: list = None, sample_step: timedelta = timedelta(days = 1), xtol: float = 1e-9):
+    """
+    Finds the exact times at which the planets cross into a new sign, nakshatra, KP sub lord or sub sub lord division,
+    between `start` and `end`. Each planet is sampled every `sample_step` to bracket the boundaries
+    (and the stations of retrograde motion), which are then refined with root finding on `swe.calc_ut`.
+
+    Parameters
+    ==========
+    start, end: The datetimes of the date range, naive datetimes are in UTC and timezone aware ones are converted to UTC
+    planets: The planets to compute, from `TRANSIT_PLANETS` (default: all of them)
+    ayanamsa: Ayanamsa, from `SWE_AYANAMSA_MAPPING`
+    levels: The event levels, from `TRANSIT_EVENT_LEVELS` (default: Sign, Nakshatra and SubLord)
+    sample_step: The time step of the bracketing samples, which must be shorter than the time between two stations
+    xtol: The tolerance of the event times, in days
+
+    Returns
+    =======
+    A list of `TransitEvent` named tuples sorted by (UTC) timestamp, where `FromValue` and `ToValue` are the sign, nakshatra or lord
+    the planet leaves and enters
+    """
+    planets = planets if planets else TRANSIT_PLANETS
+    levels = levels if levels else TRANSIT_EVENT_LEVELS[:3]
+    start, end = _as_utc(start), _as_utc(end)
+    start_jd = swe.julday(start.year, start.month, start.day,
+                          start.hour + start.minute / 60 + (start.second + start.microsecond / 1e6) / 3600)
+    end_jd = start_jd + (end - start) / timedelta(days = 1)
+    step_days = sample_step / timedelta(days = 1)
+    jds = np.append(np.arange(start_jd, end_jd, step_days), end_jd)
+
+    lons, speeds = compute_transit_positions(jds, planets, ayanamsa)
+    events = []
+    for j, planet in enumerate(planets):
+        for event_jd, level, boundary, from_value, to_value, is_retrograde in \
+                _find_planet_events(planet, jds, lons[:, j], speeds[:, j], levels, xtol):
+            events.append(TransitEvent(start + timedelta(days = event_jd - start_jd), planet, level, boundary,
+                                       from_value, to_value, is_retrograde))
+    return sorted(events, key = lambda event: (event.timestamp, planets.index(event.PlanetName),
+                                               TRANSIT_EVENT_LEVELS.index(event.EventType)))
@@ -1,9 +1,26 @@
-import pytz
-from timezonefinder import TimezoneFinder
-from datetime import datetime, date, timedelta
-from dateutil.relativedelta import relativedelta
+import re
+import importlib
+import functools
+from datetime import datetime, timedelta
 
 ## 
+class LazyModule:
+    """
+    Stand-in for a module, which is only imported on the first access of one of its attributes.
+    Used for heavy dependencies (Eg: polars, numpy), to keep the import of this package fast.
+    """
+    def __init__(self, module_name: str):
+        self._module_name = module_name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._module_name)
+        return getattr(self._module, attr)
+
+np = LazyModule("numpy")
+pl = LazyModule("polars")
+
 def clean_select_objects_split_str(input_str):
     """Rename and Clean certain chart objects like North, South Node and Fortuna"""
     cleaned_str = (input_str.strip('<').strip('>')
@@ -82,6 +99,81 @@ def dms_difference(dms1_str: str, dms2_str: str):
     return seconds_to_dms(diff_seconds)
 
 
+## Vectorized versions of the DMS conversions above, for whole columns of Degrees:Mins:Secs strings.
+## They match the scalar versions exactly, including the sign being only applied to the degrees part.
+## The expressions are fastest in a lazy query, where the split of the strings is computed once.
+def _split_dms_expr(expr, dtype):
+    """Splits a polars expression of Degrees:Mins:Secs strings into the degrees, minutes and seconds expressions"""
+    parts = expr.str.split_exact(":", 2)
+    return [parts.struct.field(f"field_{i}").cast(dtype) for i in range(3)]
+
+def _eval_dms_expr(dms_expr_func, *columns):
+    """Evaluates the polars expression function over the columns (lists, numpy arrays or Series) of DMS strings"""
+    df = pl.DataFrame({f"dms_{i}": pl.Series(values, dtype = pl.Utf8) for i, values in enumerate(columns)})
+    # Lazily, so that the split of the strings is computed once per column, by the common subexpression elimination
+    return df.lazy().select(dms_expr_func(*[pl.col(col) for col in df.columns])).collect().to_series().to_numpy()
+
+def dms_to_decdeg_expr(expr):
+    """Polars expression version of `dms_to_decdeg`, Eg: `df.with_columns(dms_to_decdeg_expr(pl.col("From_DMS")))`"""
+    degrees, minutes, seconds = _split_dms_expr(expr, pl.Float64)
+    return (degrees + minutes / 60 + seconds / 3600).round(4)
+
+def dms_to_mins_expr(expr):
+    """Polars expression version of `dms_to_mins`"""
+    degrees, minutes, seconds = _split_dms_expr(expr, pl.Int64)
+    return (degrees * 60 + minutes + seconds / 60).round(2)
+
+def dms_difference_expr(expr1, expr2):
+    """Polars expression version of `dms_difference`"""
+    def dms_to_seconds(expr):
+        degrees, minutes, seconds = _split_dms_expr(expr, pl.Int64)
+        return degrees * 3600 + minutes * 60 + seconds
+    diff_seconds = (dms_to_seconds(expr1) - dms_to_seconds(expr2)).abs()
+    return pl.concat_str([(diff_seconds // 3600).cast(pl.Utf8), pl.lit(":"),
+                          (diff_seconds % 3600 // 60).cast(pl.Utf8), pl.lit(":"),
+                          (diff_seconds % 60).cast(pl.Utf8)])
+
+def dms_to_decdeg_array(dms_values):
+    """Array version of `dms_to_decdeg`, returns a numpy array of the decimal degrees"""
+    return _eval_dms_expr(dms_to_decdeg_expr, dms_values)
+
+def dms_to_mins_array(dms_values):
+    """Array version of `dms_to_mins`, returns a numpy array of the total minutes"""
+    return _eval_dms_expr(dms_to_mins_expr, dms_values)
+
+def dms_difference_array(dms1_values, dms2_values):
+    """Array version of `dms_difference`, returns a numpy array of the Degrees:Mins:Secs difference strings"""
+    return _eval_dms_expr(dms_difference_expr, dms1_values, dms2_values)
+
+def decdeg_to_dms_array(values):
+    """
+    Formats decimal degrees to signed `+DD:MM:SS` strings, same as `flatlib.angle.toString`,
+    returns a numpy array of the strings
+    """
+    values = np.asarray(values, dtype = np.float64)
+    sign = np.where(values < 0, "-", "+")
+    value = np.abs(values)
+    parts = []
+    for _ in range(4):
+        part = np.floor(value)
+        parts.append(part)
+        value = (value - part) * 60
+    degrees, minutes, seconds, last = parts
+    # Round over the last element, and carry over the 60s
+    seconds = seconds + (last >= 30)
+    minutes = minutes + (seconds == 60)
+    seconds = np.where(seconds == 60, 0, seconds)
+    degrees = degrees + (minutes == 60)
+    minutes = np.where(minutes == 60, 0, minutes)
+    return pl.DataFrame({"sign": sign, "d": degrees.astype(np.int64), "m": minutes.astype(np.int64),
+                         "s": seconds.astype(np.int64)})\
+             .select(pl.concat_str([pl.col("sign"),
+                                    pl.col("d").cast(pl.Utf8).str.zfill(2), pl.lit(":"),
+                                    pl.col("m").cast(pl.Utf8).str.zfill(2), pl.lit(":"),
+                                    pl.col("s").cast(pl.Utf8).str.zfill(2)]))\
+             .to_series().to_numpy()
+
+
 def convert_years_ymdhm(years):
     """
     This function converts decimal years into years, months, days, hours, and minutes.
@@ -109,6 +201,8 @@ def compute_new_date(start_date : tuple, diff_value : float, direction: str):
     """
     This function computes a new date and time given an initial date and time and a time difference.
     """
+    from dateutil.relativedelta import relativedelta
+
     # Unpack start_date and diff_params
     year, month, day, hour, minute = start_date
     years, months, days, hours, minutes = convert_years_ymdhm(diff_value)
@@ -129,6 +223,32 @@ def compute_new_date(start_date : tuple, diff_value : float, direction: str):
 
     return new_date
 
+## Number of decimals the coordinates are rounded to, when caching their timezone (4 decimals is about 11 metres)
+TIMEZONE_COORDS_DECIMALS = 4
+## UTC offset str, Eg: +5:30 or -04:00
+UTC_OFFSET_PATTERN = re.compile(r"[+-](?P<hours>\d{1,2}):(?P<minutes>\d{2})")
+_timezone_finder = None
+
+def get_timezone_finder(in_memory: bool = False):
+    """
+    Returns the process-wide `TimezoneFinder` instance, which is created on first use.
+    Pass `in_memory = True` on the first call, to load all the timezone polygon data in memory for faster lookups.
+    """
+    global _timezone_finder
+    if _timezone_finder is None:
+        from timezonefinder import TimezoneFinder
+        _timezone_finder = TimezoneFinder(in_memory=in_memory)
+    return _timezone_finder
+
+@functools.lru_cache(maxsize=65536)
+def _get_timezone_name_rounded(lat: float, lon: float):
+    return get_timezone_finder().timezone_at(lat=lat, lng=lon)
+
+def get_timezone_name(lat: float, lon: float):
+    """Returns the timezone location name (Eg: America/New_York) for the given latitude and longitude"""
+    return _get_timezone_name_rounded(round(lat, TIMEZONE_COORDS_DECIMALS), round(lon, TIMEZONE_COORDS_DECIMALS))
+
+@functools.lru_cache(maxsize=65536)
 def get_utc_offset(timezone_loc : str, date: datetime):
     """
     Returns the UTC offset as a timedelta for a given latitude, longitude, and date.
@@ -140,6 +260,8 @@ def get_utc_offset(timezone_loc : str, date: datetime):
     Returns:
     - timedelta: UTC offset as a timedelta object.
     """
+    import pytz
+
     # Get the timezone object
     timezone = pytz.timezone(timezone_loc)
 
@@ -159,4 +281,104 @@ def get_utc_offset(timezone_loc : str, date: datetime):
     utc_offset = timedelta(seconds=utc_offset_sec)
 
 
-    return utc_offset_str, utc_offset
\ No newline at end of file
+    return utc_offset_str, utc_offset
+
+def get_utc_offsets(lats: list, lons: list, dates: list):
+    """
+    Batch form of `get_timezone_name` and `get_utc_offset`, for many coordinates and local datetimes.
+    Returns a list of (timezone_loc, utc_offset_str, utc_offset) tuples, in the same order as the inputs.
+    """
+    results = []
+    for lat, lon, local_time in zip(lats, lons, dates):
+        timezone_loc = get_timezone_name(lat, lon)
+        results.append((timezone_loc, *get_utc_offset(timezone_loc, local_time)))
+    return results
+
+def resolve_utc_offset(utc: str, chart_time: datetime) -> str:
+    """
+    Returns the UTC offset str of a chart's `utc` input, which is either an UTC offset str (Eg: +5:30), returned as is,
+    or a timezone name (Eg: Asia/Kolkata), resolved to its UTC offset at the local chart time.
+    Raises a ValueError for an unknown timezone name or a malformed UTC offset.
+    """
+    if not isinstance(utc, str):
+        raise ValueError(f"Invalid UTC offset: {utc!r}")
+    if not utc.startswith(('+', '-')):
+        try:
+            utc_offset_str, _ = get_utc_offset(utc, chart_time)
+        except KeyError:  # pytz.UnknownTimeZoneError
+            raise ValueError(f"Unknown timezone: {utc!r}")
+        return utc_offset_str
+    offset_match = UTC_OFFSET_PATTERN.fullmatch(utc)
+    if offset_match is None or int(offset_match["hours"]) > 14 or int(offset_match["minutes"]) >= 60:
+        raise ValueError(f"Invalid UTC offset: {utc!r}, expected +HH:MM or -HH:MM")
+    return utc
+
+def get_timezone_cache_info():
+    """Returns the hit / miss counters of the timezone name and UTC offset caches"""
+    return {name: cache_func.cache_info()._asdict()
+            for name, cache_func in [("timezone_name", _get_timezone_name_rounded), ("utc_offset", get_utc_offset)]}
+
+def clear_timezone_caches():
+    """Clears the timezone name and UTC offset caches, along with their counters"""
+    _get_timezone_name_rounded.cache_clear()
+    get_utc_offset.cache_clear()
+
+def find_root_brent(func, a: float, b: float, fa: float = None, fb: float = None, xtol: float = 1e-10, max_iter: int = 100):
+    """
+    Finds a root of `func` within the bracket [a, b] using Brent's method, where `func(a)` and `func(b)` have opposite signs.
+    
+    Parameters:
+    - func: The function of one variable, whose root is to be found
+    - a, b: The bracket of the root
+    - fa, fb: The already known values of `func(a)` and `func(b)`, if any, to save function evaluations
+    - xtol: The absolute tolerance of the root
+    - max_iter: The maximum number of iterations
+    
+    Returns:
+    - float: The root of the function within the bracket.
+    """
+    fa = func(a) if fa is None else fa
+    fb = func(b) if fb is None else fb
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+    if fa * fb > 0:
+        raise ValueError("The root is not bracketed, func(a) and func(b) must have opposite signs")
+
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(max_iter):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * 2.2e-16 * abs(b) + xtol / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # Attempt inverse quadratic interpolation, or secant when only two points are distinct
+            s = fb / fa
+            if a == c:
+                p, q = 2 * m * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m  # Fall back to bisection
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = func(b)
+    return b